@@ -7,21 +7,36 @@ class IndexOutOfRangeError(ValueError):
 class DisjointSets:
     """ Disjoint sets data structure using trees. """
 
-    def __init__(self, size: int, path_compression: bool = False) -> None:
+    def __init__(self, size: int = 0, path_compression: bool = False) -> None:
         self.parent = [0] * size
         self.rank = [0] * size
         self._path_compression = path_compression
+        self._num_sets = 0
 
-    def make_set(self, element: int) -> None:
-        """ Make a set with the given element. """
-        if element < 0 or element > len(self.parent):
-            raise IndexOutOfRangeError(f"{element} is not a valid element")
+    @property
+    def num_sets(self) -> int:
+        """ Returns the number of sets that have been made and not joined. """
+        return self._num_sets
 
-        self.parent[element] = element
-        self.rank[element] = 0
+    def make_set(self, element: int | None = None) -> int:
+        """ Make a set with the given element and return it. Without an
+            element a new one is appended, growing the structure. Each
+            element should be made into a set only once.
+        """
+        if element is None:
+            element = len(self.parent)
+            self.parent.append(element)
+            self.rank.append(0)
+        else:
+            self._validate_index(element)
+            self.parent[element] = element
+            self.rank[element] = 0
+        self._num_sets += 1
+        return element
 
-    def union(self, element_1: int, element_2: int) -> None:
-        """ Joins two trees on the union by rank heuristic.
+    def union(self, element_1: int, element_2: int) -> bool:
+        """ Joins two trees on the union by rank heuristic. Returns true
+            if the elements were in different sets.
         """
         self._validate_index(element_1)
         self._validate_index(element_2)
@@ -31,7 +46,7 @@ class DisjointSets:
 
         # If they are already in the same set we do nothing
         if root_1 == root_2:
-            return
+            return False
 
         # Join the root with the lower rank to the root with higher rank
         if self.rank[root_1] > self.rank[root_2]:
@@ -41,13 +56,14 @@ class DisjointSets:
             # If the rank is the same it needs to be updated
             if self.rank[root_1] == self.rank[root_2]:
                 self.rank[root_2] += 1
+        self._num_sets -= 1
+        return True
 
     def find(self, element: int) -> int:
         """ Find the set to which the elements belong to. Returns the root
             of the tree it belongs to.
         """
-        if element < 0 or element > len(self.parent):
-            raise IndexOutOfRangeError(f"{element} is not a valid element")
+        self._validate_index(element)
         if not self._path_compression:
             return self._find_std(element)
         else:
@@ -71,8 +87,8 @@ class DisjointSets:
         return self.parent[element]
 
     def _validate_index(self, index: int) -> None:
-        if index < 0 or index > len(self.parent):
-            raise IndexOutOfRangeError
+        if index < 0 or index >= len(self.parent):
+            raise IndexOutOfRangeError(f"{index} is not a valid element")
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}()"
@@ -19,6 +19,37 @@ def test_make_set():
 
     with pytest.raises(IndexOutOfRangeError):
         djs.make_set(10)
+    with pytest.raises(IndexOutOfRangeError):
+        djs.make_set(5)
+
+
+def test_make_set_grows_the_structure():
+    djs = DisjointSets(path_compression=True)
+    assert djs.num_sets == 0
+    assert djs.make_set() == 0
+    assert djs.make_set() == 1
+    assert djs.union(0, 1)
+    assert djs.make_set() == 2
+    assert djs.parent == [1, 1, 2]
+    assert djs.num_sets == 2
+    assert djs.find(2) != djs.find(0)
+
+
+def test_union_counts_sets():
+    djs = DisjointSets(size=6)
+    for ii in range(0, 6):
+        djs.make_set(ii)
+    assert djs.num_sets == 6
+    assert djs.union(0, 1)
+    assert djs.union(2, 3)
+    assert djs.union(1, 3)
+    assert not djs.union(0, 2)
+    assert djs.num_sets == 3
+
+    with pytest.raises(IndexOutOfRangeError):
+        djs.find(6)
+    with pytest.raises(IndexOutOfRangeError):
+        djs.union(-1, 0)
 
 
 @pytest.fixture
@@ -0,0 +1,173 @@
+""" Times the main graph operations on synthetic graphs and prints the
+    results as JSON.
+
+    python benchmark.py --scale small --repeat 3 --output results.json
+"""
+import argparse
+from collections.abc import Callable
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+# The graph modules live in sibling directories that are not packages
+_graphs_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_graphs_dir, "digraph"))
+sys.path.insert(0, os.path.join(_graphs_dir, "graph"))
+
+from digraph import Digraph  # noqa: E402
+from graph import Graph  # noqa: E402
+import generators  # noqa: E402
+
+
+# Number of nodes of the generated graphs at each scale
+SCALES = {
+    "small": 1_000,
+    "medium": 10_000,
+    "large": 100_000,
+}
+
+
+def make_graphs(num_nodes: int, seed: int) -> list[tuple[str, bool, np.ndarray]]:
+    """ Returns the name, whether it is directed and the edges of each
+        graph benchmarked at the given size. The grid is the largest square
+        that fits, the rest of its nodes are isolated.
+    """
+    side = int(num_nodes ** 0.5)
+    return [
+        ("erdos_renyi", False, generators.erdos_renyi(num_nodes, 4 * num_nodes, seed)),
+        ("barabasi_albert", False, generators.barabasi_albert(num_nodes, 4, seed)),
+        ("grid", False, generators.grid(side, side)),
+        ("long_path", False, generators.long_path(num_nodes)),
+        ("erdos_renyi", True, generators.erdos_renyi(num_nodes, 4 * num_nodes, seed)),
+        ("random_dag", True, generators.random_dag(num_nodes, 4 * num_nodes, seed)),
+        ("long_path", True, generators.long_path(num_nodes)),
+    ]
+
+
+def graph_operations(num_nodes: int,
+                     edge_list: list[tuple[int, int]]) -> dict[str, Callable]:
+    """ Returns the operations timed on undirected graphs. """
+    graph = Graph(num_nodes)
+    graph.add_edges(edge_list)
+    csr = graph.to_csr()
+
+    def add_edges():
+        Graph(num_nodes).add_edges(edge_list)
+
+    return {
+        "Graph.add_edges": add_edges,
+        "Graph.distances_from_node": lambda: graph.distances_from_node(0),
+        "Graph.num_connected_components": graph.num_connected_components,
+        "Graph.is_bipartite": graph.is_bipartite,
+        "CSRGraph.distances_from_node": lambda: csr.distances_from_node(0),
+        "CSRGraph.num_connected_components": csr.num_connected_components,
+        "CSRGraph.is_bipartite": csr.is_bipartite,
+    }
+
+
+def digraph_operations(num_nodes: int,
+                       edge_list: list[tuple[int, int]]) -> dict[str, Callable]:
+    """ Returns the operations timed on directed graphs. """
+    graph = Digraph(num_nodes)
+    graph.add_edges(edge_list)
+
+    def add_edges():
+        Digraph(num_nodes).add_edges(edge_list)
+
+    return {
+        "Digraph.add_edges": add_edges,
+        "Digraph.topological_order": graph.topological_order,
+        "Digraph.num_strongly_connected_components":
+            graph.num_strongly_connected_components,
+    }
+
+
+def time_operation(operation: Callable, repeat: int) -> tuple[float, int]:
+    """ Returns the best time in seconds out of repeat runs of the operation
+        and the peak memory it allocated, measured in a separate run since
+        tracing slows it down.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    operation()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak_memory
+
+
+def run_benchmarks(scales: list[str], repeat: int = 3, seed: int = 0,
+                   operations: list[str] | None = None) -> list[dict]:
+    """ Runs the benchmarks at the given scales and returns one result per
+        graph and operation. If operations is given only the operations
+        whose name contains one of its entries are timed.
+    """
+    results = []
+    for scale in scales:
+        num_nodes = SCALES[scale]
+        for name, directed, edges in make_graphs(num_nodes, seed):
+            edge_list = [tuple(edge) for edge in edges.tolist()]
+            if directed:
+                graph_ops = digraph_operations(num_nodes, edge_list)
+            else:
+                graph_ops = graph_operations(num_nodes, edge_list)
+
+            for operation_name, operation in graph_ops.items():
+                if operations is not None and \
+                        not any(entry in operation_name for entry in operations):
+                    continue
+                seconds, peak_memory = time_operation(operation, repeat)
+                results.append({
+                    "scale": scale,
+                    "graph": name,
+                    "directed": directed,
+                    "num_nodes": num_nodes,
+                    "num_edges": len(edge_list),
+                    "operation": operation_name,
+                    "seconds": seconds,
+                    # JSON has no infinity, an operation too fast for the
+                    # timer has no rate
+                    "ops_per_sec": 1 / seconds if seconds > 0 else None,
+                    "peak_memory_bytes": peak_memory,
+                })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=list(SCALES), action="append",
+                        help="Graph sizes to run, can be repeated. Defaults to small")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs of each operation, the best one is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--operation", action="append",
+                        help="Only run operations whose name contains this text")
+    parser.add_argument("--output", help="Write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": run_benchmarks(args.scale or ["small"], args.repeat,
+                                  args.seed, args.operation),
+    }
+    if args.output is None:
+        print(json.dumps(report, indent=2, allow_nan=False))
+    else:
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=2, allow_nan=False)
+
+
+if __name__ == "__main__":
+    main()
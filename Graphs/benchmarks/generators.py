@@ -0,0 +1,70 @@
+import numpy as np
+
+
+def erdos_renyi(num_nodes: int, num_edges: int, seed: int = 0) -> np.ndarray:
+    """ Returns an (E, 2) array with num_edges node pairs drawn uniformly
+        at random. Repeated pairs and self loops are kept, the graph classes
+        drop or count them as they usually do.
+    """
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, num_nodes, size=(num_edges, 2), dtype=np.int64)
+
+
+def barabasi_albert(num_nodes: int, edges_per_node: int,
+                    seed: int = 0) -> np.ndarray:
+    """ Returns the edges of a Barabasi-Albert graph, whose degrees follow
+        a power law. Every new node is joined to edges_per_node existing
+        nodes chosen with probability proportional to their degree.
+    """
+    rng = np.random.default_rng(seed)
+    num_new_edges = max(num_nodes - edges_per_node, 0) * edges_per_node
+    edges = np.empty((num_new_edges, 2), dtype=np.int64)
+    # Every endpoint of every edge so far, so that picking a random entry
+    # picks a node with probability proportional to its degree. The first
+    # nodes start with one entry each.
+    endpoints = np.empty(edges_per_node + 2 * num_new_edges, dtype=np.int64)
+    endpoints[:edges_per_node] = np.arange(edges_per_node)
+    num_endpoints = edges_per_node
+
+    for ii, node in enumerate(range(edges_per_node, num_nodes)):
+        start = ii * edges_per_node
+        picks = rng.integers(0, num_endpoints, size=edges_per_node)
+        edges[start:start + edges_per_node, 0] = node
+        edges[start:start + edges_per_node, 1] = endpoints[picks]
+        endpoints[num_endpoints:num_endpoints + edges_per_node] = node
+        endpoints[num_endpoints + edges_per_node:
+                  num_endpoints + 2 * edges_per_node] = endpoints[picks]
+        num_endpoints += 2 * edges_per_node
+
+    return edges
+
+
+def grid(num_rows: int, num_cols: int) -> np.ndarray:
+    """ Returns the edges of a num_rows x num_cols grid. Node (row, col)
+        is numbered row * num_cols + col.
+    """
+    nodes = np.arange(num_rows * num_cols, dtype=np.int64).reshape(num_rows, num_cols)
+    horizontal = np.column_stack((nodes[:, :-1].ravel(), nodes[:, 1:].ravel()))
+    vertical = np.column_stack((nodes[:-1, :].ravel(), nodes[1:, :].ravel()))
+    return np.concatenate((horizontal, vertical))
+
+
+def long_path(num_nodes: int) -> np.ndarray:
+    """ Returns the edges of a path through all the nodes in order. Deep
+        searches on it catch recursion limits and quadratic behaviour.
+    """
+    nodes = np.arange(num_nodes, dtype=np.int64)
+    return np.column_stack((nodes[:-1], nodes[1:]))
+
+
+def random_dag(num_nodes: int, num_edges: int, seed: int = 0) -> np.ndarray:
+    """ Returns num_edges random edges of a directed acyclic graph. The
+        edges follow a random hidden order of the nodes, so the node
+        numbers themselves say nothing about the order.
+    """
+    rng = np.random.default_rng(seed)
+    edges = rng.integers(0, num_nodes, size=(num_edges, 2), dtype=np.int64)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    edges.sort(axis=1)
+    order = rng.permutation(num_nodes)
+    return order[edges]
@@ -0,0 +1,24 @@
+from benchmark import run_benchmarks
+import benchmark
+import json
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(["small"], repeat=1,
+                             operations=["bipartite", "topological_order"])
+    operations = {(result["graph"], result["operation"]) for result in results}
+    assert ("grid", "Graph.is_bipartite") in operations
+    assert ("grid", "CSRGraph.is_bipartite") in operations
+    assert ("random_dag", "Digraph.topological_order") in operations
+    assert all(result["ops_per_sec"] > 0 and result["peak_memory_bytes"] >= 0
+               for result in results)
+    assert json.loads(json.dumps(results, allow_nan=False)) == results
+
+
+def test_instant_operations_have_no_rate(monkeypatch):
+    monkeypatch.setattr(benchmark, "time_operation",
+                        lambda operation, repeat: (0.0, 0))
+    results = run_benchmarks(["small"], repeat=1, operations=["is_bipartite"])
+    assert len(results) > 0
+    assert all(result["ops_per_sec"] is None for result in results)
+    json.dumps(results, allow_nan=False)
@@ -0,0 +1,56 @@
+import generators
+import numpy as np
+
+
+def test_erdos_renyi_is_seeded():
+    edges = generators.erdos_renyi(50, 200, seed=1)
+    assert edges.shape == (200, 2)
+    assert edges.min() >= 0 and edges.max() < 50
+    assert np.array_equal(edges, generators.erdos_renyi(50, 200, seed=1))
+    assert not np.array_equal(edges, generators.erdos_renyi(50, 200, seed=2))
+
+
+def test_barabasi_albert():
+    edges = generators.barabasi_albert(500, 3, seed=4)
+    assert edges.shape == (497 * 3, 2)
+    # Every new node links to nodes that were added before it
+    assert np.all(edges[:, 1] < edges[:, 0])
+    assert np.array_equal(edges, generators.barabasi_albert(500, 3, seed=4))
+    # The degrees follow a power law, so a few hubs have most edges
+    degrees = np.bincount(edges.ravel(), minlength=500)
+    assert degrees.max() > 10 * np.median(degrees)
+    assert len(generators.barabasi_albert(2, 3)) == 0
+
+
+def test_grid():
+    edges = generators.grid(3, 4)
+    assert len(edges) == 3 * 3 + 2 * 4
+    assert [0, 1] in edges.tolist()
+    assert [0, 4] in edges.tolist()
+    assert [3, 4] not in edges.tolist()
+
+
+def test_long_path():
+    assert generators.long_path(4).tolist() == [[0, 1], [1, 2], [2, 3]]
+    assert len(generators.long_path(1)) == 0
+
+
+def test_random_dag_is_acyclic():
+    edges = generators.random_dag(200, 1000, seed=3)
+    assert np.all(edges[:, 0] != edges[:, 1])
+
+    # Kahn's algorithm removes every node only if there is no cycle
+    in_degrees = np.bincount(edges[:, 1], minlength=200)
+    successors = [[] for _ in range(200)]
+    for source, target in edges.tolist():
+        successors[source].append(target)
+    ready = [node for node in range(200) if in_degrees[node] == 0]
+    num_removed = 0
+    while len(ready) > 0:
+        node = ready.pop()
+        num_removed += 1
+        for neighbor in successors[node]:
+            in_degrees[neighbor] -= 1
+            if in_degrees[neighbor] == 0:
+                ready.append(neighbor)
+    assert num_removed == 200
@@ -0,0 +1,89 @@
+""" Pieces shared by the read only graphs and graph views of Graphs/graph
+    and Graphs/digraph.
+"""
+from collections.abc import Callable, Iterator, Sequence
+
+
+class ReadOnlyGraphError(TypeError):
+    pass
+
+
+class FilteredRow:
+    """ Neighbors of one node of a view. They are filtered each time they
+        are iterated, so reading a row does not copy it.
+    """
+    __slots__ = ("_row", "_keep")
+
+    def __init__(self, row: Sequence[int], keep: Callable[[int], bool]):
+        self._row = row
+        self._keep = keep
+
+    def __iter__(self) -> Iterator[int]:
+        return filter(self._keep, self._row)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, node: int) -> bool:
+        return node in self._row and self._keep(node)
+
+    def count(self, node: int) -> int:
+        """ Returns how many times the node appears in the row. """
+        if not self._keep(node):
+            return 0
+        return sum(1 for neighbor in self._row if neighbor == node)
+
+    def __repr__(self):
+        return f"FilteredRow({list(self)})"
+
+
+class FilteredRows(Sequence):
+    """ Adjacency list that filters the rows of another one as they are
+        read. Nodes outside the mask, or past its end, have no neighbors
+        and neighbors outside the mask or rejected by the edge filter are
+        skipped. With reverse the rows hold predecessors, so the filter is
+        called as (neighbor, node).
+    """
+    def __init__(self, rows: Sequence, node_mask: Sequence[bool] | None,
+                 edge_filter: Callable[[int, int], bool] | None,
+                 reverse: bool = False):
+        self._rows = rows
+        self._node_mask = node_mask
+        self._edge_filter = edge_filter
+        self._reverse = reverse
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _in_mask(self, node: int) -> bool:
+        node_mask = self._node_mask
+        return node_mask is None or (node < len(node_mask) and bool(node_mask[node]))
+
+    def __getitem__(self, node: int) -> Sequence[int] | FilteredRow:
+        row = self._rows[node]
+        if not self._in_mask(node):
+            return ()
+        edge_filter = self._edge_filter
+        if edge_filter is None:
+            if self._node_mask is None:
+                return row
+            return FilteredRow(row, self._in_mask)
+
+        in_mask = self._in_mask
+        if self._reverse:
+            return FilteredRow(row, lambda neighbor: in_mask(neighbor)
+                               and edge_filter(neighbor, node))
+        return FilteredRow(row, lambda neighbor: in_mask(neighbor)
+                           and edge_filter(node, neighbor))
+
+
+class RowLengths(Sequence):
+    """ The length of every row of an adjacency list, computed on access. """
+    def __init__(self, rows: Sequence):
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, node: int) -> int:
+        return len(self._rows[node])
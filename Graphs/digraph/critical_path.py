@@ -0,0 +1,89 @@
+from array import array
+from collections import namedtuple
+from collections.abc import Sequence
+from itertools import repeat
+
+from digraph import Digraph
+
+# length: duration of the whole graph, the cost of its longest path
+# path: nodes of a longest path, in order
+# earliest_start, latest_start: times each node can start at the earliest
+#     and at the latest without delaying the end of the graph
+# slack: latest minus earliest start, zero for the nodes on critical paths
+CriticalPath = namedtuple("CriticalPath", ["length", "path", "earliest_start",
+                                           "latest_start", "slack"])
+
+
+def critical_path(graph: Digraph, durations: Sequence[float] | None = None,
+                  edge_weights: Sequence[Sequence[float]] | None = None
+                  ) -> CriticalPath:
+    """ Finds the longest path through a DAG where each node takes its
+        duration and each edge adds its weight as a delay between the end of
+        a node and the start of its successor. Durations default to one and
+        edge weights to zero. The edge weights are parallel to the adjacency
+        list, like the weights of a WeightedGraph.
+
+        Runs one forward pass over a topological order for the earliest
+        starts and one backward pass for the latest starts, keeping every
+        vector in an array of doubles.
+    """
+    num_nodes = graph.num_nodes
+    if durations is None:
+        durations = array("d", [1.0]) * num_nodes
+    elif len(durations) != num_nodes:
+        raise ValueError(f"Got {len(durations)} durations for {num_nodes} nodes")
+    if edge_weights is not None:
+        if len(edge_weights) != num_nodes:
+            raise ValueError(f"Got {len(edge_weights)} rows of edge weights "
+                             f"for {num_nodes} nodes")
+        for node, (neighbors, weights) in enumerate(zip(graph.adjacency_list,
+                                                        edge_weights)):
+            if len(weights) != len(neighbors):
+                raise ValueError(f"Node {node} has {len(neighbors)} successors "
+                                 f"but {len(weights)} edge weights")
+
+    # Raises CyclicGraphError if the graph has a cycle
+    order = list(graph.iter_topological_order())
+    if num_nodes == 0:
+        return CriticalPath(0.0, [], array("d"), array("d"), array("d"))
+
+    adjacency_list = graph.adjacency_list
+    no_weights = repeat(0.0)
+
+    # The passes work on lists, which are faster to index than arrays, and
+    # the results are packed into arrays at the end.
+    # Forward pass. The parent of a node is the predecessor that sets its
+    # earliest start, -1 if none does.
+    earliest_start = [0.0] * num_nodes
+    parents = [-1] * num_nodes
+    for node in order:
+        finish = earliest_start[node] + durations[node]
+        weights = edge_weights[node] if edge_weights is not None else no_weights
+        for neighbor, weight in zip(adjacency_list[node], weights):
+            if finish + weight > earliest_start[neighbor]:
+                earliest_start[neighbor] = finish + weight
+                parents[neighbor] = node
+
+    last_node = max(range(num_nodes),
+                    key=lambda node: earliest_start[node] + durations[node])
+    length = earliest_start[last_node] + durations[last_node]
+
+    # Backward pass
+    latest_start = [0.0] * num_nodes
+    for node in reversed(order):
+        finish = length
+        weights = edge_weights[node] if edge_weights is not None else no_weights
+        for neighbor, weight in zip(adjacency_list[node], weights):
+            if latest_start[neighbor] - weight < finish:
+                finish = latest_start[neighbor] - weight
+        latest_start[node] = finish - durations[node]
+
+    path = [last_node]
+    while parents[path[-1]] != -1:
+        path.append(parents[path[-1]])
+    path.reverse()
+
+    slack = array("d", [late - early for late, early
+                        in zip(latest_start, earliest_start)])
+    return CriticalPath(length, path, array("d", earliest_start),
+                        array("d", latest_start), slack)
@@ -1,24 +1,80 @@
-from enum import Enum
+from array import array
+from bisect import bisect_left
 from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+import mmap
+import os
+import sys
+
+import numpy as np
+
+# Code shared with Graphs/graph lives in sibling directories that are not
+# packages
+_graphs_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_graphs_dir, "common"))
+sys.path.insert(0, os.path.join(_graphs_dir, "formats"))
+
+from graph_file import (FLAG_DIRECTED, FLAG_IN_DEGREES,  # noqa: E402
+                        InvalidGraphFileError, map_file_sections,
+                        open_graph_file, write_graph_file)
+from read_only import ReadOnlyGraphError  # noqa: E402
 
 
 class InvalidNodeError(ValueError):
     pass
 
 
-class Colors(Enum):
-    # Colors for labeling the nodes in the isCyclic function
-    white = 0  # Node not processed
-    gray = 1  # Node being processed
-    black = 2  # Node completely processed
+class CyclicGraphError(ValueError):
+    """ Raised when an operation that needs a DAG finds a cycle. The nodes
+        attribute lists the nodes of the cycle, in the order of its edges.
+    """
+    def __init__(self, nodes: list[int],
+                 message: str = "The graph has a cycle through the nodes"):
+        super().__init__(f"{message} {nodes}")
+        self.nodes = nodes
 
 
-class Digraph:
+class AlreadyCyclicGraphError(CyclicGraphError):
+    """ Raised when an edge is added with reject_cycles=True to a graph
+        that already has a cycle, whatever the edge. The nodes attribute
+        lists the nodes of a cycle already in the graph.
+    """
+    def __init__(self, nodes: list[int]):
+        super().__init__(nodes, "The graph is already cyclic, it has a cycle "
+                                "through the nodes")
+
+
+# Node colors for cycle detection. Only white is zero, so the colors can
+# be passed to _depth_first_search as its visited flags
+_WHITE = 0  # Node not processed
+_GRAY = 1  # Node being processed
+_BLACK = 2  # Node completely processed
+
 
-    def __init__(self, num_nodes: int = 0):
+class Digraph:
+    """ Directed graph using an adjacency list representation.
+
+        The in-degree of every node is kept up to date as edges are added.
+        With track_predecessors=True the list of predecessors of every node
+        is kept as well.
+    """
+    def __init__(self, num_nodes: int = 0, track_predecessors: bool = False):
+        self._track_predecessors = track_predecessors
+        self._reset(num_nodes)
+
+    def _reset(self, num_nodes: int) -> None:
+        """ Removes all the edges and sets the number of nodes. """
         self._num_nodes = num_nodes
         self._num_edges = 0
         self._adjacency_list = [[] for _ in range(num_nodes)]
+        # Hashed copy of the adjacency list for constant time edge lookups
+        self._neighbor_sets = [set() for _ in range(num_nodes)]
+        self._in_degrees = [0] * num_nodes
+        self._predecessors = [[] for _ in range(num_nodes)] \
+            if self._track_predecessors else None
+        # Position of each node in a topological order kept while edges are
+        # added with reject_cycles=True. None when it is not maintained.
+        self._order = None
 
     @property
     def num_nodes(self):
@@ -35,21 +91,121 @@ class Digraph:
     def from_edge_list(self, num_nodes: int,
                        edge_list: list[tuple[int, int]]) -> None:
         """ Create a graph from an edge list. """
-        self._adjacency_list = [[] for _ in range(num_nodes)]
-        self._num_nodes = num_nodes
+        self._reset(num_nodes)
         self.add_edges(edge_list)
 
+    def from_edge_array(self, num_nodes: int, edges: np.ndarray) -> None:
+        """ Create a graph from an (E, 2) array of edges.
+
+            Validation, deduplication and sorting are done in vectorized
+            passes, so the neighbors of each node end up in ascending order.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if len(edges) > 0 and (edges.min() < 0 or edges.max() >= num_nodes):
+            raise InvalidNodeError
+
+        # Each edge is packed into one int64 key and the keys are sorted,
+        # which is much faster than np.unique over rows. The distinct edges
+        # end up sorted by source and then by target.
+        keys = np.sort(edges[:, 0] * max(num_nodes, 1) + edges[:, 1])
+        is_first = np.ones(len(keys), dtype=bool)
+        np.not_equal(keys[1:], keys[:-1], out=is_first[1:])
+        edges = np.column_stack(np.divmod(keys[is_first], max(num_nodes, 1)))
+        bounds = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edges[:, 0], minlength=num_nodes), out=bounds[1:])
+
+        targets = edges[:, 1].tolist()
+        bounds = bounds.tolist()
+        self._adjacency_list = [targets[bounds[node]:bounds[node + 1]]
+                                for node in range(num_nodes)]
+        self._neighbor_sets = [set(neighbors) for neighbors in self._adjacency_list]
+        self._num_nodes = num_nodes
+        self._num_edges = len(edges)
+        self._order = None
+        self._in_degrees = np.bincount(edges[:, 1], minlength=num_nodes).tolist()
+        self._predecessors = None
+        if self._track_predecessors:
+            # Group the sources by target in the same way
+            order = np.argsort(edges[:, 1] * max(num_nodes, 1) + edges[:, 0])
+            sources = edges[order, 0].tolist()
+            bounds = [0] + np.cumsum(self._in_degrees, dtype=np.int64).tolist()
+            self._predecessors = [sources[bounds[node]:bounds[node + 1]]
+                                  for node in range(num_nodes)]
+
+    def from_edge_file(self, num_nodes: int, path: str,
+                       dtype: np.dtype = np.int32) -> None:
+        """ Create a graph from a binary file of (source, target) pairs.
+            The file is memory mapped rather than read.
+        """
+        if os.path.getsize(path) == 0:
+            edges = np.empty((0, 2), dtype=dtype)
+        else:
+            edges = np.memmap(path, dtype=dtype, mode="r").reshape(-1, 2)
+        self.from_edge_array(num_nodes, edges)
+
+    def save(self, path: str) -> None:
+        """ Writes the graph to a binary file that can be opened with
+            Digraph.open. The successors of each node are stored sorted.
+        """
+        offsets = array("q", [0])
+        targets = array("i")
+        for neighbors in self._adjacency_list:
+            targets.extend(sorted(neighbors))
+            offsets.append(len(targets))
+        write_graph_file(path, FLAG_DIRECTED | FLAG_IN_DEGREES, self._num_nodes,
+                         self._num_edges,
+                         [offsets, targets, array("i", self._in_degrees)])
+
+    @staticmethod
+    def open(path: str) -> "MappedDigraph":
+        """ Opens a graph saved with save. The file is memory mapped and the
+            graph reads its arrays straight from the mapping, so nothing is
+            parsed and processes opening the same file share its pages.
+            The returned graph cannot be modified.
+        """
+        mapping, flags, num_nodes, num_edges = open_graph_file(path)
+        if not flags & FLAG_DIRECTED or not flags & FLAG_IN_DEGREES:
+            mapping.close()
+            raise InvalidGraphFileError(f"{path} does not hold a directed graph")
+        sections = map_file_sections(mapping, flags, num_nodes)
+        return MappedDigraph(sections["offsets"], sections["targets"],
+                             sections["in_degrees"], num_edges, mapping)
+
     def _validate_node(self, node: int) -> None:
         """ Check if a node is part of the graph. """
         if node < 0 or node >= self._num_nodes:
             raise InvalidNodeError
 
-    def add_edge(self, node_1: int, node_2: int) -> None:
+    def add_edge(self, node_1: int, node_2: int,
+                 reject_cycles: bool = False) -> None:
         """ Adds an edge to the graph that goes from
             node_1 to node_2.
+
+            With reject_cycles=True a CyclicGraphError is raised instead of
+            adding an edge that would close a cycle. The first such call
+            sorts the graph; after that a topological order is updated on
+            every insertion, looking only at the nodes between the two
+            ends of the edge in that order. Keeping the order turns on
+            predecessor tracking for good, which costs one more list entry
+            per edge. Adding a cycle with reject_cycles=False drops the
+            order, and later calls with reject_cycles=True raise
+            AlreadyCyclicGraphError for any edge until the graph is rebuilt.
         """
         if not self.is_edge(node_1, node_2):
+            if reject_cycles and self._order is None:
+                self._start_online_order()
+            if self._order is not None:
+                cycle = self._update_order(node_1, node_2)
+                if len(cycle) > 0:
+                    if reject_cycles:
+                        raise CyclicGraphError(cycle)
+                    # The graph is no longer a DAG so there is no order to keep
+                    self._order = None
             self._adjacency_list[node_1].append(node_2)
+            self._neighbor_sets[node_1].add(node_2)
+            self._in_degrees[node_2] += 1
+            if self._predecessors is not None:
+                self._predecessors[node_2].append(node_1)
             self._num_edges += 1
 
     def add_edges(self, edge_list: list[tuple[int, int]]) -> None:
@@ -64,14 +220,100 @@ class Digraph:
         self._validate_node(node_1)
         self._validate_node(node_2)
 
-        if node_2 in self._adjacency_list[node_1]:
-            return True
-        return False
+        return self._has_edge(node_1, node_2)
+
+    def _has_edge(self, node_1: int, node_2: int) -> bool:
+        """ Edge lookup without validating the nodes. """
+        return node_2 in self._neighbor_sets[node_1]
 
     def add_node(self) -> None:
         """ Add a new node to the graph. """
         self._num_nodes += 1
         self._adjacency_list.append([])
+        self._neighbor_sets.append(set())
+        self._in_degrees.append(0)
+        if self._predecessors is not None:
+            self._predecessors.append([])
+        if self._order is not None:
+            self._order.append(self._num_nodes - 1)
+
+    def _start_online_order(self) -> None:
+        """ Starts keeping a topological order of the graph, which must be
+            a DAG. The order is updated using the predecessors of the nodes,
+            so they are tracked from now on.
+        """
+        order = [0] * self._num_nodes
+        try:
+            for position, node in enumerate(self.iter_topological_order()):
+                order[node] = position
+        except CyclicGraphError as error:
+            raise AlreadyCyclicGraphError(error.nodes) from None
+
+        if self._predecessors is None:
+            self._start_tracking_predecessors()
+        self._order = order
+
+    def _start_tracking_predecessors(self) -> None:
+        """ Builds the predecessors of every node and keeps them up to date
+            as edges are added from now on.
+        """
+        self._predecessors = [[] for _ in range(self._num_nodes)]
+        for node in range(self._num_nodes):
+            for neighbor in self._adjacency_list[node]:
+                self._predecessors[neighbor].append(node)
+        self._track_predecessors = True
+
+    def _update_order(self, node_1: int, node_2: int) -> list[int]:
+        """ Updates the topological order for a new edge from node_1 to
+            node_2 with the Pearce-Kelly algorithm. If the edge would close
+            a cycle the order is left unchanged and the nodes of the cycle
+            are returned. Otherwise returns an empty list.
+        """
+        order = self._order
+        lower_bound = order[node_2]
+        upper_bound = order[node_1]
+        if lower_bound > upper_bound:
+            return []
+        if node_1 == node_2:
+            return [node_1]
+
+        # Nodes reachable from node_2 that are placed before node_1
+        parents = {node_2: node_2}
+        stack = [node_2]
+        while len(stack) > 0:
+            current_node = stack.pop()
+            for neighbor in self._adjacency_list[current_node]:
+                if neighbor == node_1:
+                    cycle = [current_node]
+                    while cycle[-1] != node_2:
+                        cycle.append(parents[cycle[-1]])
+                    cycle.append(node_1)
+                    cycle.reverse()
+                    return cycle
+                if neighbor not in parents and order[neighbor] < upper_bound:
+                    parents[neighbor] = current_node
+                    stack.append(neighbor)
+        forward = list(parents)
+
+        # Nodes that reach node_1 and are placed after node_2
+        backward = {node_1}
+        stack = [node_1]
+        while len(stack) > 0:
+            current_node = stack.pop()
+            for predecessor in self._predecessors[current_node]:
+                if predecessor not in backward and order[predecessor] > lower_bound:
+                    backward.add(predecessor)
+                    stack.append(predecessor)
+
+        # Move the backward nodes before the forward nodes, reusing the
+        # positions they occupied between them
+        forward.sort(key=order.__getitem__)
+        backward = sorted(backward, key=order.__getitem__)
+        moved = backward + forward
+        positions = sorted(order[node] for node in moved)
+        for node, position in zip(moved, positions):
+            order[node] = position
+        return []
 
     def out_degree(self, node: int) -> int:
         """ Returns the out degree of the given node. """
@@ -81,121 +323,348 @@ class Digraph:
     def in_degree(self, node: int) -> int:
         """ Returns the in-degree of the given node. """
         self._validate_node(node)
+        return self._in_degrees[node]
 
-        node_in_degree = 0
-        for node_list in self._adjacency_list:
-            for neighbor in node_list:
-                if neighbor == node:
-                    node_in_degree += 1
+    def in_degrees(self) -> list[int]:
+        """ Returns the in-degree of every node. The list is owned by the
+            graph and must not be modified.
+        """
+        return self._in_degrees
 
-        return node_in_degree
+    def predecessors(self, node: int) -> list[int]:
+        """ Returns the nodes with an edge going to the given node.
 
-    def _is_cyclic_util(self, node: int, colors: list[Colors]) -> bool:
-        """ Traverse the nodes reachable from the given node,
-            assigning them colors and if two adjacent nodes are found
-            to be gray as cycle has been found.
+            Takes O(in-degree) when predecessors are tracked. Otherwise
+            every adjacency list has to be scanned.
         """
-        # Mark the node as being processed
-        colors[node] = Colors.gray
-
-        for neighbor in self._adjacency_list[node]:
+        self._validate_node(node)
+        if self._predecessors is not None:
+            return self._predecessors[node]
+        return [other for other in range(self._num_nodes)
+                if self._has_edge(other, node)]
+
+    def _depth_first_search(
+            self, start_node: int, visited: list[bool],
+            pre_visit: Callable[[int], bool] | None = None,
+            post_visit: Callable[[int], None] | None = None,
+            visited_neighbor: Callable[[int, int], bool] | None = None
+    ) -> bool:
+        """ Traverse the nodes reachable from the given node in depth first
+            order, using an explicit stack instead of recursion.
+
+            pre_visit is called when a node is discovered and post_visit
+            once all of its neighbors have been explored. visited_neighbor
+            is called with (node, neighbor) for every edge that leads to an
+            already visited node. If pre_visit or visited_neighbor return
+            True the search stops and this method returns True.
+        """
+        adjacency_list = self._adjacency_list
+        visited[start_node] = True
+        if pre_visit is not None and pre_visit(start_node):
+            return True
 
-            # An adjacent node is gray too so there must be a cycle
-            if colors[neighbor] == Colors.gray:
-                return True
-            if colors[neighbor] == Colors.white and self._is_cyclic_util(neighbor, colors):
-                return True
+        # Each stack frame holds a node and an iterator over its remaining
+        # neighbors, so a node is resumed where it was left
+        stack = [(start_node, iter(adjacency_list[start_node]))]
+        while len(stack) > 0:
+            current_node, neighbors = stack[-1]
+            for neighbor in neighbors:
+                if not visited[neighbor]:
+                    visited[neighbor] = True
+                    if pre_visit is not None and pre_visit(neighbor):
+                        return True
+                    stack.append((neighbor, iter(adjacency_list[neighbor])))
+                    break
+                if visited_neighbor is not None and \
+                        visited_neighbor(current_node, neighbor):
+                    return True
+            else:
+                stack.pop()
+                if post_visit is not None:
+                    post_visit(current_node)
 
-        # No cycle was found. We mark the node as completely processed
-        colors[node] = Colors.black
         return False
 
-    def is_cyclic(self) -> bool:
-        """ Returns True if the graph has a cycle. """
-
-        # We use the coloring method to determine if the graph is cyclic
-        # or not
-        colors = [Colors.white] * self._num_nodes
+    def _is_cyclic_util(self, node: int, colors: bytearray,
+                        path: list[int]) -> list[int]:
+        """ Traverse the nodes reachable from the given node,
+            assigning them colors and if two adjacent nodes are found
+            to be gray as cycle has been found.
 
-        # Traverse the graph in DFS
-        for node in range(self._num_nodes):
-            if colors[node] == Colors.white and \
-                    self._is_cyclic_util(node, colors):
+            The path holds the gray nodes in the order they were entered.
+            Returns the nodes of the cycle found, or an empty list.
+        """
+        cycle = []
+
+        def mark_gray(current_node: int) -> bool:
+            # The search has already set a nonzero visited flag, which is
+            # replaced by the color
+            colors[current_node] = _GRAY
+            path.append(current_node)
+            return False
+
+        def mark_black(current_node: int) -> None:
+            # No cycle was found. We mark the node as completely processed
+            path.pop()
+            colors[current_node] = _BLACK
+
+        def is_gray(current_node: int, neighbor: int) -> bool:
+            # An adjacent node is gray too so there must be a cycle, made
+            # of the path from the neighbor down to the current node
+            if colors[neighbor] == _GRAY:
+                cycle.extend(path[path.index(neighbor):])
                 return True
+            return False
 
-        return False
+        self._depth_first_search(node, colors, mark_gray, mark_black, is_gray)
+        return cycle
 
-    def _explore_and_stack(self, current_node: int,
-                           visited: list[bool],
-                           stack: deque) -> None:
-        """ Explore the nodes reachable from the given node and put them
-            in a stack.
+    def find_cycle(self) -> list[int]:
+        """ Returns the nodes of a cycle of the graph, in the order of its
+            edges, or an empty list if the graph is acyclic.
         """
-        visited[current_node] = True
-        for node in self._adjacency_list[current_node]:
-            if not visited[node]:
-                self._explore_and_stack(node, visited, stack)
+        colors = bytearray(self._num_nodes)
+        path = []
+        for node in range(self._num_nodes):
+            if colors[node] == _WHITE:
+                cycle = self._is_cyclic_util(node, colors, path)
+                if len(cycle) > 0:
+                    return cycle
+        return []
 
-        stack.append(current_node)
+    def is_cyclic(self) -> bool:
+        """ Returns True if the graph has a cycle. """
+        return len(self.find_cycle()) > 0
 
     def topological_order(self) -> list[int]:
         """ Compute the topological ordering of the graph.
-            Returns a list with the nodes.
+            Returns a list with the nodes, or an empty list if the graph
+            has a cycle.
         """
-        if self.is_cyclic():
-            return []
-        # We do a DFS while pushing the nodes into a stack.
-        # The stack will contain the nodes in reverse topological order
+        # We do a DFS while pushing the nodes into a stack once they are
+        # finished. The stack will contain the nodes in reverse topological
+        # order. Reaching a node that is still in the DFS path means there
+        # is a cycle, so it is detected in the same pass.
         visited = [False] * self._num_nodes
-        stack = deque()
-        for node in range(self._num_nodes):
-            if not visited[node]:
-                self._explore_and_stack(node, visited, stack)
-        assert len(stack) == self._num_nodes
+        in_path = [False] * self._num_nodes
+        stack = []
 
-        topological_order = []
-        while len(stack) > 0:
-            topological_order.append(stack.pop())
+        def enter(node: int) -> bool:
+            in_path[node] = True
+            return False
 
-        return topological_order
+        def leave(node: int) -> None:
+            in_path[node] = False
+            stack.append(node)
+
+        def closes_cycle(node: int, neighbor: int) -> bool:
+            return in_path[neighbor]
 
-    def reverse(self) -> "Digraph":
-        """ Returns the reverse graph. """
-        reverse_graph = Digraph(self._num_nodes)
         for node in range(self._num_nodes):
+            if not visited[node] and \
+                    self._depth_first_search(node, visited, enter,
+                                             leave, closes_cycle):
+                return []
+
+        stack.reverse()
+        return stack
+
+    def iter_topological_order(self) -> Iterator[int]:
+        """ Yields the nodes of the graph in topological order.
+
+            Uses Kahn's algorithm: a node is yielded as soon as all of its
+            predecessors have been, so the consumer can start working on
+            the first nodes before the rest are sorted. If the graph has
+            a cycle a CyclicGraphError is raised after the acyclic part has
+            been yielded, listing the nodes of one of the cycles.
+        """
+        in_degrees = list(self._in_degrees)
+        queue = deque(node for node in range(self._num_nodes)
+                      if in_degrees[node] == 0)
+        num_ordered = 0
+        while len(queue) > 0:
+            node = queue.popleft()
+            num_ordered += 1
+            yield node
             for neighbor in self._adjacency_list[node]:
-                reverse_graph.add_edge(neighbor, node)
+                in_degrees[neighbor] -= 1
+                if in_degrees[neighbor] == 0:
+                    queue.append(neighbor)
+
+        if num_ordered < self._num_nodes:
+            # The nodes left over include the ones downstream of a cycle,
+            # so a search finds the cycle itself
+            raise CyclicGraphError(self.find_cycle())
 
+    def reverse(self) -> "Digraph":
+        """ Returns the reverse graph. """
+        predecessors = self._predecessors
+        reverse_graph = Digraph(self._num_nodes, predecessors is not None)
+        if predecessors is not None:
+            reverse_adjacency_list = [list(nodes) for nodes in predecessors]
+            reverse_graph._predecessors = [list(nodes) for nodes in self._adjacency_list]
+        else:
+            reverse_adjacency_list = reverse_graph._adjacency_list
+            for node in range(self._num_nodes):
+                for neighbor in self._adjacency_list[node]:
+                    reverse_adjacency_list[neighbor].append(node)
+
+        reverse_graph._adjacency_list = reverse_adjacency_list
+        reverse_graph._neighbor_sets = [set(neighbors)
+                                        for neighbors in reverse_adjacency_list]
+        reverse_graph._in_degrees = [len(neighbors) for neighbors in self._adjacency_list]
+        reverse_graph._num_edges = self._num_edges
         return reverse_graph
 
     def _explore(self, current_node: int, visited: list[bool]) -> None:
         """ Traverse the nodes reachable from the given node. """
-        visited[current_node] = True
-        for node in self._adjacency_list[current_node]:
+        self._depth_first_search(current_node, visited)
+
+    def strongly_connected_components(self) -> list[int]:
+        """ Returns the strongly connected component of each node.
+
+            Uses Tarjan's algorithm, which finds every component in a single
+            depth first search. Components are numbered in topological order,
+            so every edge between two components goes from a lower to a
+            higher number.
+        """
+        num_nodes = self._num_nodes
+        visited = [False] * num_nodes
+        index = [0] * num_nodes  # Discovery order of each node
+        low_link = [0] * num_nodes  # Lowest index reachable from the node
+        on_stack = [False] * num_nodes
+        stack = []  # Nodes whose component has not been found yet
+        path = []  # Nodes in the current depth first search path
+        components = [0] * num_nodes
+        num_components = 0
+        counter = 0
+
+        def discover(node: int) -> bool:
+            nonlocal counter
+            index[node] = low_link[node] = counter
+            counter += 1
+            stack.append(node)
+            on_stack[node] = True
+            path.append(node)
+            return False
+
+        def visited_neighbor(node: int, neighbor: int) -> bool:
+            if on_stack[neighbor] and index[neighbor] < low_link[node]:
+                low_link[node] = index[neighbor]
+            return False
+
+        def finish(node: int) -> None:
+            nonlocal num_components
+            path.pop()
+            if len(path) > 0 and low_link[node] < low_link[path[-1]]:
+                low_link[path[-1]] = low_link[node]
+            # The node is the root of a component, which is on top of the stack
+            if low_link[node] == index[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    components[member] = num_components
+                    if member == node:
+                        break
+                num_components += 1
+
+        for node in range(num_nodes):
             if not visited[node]:
-                self._explore(node, visited)
+                self._depth_first_search(node, visited, discover,
+                                         finish, visited_neighbor)
+
+        # Tarjan's algorithm finds the components in reverse topological order
+        return [num_components - 1 - component for component in components]
+
+    def condensation(self) -> tuple[list[int], "Digraph"]:
+        """ Returns the strongly connected component of each node and the
+            condensation of the graph: a DAG with a node for each component
+            and an edge between components joined by at least one edge.
+        """
+        components = self.strongly_connected_components()
+        num_components = max(components) + 1 if self._num_nodes > 0 else 0
+
+        condensation = Digraph(num_components)
+        for node in range(self._num_nodes):
+            for neighbor in self._adjacency_list[node]:
+                if components[node] != components[neighbor]:
+                    condensation.add_edge(components[node], components[neighbor])
+
+        return components, condensation
 
     def num_strongly_connected_components(self) -> int:
         """ Returns the number of strongly connected components. """
+        if self._num_nodes == 0:
+            return 0
+        return max(self.strongly_connected_components()) + 1
 
-        # First we do a DFS of the original graph while pushing the nodes
-        # into a stack
-        visited = [False] * self._num_nodes
-        stack = deque()
-        for node in range(self._num_nodes):
-            if not visited[node]:
-                self._explore_and_stack(node, visited, stack)
-        assert len(stack) == self._num_nodes
-
-        reverse_graph = self.reverse()
-        for ii in range(len(visited)):
-            visited[ii] = False
-        # Now we do a DFS of the reverse graph so, we can count the number of SCC
-        num_scc = 0
-        while len(stack) > 0:
-            current_node = stack.pop()
-            if not visited[current_node]:
-                reverse_graph._explore(current_node, visited)
-                num_scc += 1
 
-        return num_scc
+class _CSRRows(Sequence):
+    """ Read only adjacency list over compressed sparse row arrays. """
+    def __init__(self, offsets: memoryview, targets: memoryview):
+        self._offsets = offsets
+        self._targets = targets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, node: int) -> memoryview:
+        if node < 0 or node >= len(self._offsets) - 1:
+            raise IndexError(node)
+        return self._targets[self._offsets[node]:self._offsets[node + 1]]
+
+
+class ReadOnlyDigraph(Digraph):
+    """ Base class of digraphs that cannot be modified. Every method that
+        adds nodes or edges raises ReadOnlyGraphError.
+
+        Subclasses provide the number of nodes and edges, the adjacency
+        list, the in-degrees and the predecessors, and an edge lookup that
+        does not use neighbor sets.
+    """
+    def __init__(self, track_predecessors: bool = False):
+        super().__init__(0, track_predecessors)
+
+    def _reset(self, num_nodes: int) -> None:
+        # Only called by Digraph.__init__, the subclass owns the storage
+        self._neighbor_sets = None
+        self._order = None
+
+    def from_edge_list(self, num_nodes: int,
+                       edge_list: list[tuple[int, int]]) -> None:
+        raise ReadOnlyGraphError(f"{type(self).__name__} cannot be modified")
+
+    def from_edge_array(self, num_nodes: int, edges: np.ndarray) -> None:
+        raise ReadOnlyGraphError(f"{type(self).__name__} cannot be modified")
+
+    def add_edge(self, node_1: int, node_2: int,
+                 reject_cycles: bool = False) -> None:
+        raise ReadOnlyGraphError(f"{type(self).__name__} cannot be modified")
+
+    def add_node(self) -> None:
+        raise ReadOnlyGraphError(f"{type(self).__name__} cannot be modified")
+
+
+class MappedDigraph(ReadOnlyDigraph):
+    """ Read only digraph whose adjacency list is a memory mapped graph file.
+
+        It supports every query of Digraph. Edge lookups use a binary search
+        over the sorted successors of a node.
+    """
+    def __init__(self, offsets: memoryview, targets: memoryview,
+                 in_degrees: memoryview, num_edges: int, mapping: mmap.mmap):
+        super().__init__()
+        self._num_nodes = len(offsets) - 1
+        self._num_edges = num_edges
+        self._adjacency_list = _CSRRows(offsets, targets)
+        self._in_degrees = in_degrees
+        self._predecessors = None
+        self._offsets = offsets
+        self._targets = targets
+        # The views point into the mapping, so it must stay open
+        self._mapping = mapping
+
+    def _has_edge(self, node_1: int, node_2: int) -> bool:
+        end = self._offsets[node_1 + 1]
+        index = bisect_left(self._targets, node_2, self._offsets[node_1], end)
+        return index < end and self._targets[index] == node_2
@@ -0,0 +1,143 @@
+from collections.abc import Callable, Iterator, Sequence
+
+from digraph import Digraph, ReadOnlyDigraph
+from read_only import FilteredRows, RowLengths
+
+
+class _InDegrees(Sequence):
+    """ In-degrees of an adjacency list without predecessors. A single
+        in-degree counts the node in every row, and iterating counts all of
+        them in one pass over the edges.
+    """
+    def __init__(self, rows: Sequence[Sequence[int]]):
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, node: int) -> int:
+        if node < 0 or node >= len(self._rows):
+            raise IndexError(f"{node} is not a node of the view")
+        return sum(row.count(node) for row in self._rows)
+
+    def __iter__(self) -> Iterator[int]:
+        in_degrees = [0] * len(self._rows)
+        for row in self._rows:
+            for neighbor in row:
+                in_degrees[neighbor] += 1
+        return iter(in_degrees)
+
+
+class ReversedDigraph(ReadOnlyDigraph):
+    """ View of a digraph with the direction of every edge reversed.
+
+        The successors of the view are the predecessors of the graph and
+        the other way around, so the graph must track its predecessors.
+        Nothing is copied and the view always reads the current storage of
+        the graph, so it follows later edges and rebuilds of the graph.
+    """
+    def __init__(self, graph: Digraph):
+        if graph._predecessors is None:
+            raise ValueError("ReversedDigraph needs a graph that tracks "
+                             "its predecessors")
+        super().__init__(track_predecessors=True)
+        self._graph = graph
+
+    @property
+    def _num_nodes(self) -> int:
+        return self._graph.num_nodes
+
+    @property
+    def _num_edges(self) -> int:
+        return self._graph.num_edges
+
+    @property
+    def _adjacency_list(self) -> Sequence[Sequence[int]]:
+        return self._graph._predecessors
+
+    @property
+    def _predecessors(self) -> Sequence[Sequence[int]]:
+        return self._graph._adjacency_list
+
+    @property
+    def _in_degrees(self) -> Sequence[int]:
+        return RowLengths(self._graph._adjacency_list)
+
+    def _has_edge(self, node_1: int, node_2: int) -> bool:
+        return self._graph._has_edge(node_2, node_1)
+
+    def __repr__(self):
+        return f"ReversedDigraph(num_nodes={self._num_nodes}, num_edges={self._num_edges})"
+
+
+class SubDigraph(ReadOnlyDigraph):
+    """ View of the part of a digraph given by a node mask and an edge
+        filter. The rows of the adjacency list are filtered as they are
+        iterated, so the graph is never copied and the view follows later
+        edges and rebuilds of the graph. Nodes past the end of the mask
+        are outside the view.
+
+        Nodes keep their numbers, so results per node line up with the
+        graph. Nodes outside the mask stay in the view without edges, which
+        means they are counted as isolated nodes by algorithms that visit
+        every node. Counting the edges or the successors of a node takes
+        O(E) and O(out-degree), and unless the graph tracks its predecessors
+        finding an in-degree takes O(E).
+    """
+    def __init__(self, graph: Digraph, node_mask: Sequence[bool] | None = None,
+                 edge_filter: Callable[[int, int], bool] | None = None):
+        if node_mask is not None and len(node_mask) != graph.num_nodes:
+            raise ValueError(f"The node mask has {len(node_mask)} entries "
+                             f"for {graph.num_nodes} nodes")
+        super().__init__(track_predecessors=graph._predecessors is not None)
+        self._graph = graph
+        self._node_mask = node_mask
+        self._edge_filter = edge_filter
+
+    @property
+    def _num_nodes(self) -> int:
+        return self._graph.num_nodes
+
+    @property
+    def _num_edges(self) -> int:
+        return sum(len(neighbors) for neighbors in self._adjacency_list)
+
+    @property
+    def _adjacency_list(self) -> FilteredRows:
+        return FilteredRows(self._graph._adjacency_list, self._node_mask,
+                            self._edge_filter)
+
+    @property
+    def _predecessors(self) -> FilteredRows | None:
+        if self._graph._predecessors is None:
+            return None
+        return FilteredRows(self._graph._predecessors, self._node_mask,
+                            self._edge_filter, reverse=True)
+
+    @property
+    def _in_degrees(self) -> Sequence[int]:
+        predecessors = self._predecessors
+        if predecessors is not None:
+            return RowLengths(predecessors)
+        return _InDegrees(self._adjacency_list)
+
+    def in_degrees(self) -> list[int]:
+        """ Returns a new list with the in-degree of every node in the view. """
+        return list(self._in_degrees)
+
+    def predecessors(self, node: int) -> list[int]:
+        """ Returns a new list with the predecessors of the node in the view. """
+        return list(super().predecessors(node))
+
+    def _has_edge(self, node_1: int, node_2: int) -> bool:
+        node_mask = self._node_mask
+        if node_mask is not None and \
+                not (node_1 < len(node_mask) and node_2 < len(node_mask) and
+                     node_mask[node_1] and node_mask[node_2]):
+            return False
+        if self._edge_filter is not None and not self._edge_filter(node_1, node_2):
+            return False
+        return self._graph._has_edge(node_1, node_2)
+
+    def __repr__(self):
+        return f"SubDigraph(num_nodes={self._num_nodes}, num_edges={self._num_edges})"
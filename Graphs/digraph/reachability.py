@@ -0,0 +1,196 @@
+from array import array
+import random
+import sys
+import time
+
+from digraph import Digraph, InvalidNodeError
+
+
+class ReachabilityIndex:
+    """ Answers whether a node can reach another in a digraph that does
+        not change after the index is built.
+
+        The graph is condensed into the DAG of its strongly connected
+        components, which are numbered in topological order, so a node can
+        only reach components with a number at least as large as its own.
+        Small condensations store their full transitive closure as one
+        integer bitset per component. Larger ones get GRAIL labels: each
+        label is an interval [low, rank] from a randomized depth first
+        search, where rank is the post order of a component and low the
+        smallest rank it reaches. If the interval of the target is not
+        inside the interval of the source for some label, the target is not
+        reachable. Each search also gives the interval [start, rank] of the
+        descendants of a component in its search tree, and a target inside
+        it is reachable. Otherwise a depth first search pruned by the labels
+        decides.
+    """
+    def __init__(self, graph: Digraph, num_labels: int = 3,
+                 closure_limit: int = 2048, seed: int = 0):
+        start = time.perf_counter()
+        components, condensation = graph.condensation()
+        self._num_nodes = graph.num_nodes
+        self._components = array("i", components)
+        self._adjacency_list = [array("i", neighbors)
+                                for neighbors in condensation.adjacency_list]
+        self._closure = None
+        self._ranks = []
+        self._lows = []
+        self._starts = []
+
+        if condensation.num_nodes <= closure_limit:
+            self._build_closure()
+        else:
+            rng = random.Random(seed)
+            for _ in range(num_labels):
+                self._add_label(rng)
+        self._build_time = time.perf_counter() - start
+
+    def _build_closure(self) -> None:
+        """ Computes the set of components reachable from each component,
+            as a bitset, in reverse topological order.
+        """
+        num_components = len(self._adjacency_list)
+        closure = [0] * num_components
+        for component in reversed(range(num_components)):
+            reachable = 1 << component
+            for neighbor in self._adjacency_list[component]:
+                reachable |= closure[neighbor]
+            closure[component] = reachable
+        self._closure = closure
+
+    def _add_label(self, rng: random.Random) -> None:
+        """ Runs a depth first search over the condensation visiting roots
+            and neighbors in random order, and stores the post order rank
+            of every component and the smallest rank it can reach. It also
+            keeps where the subtree of each component starts, so [start,
+            rank] holds exactly its descendants in the search tree.
+        """
+        adjacency_list = self._adjacency_list
+        num_components = len(adjacency_list)
+        ranks = array("i", [0]) * num_components
+        lows = array("i", [0]) * num_components
+        starts = array("i", [0]) * num_components
+        counter = 0
+
+        def enter(component: int) -> tuple[int, list[int]]:
+            # Ranks start at one, so zero means not visited and -1 marks a
+            # component in the stack, which following a DAG never reaches
+            starts[component] = counter + 1
+            ranks[component] = -1
+            neighbors = list(adjacency_list[component])
+            rng.shuffle(neighbors)
+            return component, iter(neighbors)
+
+        roots = list(range(num_components))
+        rng.shuffle(roots)
+        for root in roots:
+            if ranks[root] != 0:
+                continue
+            stack = [enter(root)]
+            while len(stack) > 0:
+                component, neighbors = stack[-1]
+                for neighbor in neighbors:
+                    if ranks[neighbor] == 0:
+                        stack.append(enter(neighbor))
+                        break
+                else:
+                    stack.pop()
+                    counter += 1
+                    ranks[component] = counter
+                    low = counter
+                    for neighbor in adjacency_list[component]:
+                        if lows[neighbor] < low:
+                            low = lows[neighbor]
+                    lows[component] = low
+
+        self._ranks.append(ranks)
+        self._lows.append(lows)
+        self._starts.append(starts)
+
+    @property
+    def build_time(self) -> float:
+        """ Returns the seconds it took to build the index. """
+        return self._build_time
+
+    @property
+    def num_components(self) -> int:
+        """ Returns the number of strongly connected components. """
+        return len(self._adjacency_list)
+
+    @property
+    def uses_closure(self) -> bool:
+        """ Returns true if the index stores the full transitive closure. """
+        return self._closure is not None
+
+    @property
+    def size(self) -> int:
+        """ Returns the approximate size of the index in bytes. """
+        arrays = [self._components] + self._adjacency_list
+        arrays += self._ranks + self._lows + self._starts
+        size = sum(len(values) * values.itemsize for values in arrays)
+        if self._closure is not None:
+            size += sum(sys.getsizeof(reachable) for reachable in self._closure)
+        return size
+
+    def _may_reach(self, component_1: int, component_2: int) -> bool:
+        """ Returns false if the labels prove that component_1 cannot
+            reach component_2.
+        """
+        for ranks, lows in zip(self._ranks, self._lows):
+            if ranks[component_2] > ranks[component_1] or \
+                    lows[component_2] < lows[component_1]:
+                return False
+        return True
+
+    def _tree_reaches(self, component_1: int, component_2: int) -> bool:
+        """ Returns true if component_2 descends from component_1 in the
+            tree of one of the labeling searches.
+        """
+        for ranks, starts in zip(self._ranks, self._starts):
+            if starts[component_1] <= ranks[component_2] <= ranks[component_1]:
+                return True
+        return False
+
+    def reachable(self, source: int, target: int) -> bool:
+        """ Returns true if there is a path from source to target. """
+        if source < 0 or source >= self._num_nodes:
+            raise InvalidNodeError(f"{source} is not a node of this graph")
+        if target < 0 or target >= self._num_nodes:
+            raise InvalidNodeError(f"{target} is not a node of this graph")
+
+        component_1 = self._components[source]
+        component_2 = self._components[target]
+        if component_1 == component_2:
+            return True
+        if component_1 > component_2:
+            return False
+        if self._closure is not None:
+            return (self._closure[component_1] >> component_2) & 1 == 1
+        if not self._may_reach(component_1, component_2):
+            return False
+        if self._tree_reaches(component_1, component_2):
+            return True
+        return self._search(component_1, component_2)
+
+    def _search(self, component_1: int, component_2: int) -> bool:
+        """ Depth first search from component_1 that skips components
+            whose labels show they cannot reach component_2 and stops at
+            the first one whose search tree contains it.
+        """
+        visited = {component_1}
+        stack = [component_1]
+        while len(stack) > 0:
+            component = stack.pop()
+            for neighbor in self._adjacency_list[component]:
+                if neighbor in visited or neighbor > component_2 or \
+                        not self._may_reach(neighbor, component_2):
+                    continue
+                if self._tree_reaches(neighbor, component_2):
+                    return True
+                visited.add(neighbor)
+                stack.append(neighbor)
+        return False
+
+    def __repr__(self):
+        return (f"ReachabilityIndex(num_nodes={self._num_nodes}, "
+                f"num_components={self.num_components})")
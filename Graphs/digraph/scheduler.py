@@ -0,0 +1,132 @@
+from collections import namedtuple
+from collections.abc import Callable, Sequence
+from concurrent.futures import (Executor, FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+import heapq
+import os
+import time
+from typing import Any
+
+from critical_path import critical_path
+from digraph import Digraph
+
+# Seconds from the start of the run until the task started and finished
+TaskTiming = namedtuple("TaskTiming", ["start", "end"])
+
+
+class TaskFailedError(Exception):
+    """ Raised when a task of the schedule raises. The node attribute is
+        the node of the task and the original exception is the cause.
+    """
+    def __init__(self, node: int):
+        super().__init__(f"The task of node {node} failed")
+        self.node = node
+
+
+def _timed_call(task: Callable[[], Any]) -> tuple[Any, float, float]:
+    """ Runs the task and returns its result with the clock readings from
+        before and after it ran, taken where the task runs.
+    """
+    start = time.perf_counter()
+    result = task()
+    return result, start, time.perf_counter()
+
+
+class DagScheduler:
+    """ Runs one task per node of a DAG on a pool of threads or processes.
+        A task starts as soon as the tasks of all its predecessors have
+        finished.
+
+        Each node keeps a count of its unfinished predecessors, starting at
+        its in-degree. Nodes whose count drops to zero go to a ready queue
+        ordered by their priority: the cost of the most expensive path from
+        the node to the end of the graph, so tasks on the critical path go
+        first. Costs default to one per task. Only as many tasks as workers
+        are handed to the pool at a time, so the priorities are respected.
+    """
+    def __init__(self, graph: Digraph, tasks: Sequence[Callable[[], Any]],
+                 max_workers: int | None = None, use_processes: bool = False,
+                 costs: Sequence[float] | None = None):
+        if len(tasks) != graph.num_nodes:
+            raise ValueError(f"Got {len(tasks)} tasks for {graph.num_nodes} nodes")
+        if costs is not None and len(costs) != graph.num_nodes:
+            raise ValueError(f"Got {len(costs)} costs for {graph.num_nodes} nodes")
+        self._graph = graph
+        self._tasks = tasks
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._use_processes = use_processes
+        self._costs = costs if costs is not None else [1.0] * graph.num_nodes
+        self._timings = None
+
+    def priorities(self) -> list[float]:
+        """ Returns the cost of the most expensive path from each node to a
+            node without successors, counting the costs of both ends. They
+            are computed from the graph as it is on every call.
+        """
+        # A node that must start by its latest start to avoid delaying the
+        # graph has that much work left after it starts
+        path = critical_path(self._graph, self._costs)
+        return [path.length - latest_start for latest_start in path.latest_start]
+
+    @property
+    def timings(self) -> list[TaskTiming] | None:
+        """ Returns when each task started and ended in the last run, in
+            seconds from the start of the run, or None before the first run.
+        """
+        return self._timings
+
+    def _make_executor(self) -> Executor:
+        if self._use_processes:
+            return ProcessPoolExecutor(self._max_workers)
+        return ThreadPoolExecutor(self._max_workers)
+
+    def run(self) -> list[Any]:
+        """ Runs every task and returns their results, indexed by node.
+            If a task raises, no more tasks are started and TaskFailedError
+            is raised once the running ones finish.
+
+            The priorities are computed at the start of every run, so edges
+            added between runs are taken into account. The graph must not
+            change while it runs, and must keep one task per node.
+        """
+        graph = self._graph
+        if len(self._tasks) != graph.num_nodes:
+            raise ValueError(f"Got {len(self._tasks)} tasks for {graph.num_nodes} nodes")
+        priorities = self.priorities()
+        adjacency_list = graph.adjacency_list
+        # Copy, the counts are consumed as tasks finish
+        pending = list(graph.in_degrees())
+        ready = [(-priorities[node], node) for node in range(graph.num_nodes)
+                 if pending[node] == 0]
+        heapq.heapify(ready)
+
+        results = [None] * graph.num_nodes
+        timings = [None] * graph.num_nodes
+        running = {}
+        run_start = time.perf_counter()
+        with self._make_executor() as executor:
+            while len(ready) > 0 or len(running) > 0:
+                while len(ready) > 0 and len(running) < self._max_workers:
+                    _, node = heapq.heappop(ready)
+                    running[executor.submit(_timed_call, self._tasks[node])] = node
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    node = running.pop(future)
+                    try:
+                        results[node], start, end = future.result()
+                    except Exception as error:
+                        wait(running)
+                        raise TaskFailedError(node) from error
+                    timings[node] = TaskTiming(start - run_start, end - run_start)
+                    for neighbor in adjacency_list[node]:
+                        pending[neighbor] -= 1
+                        if pending[neighbor] == 0:
+                            heapq.heappush(ready, (-priorities[neighbor], neighbor))
+
+        self._timings = timings
+        return results
+
+    def __repr__(self):
+        return (f"DagScheduler(num_tasks={len(self._tasks)}, "
+                f"max_workers={self._max_workers})")
@@ -0,0 +1,83 @@
+from digraph import Digraph, CyclicGraphError
+from critical_path import critical_path
+import pytest
+import random
+
+
+@pytest.fixture
+def project() -> Digraph:
+    """ Returns a DAG of 6 tasks where 0 starts and 5 ends the project. """
+    graph = Digraph(6)
+    graph.add_edges([(0, 1), (0, 2), (0, 4), (1, 3), (2, 5), (3, 5), (4, 5)])
+    return graph
+
+
+def test_unit_durations(project):
+    result = critical_path(project)
+    assert result.length == 4
+    assert result.path == [0, 1, 3, 5]
+    assert list(result.earliest_start) == [0, 1, 1, 2, 1, 3]
+    assert list(result.latest_start) == [0, 1, 2, 2, 2, 3]
+    assert list(result.slack) == [0, 0, 1, 0, 1, 0]
+
+
+def test_weighted_nodes_and_edges(project):
+    durations = [2, 1, 6, 1, 3, 1]
+    result = critical_path(project, durations)
+    assert result.length == 9
+    assert result.path == [0, 2, 5]
+    assert list(result.slack) == [0, 4, 0, 4, 3, 0]
+
+    # The delay on 4 -> 5 makes it the critical path
+    edge_weights = [[0, 0, 0], [0], [0], [0], [5], []]
+    result = critical_path(project, durations, edge_weights)
+    assert result.length == 11
+    assert result.path == [0, 4, 5]
+    assert list(result.earliest_start) == [0, 2, 2, 3, 2, 10]
+    assert list(result.slack) == [0, 6, 2, 6, 0, 0]
+
+
+def test_critical_path_matches_brute_force():
+    rng = random.Random(2)
+    graph = Digraph(12)
+    for _ in range(25):
+        node_1, node_2 = sorted(rng.sample(range(12), 2))
+        graph.add_edge(node_1, node_2)
+    durations = [rng.randint(1, 9) for _ in range(12)]
+
+    def longest_from(node: int) -> int:
+        return durations[node] + max((longest_from(neighbor)
+                                      for neighbor in graph.adjacency_list[node]),
+                                     default=0)
+
+    result = critical_path(graph, durations)
+    assert result.length == max(longest_from(node) for node in range(12))
+    assert sum(durations[node] for node in result.path) == result.length
+    assert all(graph.is_edge(node_1, node_2)
+               for node_1, node_2 in zip(result.path, result.path[1:]))
+    assert all(result.slack[node] == 0 for node in result.path)
+    assert all(result.latest_start[node] == result.length - longest_from(node)
+               for node in range(12))
+
+
+def test_invalid_input(project):
+    with pytest.raises(ValueError):
+        critical_path(project, [1, 2])
+    with pytest.raises(ValueError):
+        critical_path(project, edge_weights=[[]])
+    # Every row must have one weight per successor
+    edge_weights = [[0.0] * len(neighbors) for neighbors in project.adjacency_list]
+    edge_weights[0].append(1.0)
+    with pytest.raises(ValueError):
+        critical_path(project, edge_weights=edge_weights)
+    edge_weights[0] = edge_weights[0][:-2]
+    with pytest.raises(ValueError):
+        critical_path(project, edge_weights=edge_weights)
+
+    empty = critical_path(Digraph())
+    assert empty.length == 0 and empty.path == []
+
+    project.add_edge(5, 1)
+    with pytest.raises(CyclicGraphError) as error:
+        critical_path(project)
+    assert error.value.nodes == [1, 3, 5]
@@ -1,5 +1,12 @@
-from digraph import Digraph, InvalidNodeError
+from digraph import Digraph, InvalidNodeError, CyclicGraphError
+from digraph import AlreadyCyclicGraphError
+from digraph import MappedDigraph, ReadOnlyGraphError, InvalidGraphFileError
+from graph_file import write_graph_file
+from array import array
+import mmap
+import numpy as np
 import pytest
+import random
 
 
 def test_digraph_default_constructor():
@@ -26,6 +33,47 @@ def test_create_graph_from_edge_list():
     assert graph.num_edges == 4
 
 
+def test_from_edge_list_replaces_existing_edges():
+    graph = Digraph(3)
+    graph.add_edges([(0, 1), (1, 2)])
+    graph.from_edge_list(2, [(1, 0)])
+    assert graph.num_nodes == 2
+    assert graph.num_edges == 1
+    assert graph.is_edge(1, 0)
+    assert not graph.is_edge(0, 1)
+
+
+def test_create_graph_from_edge_array():
+    graph = Digraph()
+    graph.from_edge_array(4, np.array([
+        (2, 3), (0, 2), (0, 1), (2, 3), (3, 2), (0, 1)
+    ]))
+    assert graph.num_nodes == 4
+    assert graph.num_edges == 4
+    assert graph.adjacency_list == [[1, 2], [], [3], [2]]
+    assert graph.is_edge(3, 2)
+    assert not graph.is_edge(1, 0)
+
+    with pytest.raises(InvalidNodeError):
+        graph.from_edge_array(2, np.array([(-1, 0)]))
+
+
+def test_create_graph_from_edge_file(tmp_path):
+    path = tmp_path / "edges.bin"
+    np.array([(0, 1), (1, 2), (0, 1)], dtype=np.int64).tofile(path)
+
+    graph = Digraph()
+    graph.from_edge_file(3, path, dtype=np.int64)
+    assert graph.num_edges == 2
+    assert graph.adjacency_list == [[1], [2], []]
+
+    empty_path = tmp_path / "empty.bin"
+    empty_path.write_bytes(b"")
+    graph.from_edge_file(2, empty_path)
+    assert graph.num_nodes == 2
+    assert graph.num_edges == 0
+
+
 def test_cannot_modify_number_of_nodes_and_edges():
     graph = Digraph(3)
     assert graph.num_nodes == 3
@@ -137,6 +185,50 @@ def test_in_degree():
     assert graph.in_degree(2) == 2
 
 
+def test_in_degrees_are_maintained():
+    graph = Digraph(4)
+    assert graph.in_degrees() == [0, 0, 0, 0]
+    graph.add_edges([(0, 1), (2, 1), (0, 1), (1, 3)])
+    graph.add_node()
+    graph.add_edge(4, 0)
+    assert graph.in_degrees() == [1, 2, 0, 1, 0]
+    assert graph.in_degree(1) == 2
+
+    graph.from_edge_array(3, np.array([(0, 2), (1, 2), (2, 0), (1, 2)]))
+    assert graph.in_degrees() == [1, 0, 2]
+
+    assert graph.reverse().in_degrees() == [1, 1, 1]
+
+
+def test_predecessors():
+    edges = [(0, 3), (1, 3), (2, 3), (4, 3), (2, 0), (4, 2), (1, 2)]
+    tracked = Digraph(5, track_predecessors=True)
+    tracked.add_edges(edges)
+    untracked = Digraph(5)
+    untracked.add_edges(edges)
+
+    assert tracked.predecessors(3) == [0, 1, 2, 4]
+    assert tracked.predecessors(2) == [4, 1]
+    assert tracked.predecessors(4) == []
+    for node in range(5):
+        assert sorted(untracked.predecessors(node)) == sorted(tracked.predecessors(node))
+
+    tracked.add_node()
+    tracked.add_edge(5, 4)
+    assert tracked.predecessors(4) == [5]
+
+    tracked.from_edge_array(3, np.array([(2, 1), (0, 1), (1, 0)]))
+    assert tracked.predecessors(1) == [0, 2]
+    assert tracked.predecessors(2) == []
+
+    reverse = tracked.reverse()
+    assert reverse.predecessors(1) == [0]
+    assert reverse.adjacency_list[1] == [0, 2]
+
+    with pytest.raises(InvalidNodeError):
+        tracked.predecessors(3)
+
+
 def test_is_graph_cyclic():
 
     empty_graph = Digraph()
@@ -231,6 +323,82 @@ def test_topological_ordering_DAG():
     assert graph_4.topological_order() == [0, 2, 1, 3]
 
 
+def test_iter_topological_order():
+    graph = Digraph(6)
+    graph.add_edges([
+        (5, 2), (5, 0), (4, 0), (4, 1), (2, 3), (3, 1)
+    ])
+    order = graph.iter_topological_order()
+    # Nodes without predecessors are available before the sort finishes
+    assert next(order) == 4
+    assert list(order) == [5, 2, 0, 3, 1]
+
+    assert list(Digraph().iter_topological_order()) == []
+
+
+def test_iter_topological_order_reports_cycle():
+    graph = Digraph(5)
+    graph.add_edges([(0, 1), (1, 2), (2, 3), (3, 1), (3, 4)])
+    ordered = []
+    with pytest.raises(CyclicGraphError) as error:
+        for node in graph.iter_topological_order():
+            ordered.append(node)
+    assert ordered == [0]
+    # Node 4 comes after the cycle but is not part of it
+    assert error.value.nodes == [1, 2, 3]
+
+
+def test_reject_edges_that_close_a_cycle():
+    graph = Digraph(5)
+    graph.add_edges([(0, 1), (1, 2), (2, 3)])
+    graph.add_edge(3, 4, reject_cycles=True)
+    assert graph.num_edges == 4
+
+    with pytest.raises(CyclicGraphError) as error:
+        graph.add_edge(4, 1, reject_cycles=True)
+    assert error.value.nodes == [4, 1, 2, 3]
+    assert not graph.is_edge(4, 1)
+    assert graph.num_edges == 4
+
+    with pytest.raises(CyclicGraphError):
+        graph.add_edge(2, 2, reject_cycles=True)
+
+    # Edges against the current order that keep the graph acyclic
+    graph.add_node()
+    graph.add_edge(5, 0, reject_cycles=True)
+    graph.add_edge(4, 5, reject_cycles=False)
+    assert graph.is_cyclic()
+    # The graph already has a cycle, so even an edge that closes none fails
+    with pytest.raises(AlreadyCyclicGraphError) as error:
+        graph.add_edge(0, 2, reject_cycles=True)
+    assert sorted(error.value.nodes) == [0, 1, 2, 3, 4, 5]
+
+
+def test_reject_cycles_matches_full_cycle_check():
+    rng = random.Random(8)
+    num_nodes = 30
+    graph = Digraph(num_nodes)
+    reference = Digraph(num_nodes)
+    for _ in range(300):
+        node_1, node_2 = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        trial = Digraph(num_nodes)
+        trial.from_edge_list(num_nodes, [
+            (node, neighbor) for node in range(num_nodes)
+            for neighbor in reference.adjacency_list[node]
+        ] + [(node_1, node_2)])
+        try:
+            graph.add_edge(node_1, node_2, reject_cycles=True)
+            rejected = False
+        except CyclicGraphError:
+            rejected = True
+        assert rejected == trial.is_cyclic()
+        if not rejected:
+            reference.add_edge(node_1, node_2)
+
+    assert graph.num_edges == reference.num_edges
+    assert not graph.is_cyclic()
+
+
 def test_reverse_graph():
 
     empty_graph = Digraph()
@@ -298,3 +466,164 @@ def test_strongly_connected_components():
     ])
     assert graph_3.num_strongly_connected_components() == 5
 
+
+def test_strongly_connected_component_labels():
+    assert Digraph().strongly_connected_components() == []
+    assert sorted(Digraph(3).strongly_connected_components()) == [0, 1, 2]
+
+    graph = Digraph(9)
+    graph.add_edges([
+        (0, 1), (1, 4), (1, 5), (2, 1), (3, 0), (3, 6), (4, 0),
+        (4, 2), (4, 7), (6, 7), (7, 8), (8, 5), (8, 7),
+    ])
+    components = graph.strongly_connected_components()
+    assert components[0] == components[1] == components[2] == components[4]
+    assert components[7] == components[8]
+    assert len(set(components)) == 5
+
+    # Components are numbered in topological order
+    for node in range(graph.num_nodes):
+        for neighbor in graph.adjacency_list[node]:
+            assert components[node] <= components[neighbor]
+
+
+def test_condensation():
+    graph = Digraph(6)
+    graph.add_edges([
+        (0, 1), (1, 0), (1, 2), (2, 3), (3, 2), (0, 3), (4, 5),
+    ])
+    components, condensation = graph.condensation()
+    assert components[0] == components[1]
+    assert components[2] == components[3]
+    assert condensation.num_nodes == 4
+    assert condensation.num_edges == 2
+    assert condensation.is_edge(components[0], components[2])
+    assert condensation.is_edge(components[4], components[5])
+    assert not condensation.is_cyclic()
+
+    components, condensation = Digraph().condensation()
+    assert components == []
+    assert condensation.num_nodes == 0
+
+
+def test_long_path_graph_does_not_overflow_the_stack():
+    num_nodes = 100_000
+    graph = Digraph(num_nodes)
+    graph.add_edges([(node, node + 1) for node in range(num_nodes - 1)])
+
+    assert not graph.is_cyclic()
+    assert graph.topological_order() == list(range(num_nodes))
+    assert graph.num_strongly_connected_components() == num_nodes
+
+    graph.add_edge(num_nodes - 1, 0)
+    assert graph.is_cyclic()
+    assert graph.num_strongly_connected_components() == 1
+
+
+def test_save_and_open_mapped_graph(tmp_path):
+    graph = Digraph(9)
+    graph.add_edges([
+        (0, 1), (1, 5), (1, 4), (2, 1), (3, 0), (3, 6), (4, 0),
+        (4, 2), (4, 7), (6, 7), (7, 8), (8, 5), (8, 7),
+    ])
+    path = tmp_path / "graph.bin"
+    graph.save(path)
+
+    mapped = Digraph.open(path)
+    assert isinstance(mapped, MappedDigraph)
+    assert mapped.num_nodes == 9
+    assert mapped.num_edges == 13
+    assert list(mapped.adjacency_list[1]) == [4, 5]
+    assert mapped.is_edge(8, 7)
+    assert not mapped.is_edge(7, 6)
+    assert list(mapped.in_degrees()) == graph.in_degrees()
+    assert mapped.in_degree(7) == 3
+    assert sorted(mapped.predecessors(0)) == [3, 4]
+    assert mapped.out_degree(4) == 3
+    assert mapped.num_strongly_connected_components() == 5
+    assert mapped.is_cyclic()
+    assert mapped.reverse().is_edge(5, 8)
+
+    with pytest.raises(ReadOnlyGraphError):
+        mapped.add_edge(0, 2)
+    with pytest.raises(ReadOnlyGraphError):
+        mapped.add_node()
+    with pytest.raises(ReadOnlyGraphError):
+        mapped.from_edge_list(2, [])
+    with pytest.raises(InvalidNodeError):
+        mapped.is_edge(0, 9)
+
+
+def test_mapped_graph_topological_order(tmp_path):
+    graph = Digraph(5)
+    graph.add_edges([(1, 0), (2, 0), (2, 1), (3, 0), (3, 2), (4, 1), (4, 2)])
+    path = tmp_path / "dag.bin"
+    graph.save(path)
+    mapped = Digraph.open(path)
+    assert mapped.topological_order() == graph.topological_order()
+    assert list(mapped.iter_topological_order()) == list(graph.iter_topological_order())
+
+    empty_path = tmp_path / "empty.bin"
+    Digraph().save(empty_path)
+    assert Digraph.open(empty_path).num_nodes == 0
+
+
+def test_open_invalid_graph_file(tmp_path):
+    path = tmp_path / "graph.bin"
+    path.write_bytes(b"")
+    with pytest.raises(InvalidGraphFileError):
+        Digraph.open(path)
+
+    path.write_bytes(b"not a graph file" * 4)
+    with pytest.raises(InvalidGraphFileError):
+        Digraph.open(path)
+
+    graph = Digraph(3)
+    graph.add_edges([(0, 1), (1, 2)])
+    graph.save(path)
+    path.write_bytes(path.read_bytes()[:-16])
+    with pytest.raises(InvalidGraphFileError):
+        Digraph.open(path)
+
+
+def test_invalid_graph_file_is_unmapped(tmp_path, monkeypatch):
+    mappings = []
+    open_mapping = mmap.mmap
+
+    def recording_mmap(*args, **kwargs):
+        mappings.append(open_mapping(*args, **kwargs))
+        return mappings[-1]
+
+    monkeypatch.setattr(mmap, "mmap", recording_mmap)
+    path = tmp_path / "graph.bin"
+    graph = Digraph(3)
+    graph.add_edges([(0, 1), (1, 2)])
+    graph.save(path)
+    path.write_bytes(path.read_bytes()[:-16])
+    with pytest.raises(InvalidGraphFileError):
+        Digraph.open(path)
+
+    # An undirected graph file
+    write_graph_file(path, 0, 0, 0, [array("q", [0]), array("i")])
+    with pytest.raises(InvalidGraphFileError):
+        Digraph.open(path)
+    assert len(mappings) == 2
+    assert all(mapping.closed for mapping in mappings)
+
+
+def test_find_cycle():
+    graph = Digraph(6)
+    graph.add_edges([(0, 1), (1, 2), (2, 3), (3, 4), (4, 2), (5, 0)])
+    cycle = graph.find_cycle()
+    assert cycle == [2, 3, 4]
+    assert all(graph.is_edge(node, cycle[(ii + 1) % len(cycle)])
+               for ii, node in enumerate(cycle))
+
+    self_loop = Digraph(2)
+    self_loop.add_edges([(0, 1), (1, 1)])
+    assert self_loop.find_cycle() == [1]
+
+    acyclic = Digraph(4)
+    acyclic.add_edges([(0, 1), (0, 2), (1, 3), (2, 3)])
+    assert acyclic.find_cycle() == []
+    assert Digraph().find_cycle() == []
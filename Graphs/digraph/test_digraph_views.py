@@ -0,0 +1,98 @@
+from digraph import Digraph, ReadOnlyGraphError
+from digraph_views import ReversedDigraph, SubDigraph
+import pytest
+
+
+@pytest.fixture
+def graph() -> Digraph:
+    """ Returns a digraph with the components {0, 1, 2}, {3, 4} and {5}. """
+    graph = Digraph(6)
+    graph.add_edges([(0, 1), (1, 2), (2, 0), (2, 3), (3, 4), (4, 3), (4, 5)])
+    return graph
+
+
+def test_reversed_digraph(graph):
+    with pytest.raises(ValueError):
+        ReversedDigraph(graph)
+
+    graph = Digraph(6, track_predecessors=True)
+    graph.add_edges([(0, 1), (1, 2), (2, 0), (2, 3), (3, 4), (4, 3), (4, 5)])
+    view = ReversedDigraph(graph)
+    reverse = graph.reverse()
+    assert [list(view.adjacency_list[node]) for node in range(6)] == \
+           [sorted(reverse.adjacency_list[node]) for node in range(6)]
+    assert view.num_edges == 7
+    assert view.is_edge(3, 2)
+    assert not view.is_edge(2, 3)
+    assert list(view.in_degrees()) == [1, 1, 2, 1, 2, 0]
+    assert view.predecessors(3) == [4]
+    assert view.num_strongly_connected_components() == 3
+    assert str(view) == "ReversedDigraph(num_nodes=6, num_edges=7)"
+
+    # The view follows the graph
+    graph.add_edge(5, 0)
+    assert view.is_edge(0, 5)
+    assert view.num_strongly_connected_components() == 1
+
+    with pytest.raises(ReadOnlyGraphError):
+        view.add_edge(0, 5)
+    with pytest.raises(ReadOnlyGraphError):
+        view.add_node()
+
+
+def test_induced_subdigraph(graph):
+    view = SubDigraph(graph, node_mask=bytearray([1, 1, 1, 1, 0, 1]))
+    assert view.num_nodes == 6
+    assert view.num_edges == 4
+    assert list(view.adjacency_list[2]) == [0, 3]
+    assert list(view.adjacency_list[4]) == []
+    assert not view.is_edge(3, 4)
+    assert view.in_degrees() == [1, 1, 1, 1, 0, 0]
+    assert [view.in_degree(node) for node in range(6)] == [1, 1, 1, 1, 0, 0]
+    assert view.predecessors(3) == [2]
+    # Node 4 is counted as an isolated node
+    assert view.num_strongly_connected_components() == 4
+    assert view.find_cycle() == [0, 1, 2]
+    assert str(view) == "SubDigraph(num_nodes=6, num_edges=4)"
+
+    with pytest.raises(ValueError):
+        SubDigraph(graph, node_mask=[True] * 5)
+    with pytest.raises(ReadOnlyGraphError):
+        view.from_edge_list(2, [])
+
+
+def test_edge_filtered_subdigraph(graph):
+    graph.add_node()
+    view = SubDigraph(graph, edge_filter=lambda node_1, node_2: node_1 < node_2)
+    assert not view.is_cyclic()
+    assert view.topological_order() == [6, 0, 1, 2, 3, 4, 5]
+    assert list(view.iter_topological_order()) == [0, 6, 1, 2, 3, 4, 5]
+    assert not view.is_edge(2, 0)
+    assert view.is_edge(0, 1)
+
+    # Predecessors are filtered too when the graph tracks them
+    tracked = Digraph(3, track_predecessors=True)
+    tracked.add_edges([(0, 1), (1, 2), (2, 0)])
+    view = SubDigraph(tracked, edge_filter=lambda node_1, node_2: node_2 != 0)
+    assert [view.predecessors(node) for node in range(3)] == [[], [0], [1]]
+    assert list(view.in_degrees()) == [0, 1, 1]
+    assert view.reverse().adjacency_list == [[], [0], [1]]
+
+
+def test_views_follow_a_rebuilt_graph():
+    graph = Digraph(2, track_predecessors=True)
+    graph.add_edge(0, 1)
+    reversed_view = ReversedDigraph(graph)
+    sub_view = SubDigraph(graph)
+    masked_view = SubDigraph(graph, node_mask=[True, True])
+    assert reversed_view.adjacency_list[1] == [0]
+
+    graph.from_edge_list(4, [(2, 3), (3, 2)])
+    assert reversed_view.num_strongly_connected_components() == 3
+    assert reversed_view.is_edge(3, 2)
+    assert list(reversed_view.adjacency_list[1]) == []
+    assert sub_view.topological_order() == []
+    assert sub_view.num_edges == 2
+    # Nodes past the end of the mask are outside the view
+    assert masked_view.num_edges == 0
+    assert masked_view.topological_order() == [3, 2, 1, 0]
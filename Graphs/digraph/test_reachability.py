@@ -0,0 +1,73 @@
+from digraph import Digraph, InvalidNodeError
+from reachability import ReachabilityIndex
+import pytest
+import random
+
+
+def reachable_by_search(graph: Digraph, source: int, target: int) -> bool:
+    visited = [False] * graph.num_nodes
+    stack = [source]
+    visited[source] = True
+    while len(stack) > 0:
+        node = stack.pop()
+        if node == target:
+            return True
+        for neighbor in graph.adjacency_list[node]:
+            if not visited[neighbor]:
+                visited[neighbor] = True
+                stack.append(neighbor)
+    return False
+
+
+def random_graph(num_nodes: int, num_edges: int, seed: int) -> Digraph:
+    """ Returns a random digraph whose edges mostly go to larger nodes, so
+        that it has long paths and a few cycles.
+    """
+    rng = random.Random(seed)
+    graph = Digraph(num_nodes)
+    for _ in range(num_edges):
+        node_1, node_2 = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        if node_1 > node_2 and rng.random() < 0.95:
+            node_1, node_2 = node_2, node_1
+        graph.add_edge(node_1, node_2)
+    return graph
+
+
+@pytest.mark.parametrize("closure_limit", [2048, 0])
+def test_reachability_small_graph(closure_limit):
+    graph = Digraph(7)
+    graph.add_edges([(0, 1), (1, 2), (2, 0), (2, 3), (3, 4), (5, 3), (6, 6)])
+    index = ReachabilityIndex(graph, closure_limit=closure_limit)
+    assert index.uses_closure == (closure_limit > 0)
+    assert index.num_components == 5
+    assert index.reachable(0, 4)
+    assert index.reachable(2, 1)
+    assert index.reachable(5, 4)
+    assert index.reachable(6, 6)
+    assert not index.reachable(4, 0)
+    assert not index.reachable(0, 5)
+    assert not index.reachable(5, 0)
+    assert index.size > 0
+    assert index.build_time >= 0
+    assert str(index) == "ReachabilityIndex(num_nodes=7, num_components=5)"
+
+    with pytest.raises(InvalidNodeError):
+        index.reachable(0, 7)
+
+
+@pytest.mark.parametrize("closure_limit", [2048, 0])
+def test_reachability_matches_search(closure_limit):
+    graph = random_graph(150, 250, seed=8)
+    index = ReachabilityIndex(graph, closure_limit=closure_limit)
+    rng = random.Random(1)
+    for _ in range(1000):
+        source, target = rng.randrange(150), rng.randrange(150)
+        assert index.reachable(source, target) == \
+               reachable_by_search(graph, source, target)
+
+
+def test_reachability_empty_graph():
+    index = ReachabilityIndex(Digraph())
+    assert index.num_components == 0
+    with pytest.raises(InvalidNodeError):
+        index.reachable(0, 0)
@@ -0,0 +1,101 @@
+from digraph import Digraph, CyclicGraphError
+from scheduler import DagScheduler, TaskFailedError
+from functools import partial
+import pytest
+import threading
+
+
+@pytest.fixture
+def build_graph() -> Digraph:
+    """ Returns a DAG where node 0 must run first and node 5 last. The
+        longest path is 0 -> 1 -> 3 -> 5.
+    """
+    graph = Digraph(6)
+    graph.add_edges([(0, 1), (0, 2), (0, 4), (1, 3), (2, 5), (3, 5), (4, 5)])
+    return graph
+
+
+def test_tasks_run_after_their_predecessors(build_graph):
+    finished = []
+    lock = threading.Lock()
+    # Nodes 1, 2 and 4 can only get past the barrier if they run at the
+    # same time
+    barrier = threading.Barrier(3, timeout=10)
+
+    def make_task(node: int):
+        def task():
+            if node in (1, 2, 4):
+                barrier.wait()
+            with lock:
+                finished.append(node)
+            return node * 10
+        return task
+
+    scheduler = DagScheduler(build_graph, [make_task(node) for node in range(6)],
+                             max_workers=3)
+    assert scheduler.timings is None
+    assert scheduler.run() == [0, 10, 20, 30, 40, 50]
+
+    position = {node: ii for ii, node in enumerate(finished)}
+    for node in range(6):
+        for neighbor in build_graph.adjacency_list[node]:
+            assert position[node] < position[neighbor]
+    timings = scheduler.timings
+    for node in range(6):
+        for neighbor in build_graph.adjacency_list[node]:
+            assert timings[node].end <= timings[neighbor].start
+    assert not barrier.broken
+
+
+def test_critical_path_goes_first(build_graph):
+    scheduler = DagScheduler(build_graph, [lambda: None] * 6, max_workers=1)
+    assert scheduler.priorities() == [4, 3, 2, 2, 2, 1]
+    scheduler.run()
+    starts = [timing.start for timing in scheduler.timings]
+    # Ties are broken by node number
+    assert sorted(range(6), key=starts.__getitem__) == [0, 1, 2, 3, 4, 5]
+
+    costs = [1, 1, 10, 1, 1, 1]
+    scheduler = DagScheduler(build_graph, [lambda: None] * 6, max_workers=1,
+                             costs=costs)
+    assert scheduler.priorities() == [12, 3, 11, 2, 2, 1]
+    scheduler.run()
+    starts = [timing.start for timing in scheduler.timings]
+    assert sorted(range(6), key=starts.__getitem__) == [0, 2, 1, 3, 4, 5]
+
+    # Priorities follow edges added after the scheduler was made
+    build_graph.add_edge(4, 3)
+    assert scheduler.priorities() == [12, 3, 11, 2, 3, 1]
+
+
+def test_process_pool(build_graph):
+    tasks = [partial(pow, 2, node) for node in range(6)]
+    scheduler = DagScheduler(build_graph, tasks, max_workers=2, use_processes=True)
+    assert scheduler.run() == [1, 2, 4, 8, 16, 32]
+
+
+def test_failed_task_stops_the_schedule(build_graph):
+    ran = []
+
+    def fail():
+        raise KeyError("missing")
+
+    tasks = [partial(ran.append, node) for node in range(6)]
+    tasks[1] = fail
+    with pytest.raises(TaskFailedError) as error:
+        DagScheduler(build_graph, tasks, max_workers=1).run()
+    assert error.value.node == 1
+    assert isinstance(error.value.__cause__, KeyError)
+    assert 3 not in ran and 5 not in ran
+
+
+def test_invalid_schedules(build_graph):
+    with pytest.raises(ValueError):
+        DagScheduler(build_graph, [lambda: None] * 5)
+    with pytest.raises(ValueError):
+        DagScheduler(build_graph, [lambda: None] * 6, costs=[1])
+
+    build_graph.add_edge(5, 0)
+    with pytest.raises(CyclicGraphError):
+        DagScheduler(build_graph, [lambda: None] * 6).run()
+    assert DagScheduler(Digraph(), []).run() == []
@@ -0,0 +1,324 @@
+""" Streaming readers and writers for edge list and DIMACS graph files.
+
+    Files are read in blocks of chunk_bytes and each block is parsed by
+    numpy in one call, so the text is never split into Python objects.
+    Files ending in .gz are compressed and decompressed on the fly.
+
+    The load functions feed any graph with the methods of Graph and
+    Digraph: num_nodes, num_edges, add_node and add_edges. Blocks are added
+    to the graph as they are read, so besides the graph itself memory stays
+    bounded by the block size. With bulk=True an empty graph with a
+    from_edge_array method is instead built from all the parsed blocks in
+    one vectorized call, which is faster but holds every edge of the file
+    in arrays first.
+"""
+from collections.abc import Iterable, Iterator
+import gzip
+from typing import IO, Any
+
+import numpy as np
+
+# Size of the blocks the files are read in
+CHUNK_BYTES = 1 << 22
+
+
+class InvalidEdgeFileError(ValueError):
+    pass
+
+
+def _open(path: str, mode: str) -> IO[bytes]:
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+def _read_blocks(fp: IO[bytes], chunk_bytes: int) -> Iterator[bytes]:
+    """ Reads the file in blocks that end at a line break. """
+    remainder = b""
+    while True:
+        data = fp.read(chunk_bytes)
+        if len(data) == 0:
+            break
+        data = remainder + data
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            # A line longer than a block, keep reading
+            remainder = data
+            continue
+        remainder = data[end:]
+        yield data[:end]
+    if len(remainder.strip()) > 0:
+        yield remainder
+
+
+def _drop_lines(block: bytes, prefixes: tuple[bytes, ...]) -> bytes:
+    """ Removes the lines that start with one of the prefixes. Only called
+        for the few blocks that have such lines.
+    """
+    return b"\n".join(line for line in block.split(b"\n")
+                      if not line.lstrip().startswith(prefixes))
+
+
+def _parse_block(block: bytes, num_columns: int, dtype: type) -> np.ndarray:
+    """ Parses a block of whitespace separated numbers into an array with
+        num_columns columns.
+    """
+    try:
+        values = np.fromstring(block, dtype=dtype, sep=" ")
+    except ValueError as error:
+        raise InvalidEdgeFileError(f"Invalid edge file: {error}") from None
+    if len(values) % num_columns != 0:
+        raise InvalidEdgeFileError(f"Edge file rows must have {num_columns} columns")
+    return values.reshape(-1, num_columns)
+
+
+def _split_weighted(rows: np.ndarray, weighted: bool
+                    ) -> tuple[np.ndarray, np.ndarray | None]:
+    if not weighted:
+        return rows, None
+    return rows[:, :2].astype(np.int64), rows[:, 2]
+
+
+def read_edge_list(path: str, delimiter: str | None = None, comments: str = "#",
+                   weighted: bool = False, chunk_bytes: int = CHUNK_BYTES
+                   ) -> Iterator[tuple[np.ndarray, np.ndarray | None]]:
+    """ Reads a file with one edge per line, given by two node numbers and
+        a weight if weighted. Values are separated by whitespace, or by the
+        delimiter, like "," for CSV files. Lines starting with the comments
+        string are skipped.
+
+        Yields an (E, 2) int64 array of edges and an array of their weights,
+        or None, for each block of the file.
+    """
+    comment = comments.encode()
+    separator = delimiter.encode() if delimiter is not None else None
+    num_columns = 3 if weighted else 2
+    dtype = np.float64 if weighted else np.int64
+    with _open(path, "rb") as fp:
+        for block in _read_blocks(fp, chunk_bytes):
+            if comment in block:
+                block = _drop_lines(block, (comment,))
+            if separator is not None:
+                block = block.replace(separator, b" ")
+            yield _split_weighted(_parse_block(block, num_columns, dtype), weighted)
+
+
+def read_dimacs_header(path: str) -> tuple[str, int, int]:
+    """ Returns the problem, the number of nodes and the number of edges in
+        the "p" line of a DIMACS graph file.
+    """
+    with _open(path, "rb") as fp:
+        for line in fp:
+            if line.startswith(b"p"):
+                fields = line.split()
+                if len(fields) != 4:
+                    break
+                return fields[1].decode(), int(fields[2]), int(fields[3])
+            if not line.startswith(b"c") and len(line.strip()) > 0:
+                break
+    raise InvalidEdgeFileError(f"{path} has no DIMACS problem line")
+
+
+def read_dimacs(path: str, chunk_bytes: int = CHUNK_BYTES
+                ) -> Iterator[tuple[np.ndarray, np.ndarray | None]]:
+    """ Reads the edges of a DIMACS graph file: "e u v" lines of a "p edge"
+        file or "a u v w" arcs of a "p sp" shortest path file. Nodes are
+        numbered from one in the file and from zero in the result.
+
+        Yields an (E, 2) int64 array of edges and an array of their weights,
+        or None, for each block of the file.
+    """
+    problem, _, _ = read_dimacs_header(path)
+    if problem == "edge":
+        tag, num_columns, dtype = b"e", 2, np.int64
+    elif problem == "sp":
+        tag, num_columns, dtype = b"a", 3, np.float64
+    else:
+        raise InvalidEdgeFileError(f"Unsupported DIMACS problem {problem}")
+
+    with _open(path, "rb") as fp:
+        for block in _read_blocks(fp, chunk_bytes):
+            if b"c" in block or b"p" in block:
+                block = _drop_lines(block, (b"c", b"p"))
+            # The tag is the only letter left, so it can be blanked out
+            rows = _parse_block(block.replace(tag, b" "), num_columns, dtype)
+            edges, weights = _split_weighted(rows, problem == "sp")
+            yield edges - 1, weights
+
+
+def _check_nodes(edges: np.ndarray) -> None:
+    if len(edges) > 0 and edges.min() < 0:
+        raise InvalidEdgeFileError(f"{edges.min()} is not a valid node")
+
+
+def _add_chunk(graph: Any, edges: np.ndarray, weights: np.ndarray | None) -> None:
+    """ Adds a block of edges to the graph one at a time, adding the nodes
+        it is missing.
+    """
+    if len(edges) == 0:
+        return
+    _check_nodes(edges)
+    for _ in range(graph.num_nodes, int(edges.max()) + 1):
+        graph.add_node()
+    if weights is None:
+        graph.add_edges(edges.tolist())
+    else:
+        graph.add_edges(zip(edges[:, 0].tolist(), edges[:, 1].tolist(),
+                            weights.tolist()))
+
+
+def _load_chunks(graph: Any, chunks: Iterable[tuple[np.ndarray, np.ndarray | None]],
+                 num_nodes: int = 0, bulk: bool = False) -> int:
+    """ Adds the blocks of edges to the graph, which ends up with at least
+        num_nodes nodes, and returns the number of edges read.
+
+        Blocks are added with add_edges as they are read. With bulk, a graph
+        without edges that has a from_edge_array method is built with a
+        single vectorized call once every block has been read, which takes
+        O(E) extra memory. Weights are passed on to graphs with a weights
+        property.
+    """
+    if not bulk or not hasattr(graph, "from_edge_array") or graph.num_edges > 0:
+        for _ in range(graph.num_nodes, num_nodes):
+            graph.add_node()
+        num_edges = 0
+        for edges, weights in chunks:
+            _add_chunk(graph, edges, weights)
+            num_edges += len(edges)
+        return num_edges
+
+    edge_blocks = [np.empty((0, 2), dtype=np.int64)]
+    weight_blocks = [np.empty(0)]
+    for edges, weights in chunks:
+        _check_nodes(edges)
+        edge_blocks.append(edges)
+        if weights is not None:
+            weight_blocks.append(weights)
+    edges = np.concatenate(edge_blocks)
+    num_nodes = max(num_nodes, graph.num_nodes,
+                    int(edges.max()) + 1 if len(edges) > 0 else 0)
+    if hasattr(graph, "weights"):
+        # Without weights in the file every weight defaults to one
+        weights = np.concatenate(weight_blocks) if len(weight_blocks) > 1 else None
+        graph.from_edge_array(num_nodes, edges, weights)
+    else:
+        graph.from_edge_array(num_nodes, edges)
+    return len(edges)
+
+
+def load_edge_list(graph: Any, path: str, delimiter: str | None = None,
+                   comments: str = "#", weighted: bool = False,
+                   chunk_bytes: int = CHUNK_BYTES, bulk: bool = False) -> int:
+    """ Adds the edges of an edge list file to the graph, growing it to fit
+        them. Returns the number of edges read.
+
+        With bulk=True an empty graph is built with one from_edge_array
+        call, which is faster but keeps every edge of the file in memory.
+    """
+    return _load_chunks(graph, read_edge_list(path, delimiter, comments,
+                                              weighted, chunk_bytes), bulk=bulk)
+
+
+def load_dimacs(graph: Any, path: str, weighted: bool = True,
+                chunk_bytes: int = CHUNK_BYTES, bulk: bool = False) -> int:
+    """ Adds the nodes and edges of a DIMACS graph file to the graph. The
+        weights of a "p sp" file are passed on only if weighted. Returns the
+        number of edges read. bulk is the same as for load_edge_list.
+    """
+    _, num_nodes, _ = read_dimacs_header(path)
+    chunks = read_dimacs(path, chunk_bytes)
+    if not weighted:
+        chunks = ((edges, None) for edges, _ in chunks)
+    return _load_chunks(graph, chunks, num_nodes, bulk)
+
+
+def iter_edges(adjacency_list: list, undirected: bool,
+               chunk_edges: int = 1 << 16) -> Iterator[np.ndarray]:
+    """ Yields the edges of an adjacency list as (E, 2) int64 arrays of at
+        most about chunk_edges edges. With undirected, each edge is yielded
+        once, from its smallest node, as Graph keeps both directions.
+    """
+    sources = []
+    targets = []
+    for node, neighbors in enumerate(adjacency_list):
+        if undirected:
+            neighbors = [neighbor for neighbor in neighbors if neighbor >= node]
+            # A self loop appears twice in the adjacency list of its node
+            num_loops = neighbors.count(node)
+            if num_loops > 0:
+                neighbors = [neighbor for neighbor in neighbors if neighbor != node]
+                neighbors += [node] * (num_loops // 2)
+        sources.extend([node] * len(neighbors))
+        targets.extend(neighbors)
+        if len(sources) >= chunk_edges:
+            yield np.column_stack((sources, targets)).astype(np.int64)
+            sources = []
+            targets = []
+    if len(sources) > 0:
+        yield np.column_stack((sources, targets)).astype(np.int64)
+
+
+def _format_rows(edges: np.ndarray, weights: np.ndarray | None,
+                 delimiter: str, prefix: str = "", offset: int = 0) -> bytes:
+    """ Formats a block of edges, one per line, with a single string
+        formatting call.
+    """
+    if weights is None:
+        line = prefix + "%d" + delimiter + "%d\n"
+        values = (edges + offset).ravel().tolist()
+    else:
+        line = prefix + "%d" + delimiter + "%d" + delimiter + "%r\n"
+        values = [value for row in zip((edges[:, 0] + offset).tolist(),
+                                       (edges[:, 1] + offset).tolist(),
+                                       weights.tolist())
+                  for value in row]
+    return ((line * len(edges)) % tuple(values)).encode()
+
+
+def _as_chunks(edges: np.ndarray | Iterable[np.ndarray],
+               weights: np.ndarray | Iterable[np.ndarray] | None
+               ) -> Iterator[tuple[np.ndarray, np.ndarray | None]]:
+    if isinstance(edges, np.ndarray):
+        edges = [edges]
+        weights = [weights] if weights is not None else None
+    if weights is None:
+        for chunk in edges:
+            yield np.asarray(chunk, dtype=np.int64).reshape(-1, 2), None
+    else:
+        for chunk, chunk_weights in zip(edges, weights):
+            yield (np.asarray(chunk, dtype=np.int64).reshape(-1, 2),
+                   np.asarray(chunk_weights, dtype=np.float64))
+
+
+def write_edge_list(path: str, edges: np.ndarray | Iterable[np.ndarray],
+                    weights: np.ndarray | Iterable[np.ndarray] | None = None,
+                    delimiter: str = " ") -> int:
+    """ Writes an (E, 2) array of edges, or an iterable of them such as
+        iter_edges, to an edge list file, with their weights if given.
+        Returns the number of edges written.
+    """
+    num_edges = 0
+    with _open(path, "wb") as fp:
+        for chunk, chunk_weights in _as_chunks(edges, weights):
+            fp.write(_format_rows(chunk, chunk_weights, delimiter))
+            num_edges += len(chunk)
+    return num_edges
+
+
+def write_dimacs(path: str, num_nodes: int, num_edges: int,
+                 edges: np.ndarray | Iterable[np.ndarray],
+                 weights: np.ndarray | Iterable[np.ndarray] | None = None) -> None:
+    """ Writes a DIMACS graph file: a "p edge" file, or a "p sp" file if
+        weights are given. The number of edges goes in the header, so it
+        must be known before the edges are streamed.
+    """
+    problem, prefix = ("sp", "a ") if weights is not None else ("edge", "e ")
+    written = 0
+    with _open(path, "wb") as fp:
+        fp.write(f"p {problem} {num_nodes} {num_edges}\n".encode())
+        for chunk, chunk_weights in _as_chunks(edges, weights):
+            fp.write(_format_rows(chunk, chunk_weights, " ", prefix, offset=1))
+            written += len(chunk)
+    if written != num_edges:
+        raise InvalidEdgeFileError(f"Wrote {written} edges but the header "
+                                   f"says {num_edges}")
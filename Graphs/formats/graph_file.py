@@ -0,0 +1,92 @@
+""" Binary graph file written and memory mapped by CSRGraph in
+    Graphs/graph/csr.py and by Digraph in Graphs/digraph/digraph.py.
+
+    The header is little endian and the arrays are written in the byte
+    order of the machine, which is assumed to match:
+      header: magic, version, flags, number of nodes, number of edges
+      offsets: int64 * (num_nodes + 1)
+      targets: int32 * offsets[num_nodes]
+      weights: float64 * offsets[num_nodes], if FLAG_WEIGHTED is set
+      in-degrees: int32 * num_nodes, if FLAG_IN_DEGREES is set
+    Every array is padded to a multiple of 8 bytes.
+"""
+from array import array
+import mmap
+import os
+import struct
+
+FILE_MAGIC = b"CSRG"
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct("<4sIIQQ4x")
+FLAG_DIRECTED = 1
+FLAG_WEIGHTED = 2
+FLAG_IN_DEGREES = 4
+
+
+class InvalidGraphFileError(ValueError):
+    pass
+
+
+def write_graph_file(path: str, flags: int, num_nodes: int, num_edges: int,
+                     sections: list[array]) -> None:
+    """ Writes the header and the given arrays, in the order of the layout. """
+    with open(path, "wb") as fp:
+        fp.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, flags,
+                                  num_nodes, num_edges))
+        for values in sections:
+            size = len(values) * values.itemsize
+            fp.write(values.tobytes())
+            fp.write(bytes(-size % 8))
+
+
+def open_graph_file(path: str) -> tuple[mmap.mmap, int, int, int]:
+    """ Memory maps a graph file and checks its header. Returns the mapping,
+        the flags, the number of nodes and the number of edges.
+    """
+    # mmap cannot map an empty file, so short files are rejected first
+    if os.path.getsize(path) < FILE_HEADER.size:
+        raise InvalidGraphFileError("The file is too small to be a graph file")
+    with open(path, "rb") as fp:
+        mapping = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, flags, num_nodes, num_edges = FILE_HEADER.unpack_from(mapping)
+    if magic != FILE_MAGIC or version != FILE_VERSION:
+        mapping.close()
+        raise InvalidGraphFileError("The file is not a graph file")
+    return mapping, flags, num_nodes, num_edges
+
+
+def map_file_sections(mapping: mmap.mmap, flags: int,
+                      num_nodes: int) -> dict[str, memoryview]:
+    """ Returns typed views into the arrays of a graph file, keyed by
+        "offsets", "targets", "weights" and "in_degrees". If the file is
+        truncated the mapping is closed.
+    """
+    view = memoryview(mapping)
+    position = FILE_HEADER.size
+    sections = {}
+
+    def take(name: str, typecode: str, length: int) -> None:
+        nonlocal position
+        size = length * array(typecode).itemsize
+        if position + size > len(mapping):
+            raise InvalidGraphFileError("The graph file is truncated")
+        sections[name] = view[position:position + size].cast(typecode)
+        position += size + (-size) % 8
+
+    try:
+        take("offsets", "q", num_nodes + 1)
+        num_targets = sections["offsets"][num_nodes]
+        take("targets", "i", num_targets)
+        if flags & FLAG_WEIGHTED:
+            take("weights", "d", num_targets)
+        if flags & FLAG_IN_DEGREES:
+            take("in_degrees", "i", num_nodes)
+    except InvalidGraphFileError:
+        # The mapping cannot be closed while views into it are alive
+        for section in sections.values():
+            section.release()
+        view.release()
+        mapping.close()
+        raise
+    return sections
@@ -0,0 +1,164 @@
+import gzip
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from edge_io import (InvalidEdgeFileError, iter_edges, load_dimacs, load_edge_list,
+                     read_dimacs, read_dimacs_header, read_edge_list,
+                     write_dimacs, write_edge_list)
+
+_graphs_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_graphs_dir, "digraph"))
+sys.path.insert(0, os.path.join(_graphs_dir, "graph"))
+
+from digraph import Digraph  # noqa: E402
+from graph import Graph  # noqa: E402
+from weighted_graph import WeightedGraph  # noqa: E402
+
+
+def test_read_edge_list_in_small_chunks(tmp_path):
+    path = tmp_path / "edges.txt"
+    path.write_text("# a comment\n0 1\n1\t2\n  2 3  \n\n# another one\n3 0\n4 4")
+    chunks = list(read_edge_list(path, chunk_bytes=5))
+    assert len(chunks) > 1
+    edges = np.concatenate([edges for edges, _ in chunks])
+    assert edges.tolist() == [[0, 1], [1, 2], [2, 3], [3, 0], [4, 4]]
+    assert all(weights is None for _, weights in chunks)
+
+
+def test_read_csv_gz_weighted_edge_list(tmp_path):
+    path = tmp_path / "edges.csv.gz"
+    with gzip.open(path, "wt") as fp:
+        fp.write("0,1,0.5\n1,2,2\n2,0,1e3\n")
+    [(edges, weights)] = list(read_edge_list(path, delimiter=",", weighted=True))
+    assert edges.dtype == np.int64
+    assert edges.tolist() == [[0, 1], [1, 2], [2, 0]]
+    assert weights.tolist() == [0.5, 2.0, 1000.0]
+
+
+def test_invalid_edge_list(tmp_path):
+    path = tmp_path / "edges.txt"
+    path.write_text("0 1\n1 x\n")
+    with pytest.raises(InvalidEdgeFileError):
+        list(read_edge_list(path))
+    path.write_text("0 1\n1 2 3\n")
+    with pytest.raises(InvalidEdgeFileError):
+        list(read_edge_list(path))
+    path.write_text("0 1\n-1 2\n")
+    with pytest.raises(InvalidEdgeFileError):
+        load_edge_list(Graph(), path)
+
+
+def test_load_edge_list_grows_graphs(tmp_path):
+    path = tmp_path / "edges.txt"
+    path.write_text("0 1\n1 2\n2 0\n5 3\n")
+    graph = Graph()
+    assert load_edge_list(graph, path, chunk_bytes=4) == 4
+    assert graph.num_nodes == 6
+    assert graph.num_connected_components() == 3
+
+    digraph = Digraph(2)
+    load_edge_list(digraph, path)
+    assert digraph.num_nodes == 6
+    assert digraph.is_edge(5, 3) and not digraph.is_edge(3, 5)
+    assert digraph.num_strongly_connected_components() == 4
+
+    # A graph that already has edges keeps them
+    digraph = Digraph(2)
+    digraph.add_edge(1, 0)
+    assert load_edge_list(digraph, path, chunk_bytes=8) == 4
+    assert digraph.num_edges == 5
+    assert digraph.is_edge(1, 0) and digraph.is_edge(5, 3)
+
+    weighted = WeightedGraph(8)
+    load_edge_list(weighted, path)
+    assert weighted.num_nodes == 8
+    assert weighted.weight(3, 5) == 1.0
+
+
+def test_bulk_load_matches_block_by_block(tmp_path):
+    path = tmp_path / "edges.txt"
+    path.write_text("0 1 0.5\n1 2 2\n2 0 3\n5 3 1\n1 0 4\n")
+    for graph_type in (Graph, Digraph, WeightedGraph):
+        graph = graph_type()
+        bulk_graph = graph_type()
+        weighted = graph_type is WeightedGraph
+        assert load_edge_list(graph, path, weighted=True, chunk_bytes=8) == 5
+        assert load_edge_list(bulk_graph, path, weighted=True, bulk=True) == 5
+        assert bulk_graph.num_nodes == graph.num_nodes == 6
+        assert bulk_graph.num_edges == graph.num_edges
+        assert [sorted(row) for row in bulk_graph.adjacency_list] == \
+               [sorted(row) for row in graph.adjacency_list]
+        if weighted:
+            assert bulk_graph.weight(0, 1) == graph.weight(0, 1) == 0.5
+
+
+def test_edge_list_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    graph = Graph()
+    graph.from_edge_array(300, rng.integers(0, 300, size=(1000, 2)))
+    graph.add_edge(7, 7)
+    path = tmp_path / "graph.txt.gz"
+    assert write_edge_list(path, iter_edges(graph.adjacency_list, undirected=True,
+                                            chunk_edges=64)) == graph.num_edges
+
+    loaded = Graph(300)
+    load_edge_list(loaded, path, chunk_bytes=512)
+    assert loaded.num_edges == graph.num_edges
+    assert [sorted(row) for row in loaded.adjacency_list] == \
+           [sorted(row) for row in graph.adjacency_list]
+
+    weighted = WeightedGraph(3)
+    weighted.add_edges([(0, 1, 0.25), (1, 2, 3.5)])
+    path = tmp_path / "weighted.csv"
+    write_edge_list(path, *weighted.to_edge_array(), delimiter=",")
+    assert path.read_text() == "0,1,0.25\n1,2,3.5\n"
+    loaded = WeightedGraph()
+    load_edge_list(loaded, path, delimiter=",", weighted=True)
+    assert loaded.weight(2, 1) == 3.5
+
+
+def test_dimacs_edge_file(tmp_path):
+    path = tmp_path / "graph.col"
+    path.write_text("c coloring instance\np edge 4 3\ne 1 2\nc middle\ne 2 3\ne 4 1\n")
+    assert read_dimacs_header(path) == ("edge", 4, 3)
+    [(edges, weights)] = list(read_dimacs(path))
+    assert edges.tolist() == [[0, 1], [1, 2], [3, 0]]
+    assert weights is None
+
+    graph = Graph()
+    assert load_dimacs(graph, path) == 3
+    assert graph.num_nodes == 4
+    assert graph.is_neighbor(0, 3)
+
+
+def test_dimacs_shortest_path_round_trip(tmp_path):
+    graph = WeightedGraph(5)
+    graph.add_edges([(0, 1, 7), (0, 2, 9), (1, 2, 10), (2, 3, 2), (3, 4, 9)])
+    edges, weights = graph.to_edge_array()
+    path = tmp_path / "graph.gr.gz"
+    write_dimacs(path, 5, len(edges), edges, weights)
+    assert read_dimacs_header(path) == ("sp", 5, 5)
+
+    loaded = WeightedGraph()
+    assert load_dimacs(loaded, path, chunk_bytes=16) == 5
+    assert loaded.dijkstra(0) == graph.dijkstra(0)
+
+    digraph = Digraph()
+    load_dimacs(digraph, path, weighted=False)
+    assert digraph.is_edge(2, 3) and not digraph.is_edge(3, 2)
+
+    with pytest.raises(InvalidEdgeFileError):
+        write_dimacs(tmp_path / "bad.gr", 5, 4, edges, weights)
+
+
+def test_invalid_dimacs_file(tmp_path):
+    path = tmp_path / "graph.col"
+    path.write_text("e 1 2\n")
+    with pytest.raises(InvalidEdgeFileError):
+        read_dimacs_header(path)
+    path.write_text("p cnf 2 1\n1 -2 0\n")
+    with pytest.raises(InvalidEdgeFileError):
+        list(read_dimacs(path))
@@ -5,11 +5,43 @@ class InvalidNodeError(ValueError):
     pass
 
 
+# Number of set bits of every byte value
+_BYTE_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)],
+                          dtype=np.uint8)
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """ Returns the number of set bits of each uint64 word. """
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    return _BYTE_POPCOUNT[words.view(np.uint8)].reshape(words.shape + (8,)) \
+        .sum(axis=-1, dtype=np.int64)
+
+
+def _unpack_bits(words: np.ndarray, num_bits: int) -> np.ndarray:
+    """ Unpacks the last axis of an array of uint64 words into its first
+        num_bits bits, where bit k of a row is bit k % 64 of word k // 64.
+    """
+    words = np.ascontiguousarray(words, dtype="<u8")
+    bits = np.unpackbits(words.view(np.uint8), axis=-1,
+                         count=num_bits, bitorder="little")
+    return bits.astype(bool)
+
+
 class Graph:
-    """ Graph class that uses an adjacency matrix to represent its nodes and edges."""
-    def __init__(self, num_nodes: int = 0) -> None:
-        self._adj_matrix = np.full((num_nodes, num_nodes),
-                                   False)
+    """ Graph class that uses an adjacency matrix to represent its nodes and edges.
+
+        With packed=True each row of the matrix is stored as uint64 words
+        holding 64 cells each, which takes eight times less memory than the
+        boolean matrix.
+    """
+    def __init__(self, num_nodes: int = 0, packed: bool = False) -> None:
+        self._packed = packed
+        if not packed:
+            self._adj_matrix = np.full((num_nodes, num_nodes),
+                                       False)
+        else:
+            self._adj_bits = np.zeros((num_nodes, (num_nodes + 63) // 64),
+                                      dtype=np.uint64)
         self._num_nodes = num_nodes
         self._num_edges = 0
 
@@ -23,10 +55,42 @@ class Graph:
         """ Returns the number of edges"""
         return self._num_edges
 
+    @property
+    def packed(self) -> bool:
+        """ Returns true if the matrix is stored bit packed. """
+        return self._packed
+
     @property
     def adjacency_matrix(self) -> np.ndarray:
-        """ Returns the adjacency matrix of the graph"""
-        return self._adj_matrix
+        """ Returns the adjacency matrix of the graph. For a packed graph
+            this is an unpacked copy.
+        """
+        if not self._packed:
+            return self._adj_matrix
+        return self._rows(0, self._num_nodes)
+
+    def _rows(self, start: int, stop: int) -> np.ndarray:
+        """ Returns the given rows of the adjacency matrix as booleans. """
+        if not self._packed:
+            return self._adj_matrix[start:stop]
+        return _unpack_bits(self._adj_bits[start:stop], self._num_nodes)
+
+    def _has_edges(self, nodes_1: np.ndarray, nodes_2: np.ndarray) -> np.ndarray:
+        """ Returns which of the given node pairs are neighbors. """
+        if not self._packed:
+            return self._adj_matrix[nodes_1, nodes_2]
+        words = self._adj_bits[nodes_1, nodes_2 >> 6]
+        return (words >> (nodes_2 & 63).astype(np.uint64)) & np.uint64(1) == 1
+
+    def _set_edges(self, nodes_1: np.ndarray, nodes_2: np.ndarray) -> None:
+        """ Sets the cells of the given node pairs and their transposes. """
+        if not self._packed:
+            self._adj_matrix[nodes_1, nodes_2] = True
+            self._adj_matrix[nodes_2, nodes_1] = True
+            return
+        for rows, cols in ((nodes_1, nodes_2), (nodes_2, nodes_1)):
+            bits = np.left_shift(np.uint64(1), (cols & 63).astype(np.uint64))
+            np.bitwise_or.at(self._adj_bits, (rows, cols >> 6), bits)
 
     def _validate_node(self, node: int) -> None:
         if node < 0 or node >= self._num_nodes:
@@ -37,9 +101,28 @@ class Graph:
         self._validate_node(node_1)
         self._validate_node(node_2)
 
-        self._adj_matrix[node_1][node_2] = True
-        self._adj_matrix[node_2][node_1] = True
-        self._num_edges += 1
+        if not self._packed:
+            if not self._adj_matrix[node_1][node_2]:
+                self._adj_matrix[node_1][node_2] = True
+                self._adj_matrix[node_2][node_1] = True
+                self._num_edges += 1
+        elif not self.is_neighbor(node_1, node_2):
+            node_1, node_2 = int(node_1), int(node_2)
+            self._adj_bits[node_1, node_2 >> 6] |= np.uint64(1 << (node_2 & 63))
+            self._adj_bits[node_2, node_1 >> 6] |= np.uint64(1 << (node_1 & 63))
+            self._num_edges += 1
+
+    def add_edges(self, edges: np.ndarray) -> None:
+        """ Adds the edges of an (E, 2) array of node pairs to the graph. """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if len(edges) > 0 and (edges.min() < 0 or edges.max() >= self._num_nodes):
+            bad_node = edges.min() if edges.min() < 0 else edges.max()
+            raise InvalidNodeError(f"{bad_node} is not a node of this graph")
+
+        edges = np.unique(np.sort(edges, axis=1), axis=0)
+        is_new = ~self._has_edges(edges[:, 0], edges[:, 1])
+        self._set_edges(edges[:, 0], edges[:, 1])
+        self._num_edges += int(np.count_nonzero(is_new))
 
     def is_neighbor(self, node_1: int, node_2: int) -> bool:
         """ Checks if the given nodes are neighbors (there is an edge
@@ -48,28 +131,170 @@ class Graph:
         self._validate_node(node_1)
         self._validate_node(node_2)
 
-        return self._adj_matrix[node_1][node_2]
+        if not self._packed:
+            return self._adj_matrix[node_1][node_2]
+        node_2 = int(node_2)
+        return bool((int(self._adj_bits[node_1, node_2 >> 6]) >> (node_2 & 63)) & 1)
 
     def get_neighbors(self, node: int) -> list[int]:
         """ Returns the neighbors of a given node"""
         self._validate_node(node)
-
-        neighbors = []
-        for ii, is_neighbor in enumerate(self._adj_matrix[node]):
-            if is_neighbor:
-                neighbors.append(ii)
-
-        return neighbors
+        return np.flatnonzero(self._rows(node, node + 1)[0]).tolist()
 
     def num_neighbors(self, node: int) -> int:
         """ Returns the number of neighbors of the given node"""
         self._validate_node(node)
+        if not self._packed:
+            return int(np.count_nonzero(self._adj_matrix[node]))
+        return int(_popcount(self._adj_bits[node]).sum())
+
+    def degrees(self) -> np.ndarray:
+        """ Returns an array with the number of neighbors of every node. """
+        if not self._packed:
+            return np.count_nonzero(self._adj_matrix, axis=1)
+        return _popcount(self._adj_bits).sum(axis=1)
+
+    def common_neighbors(self, node_1: int, node_2: int) -> int:
+        """ Returns the number of neighbors the given nodes have in common. """
+        self._validate_node(node_1)
+        self._validate_node(node_2)
+        if not self._packed:
+            return int(np.count_nonzero(self._adj_matrix[node_1] & self._adj_matrix[node_2]))
+        return int(_popcount(self._adj_bits[node_1] & self._adj_bits[node_2]).sum())
 
-        neighbor_count = 0
-        for is_neighbor in self._adj_matrix[node]:
-            if is_neighbor:
-                neighbor_count += 1
-        return neighbor_count
+    def common_neighbors_matrix(self) -> np.ndarray:
+        """ Returns a matrix with the number of common neighbors of every
+            pair of nodes. It is the square of the adjacency matrix.
+        """
+        # Float products go through BLAS and are exact for these counts
+        matrix = self.adjacency_matrix.astype(np.float64)
+        return (matrix @ matrix).astype(np.int64)
+
+    def num_triangles(self) -> int:
+        """ Returns the number of triangles in the graph. Every triangle
+            is a closed walk of length three counted six times in the trace
+            of the cube of the adjacency matrix.
+        """
+        if self._packed:
+            return self._num_triangles_packed()
+
+        matrix = self._adj_matrix.copy()
+        # Self loops would add walks that are not triangles
+        np.fill_diagonal(matrix, False)
+        matrix = matrix.astype(np.float64)
+        closed_walks = np.einsum("ij,ji->", matrix @ matrix, matrix)
+        return int(round(closed_walks)) // 6
+
+    def _num_triangles_packed(self, chunk_size: int = 1 << 16) -> int:
+        """ Counts the triangles of a packed graph. For every edge the
+            common neighbors of its nodes are counted with a popcount of
+            their AND-ed rows, which counts each triangle three times.
+        """
+        bits = self._adj_bits.copy()
+        # Self loops would make a node a common neighbor of itself
+        nodes = np.arange(self._num_nodes)
+        bits[nodes, nodes >> 6] &= ~np.left_shift(np.uint64(1),
+                                                   (nodes & 63).astype(np.uint64))
+
+        num_triangles = 0
+        for start in range(0, self._num_nodes, 64):
+            rows = _unpack_bits(bits[start:start + 64], self._num_nodes)
+            nodes_1, nodes_2 = np.nonzero(rows)
+            nodes_1 += start
+            # Each edge is visited once, from its smallest node
+            is_forward = nodes_1 < nodes_2
+            nodes_1, nodes_2 = nodes_1[is_forward], nodes_2[is_forward]
+            for ii in range(0, len(nodes_1), chunk_size):
+                common = bits[nodes_1[ii:ii + chunk_size]] & bits[nodes_2[ii:ii + chunk_size]]
+                num_triangles += int(_popcount(common).sum())
+        return num_triangles // 3
+
+    def _neighbor_index(self) -> tuple[np.ndarray, np.ndarray]:
+        """ Returns the neighbors of all nodes concatenated in one array and
+            the offsets where the neighbors of each node start. The neighbors
+            of node i are neighbors[offsets[i]:offsets[i + 1]].
+        """
+        if not self._packed:
+            rows, neighbors = np.nonzero(self._adj_matrix)
+        else:
+            # Unpack a few rows at a time to avoid building the full matrix
+            row_chunks, neighbor_chunks = [], []
+            for start in range(0, self._num_nodes, 64):
+                rows, neighbors = np.nonzero(self._rows(start, start + 64))
+                row_chunks.append(rows + start)
+                neighbor_chunks.append(neighbors)
+            rows = np.concatenate(row_chunks) if row_chunks else np.empty(0, np.int64)
+            neighbors = np.concatenate(neighbor_chunks) if neighbor_chunks else rows
+        offsets = np.zeros(self._num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self._num_nodes), out=offsets[1:])
+        return neighbors, offsets
+
+    def _bit_parallel_bfs(self, sources: np.ndarray,
+                          neighbors: np.ndarray, offsets: np.ndarray,
+                          distances: np.ndarray | None = None) -> np.ndarray:
+        """ Runs a breadth first search from up to 64 sources at the same time.
+
+            Bit k of the word of a node is set when the node has been reached
+            from sources[k], so each layer is expanded for all sources at once
+            by OR-ing the frontier words of the neighbors of every node.
+            If a (len(sources), num_nodes) distances array is given the layer
+            at which each node is reached is written in it.
+            Returns the words with the nodes reachable from each source.
+        """
+        source_bits = np.left_shift(np.uint64(1),
+                                    np.arange(len(sources), dtype=np.uint64))
+        visited = np.zeros(self._num_nodes, dtype=np.uint64)
+        np.bitwise_or.at(visited, sources, source_bits)
+        if distances is not None:
+            distances[np.arange(len(sources)), sources] = 0
+
+        # reduceat needs non empty segments, so only nodes with neighbors
+        # take part in the expansion
+        has_neighbors = offsets[1:] > offsets[:-1]
+        starts = offsets[:-1][has_neighbors]
+
+        frontier = visited.copy()
+        layer = 0
+        while len(starts) > 0 and frontier.any():
+            layer += 1
+            reached = np.zeros(self._num_nodes, dtype=np.uint64)
+            reached[has_neighbors] = np.bitwise_or.reduceat(frontier[neighbors], starts)
+            frontier = reached & ~visited
+            visited |= frontier
+
+            if distances is not None:
+                nodes = np.nonzero(frontier)[0]
+                bits = _unpack_bits(frontier[nodes, np.newaxis], len(sources))
+                node_index, source_index = np.nonzero(bits)
+                distances[source_index, nodes[node_index]] = layer
+
+        return visited
+
+    def all_pairs_distances(self) -> np.ndarray:
+        """ Returns a matrix with the number of edges in the shortest path
+            between every pair of nodes, or -1 if there is no path.
+            The searches are run 64 sources at a time with bit parallel BFS.
+        """
+        neighbors, offsets = self._neighbor_index()
+        distances = np.full((self._num_nodes, self._num_nodes), -1, dtype=np.int32)
+        for start in range(0, self._num_nodes, 64):
+            sources = np.arange(start, min(start + 64, self._num_nodes))
+            self._bit_parallel_bfs(sources, neighbors, offsets,
+                                   distances[start:start + len(sources)])
+        return distances
+
+    def reachability_matrix(self) -> np.ndarray:
+        """ Returns a boolean matrix that is True at [i, j] when there is
+            a path between nodes i and j.
+        """
+        neighbors, offsets = self._neighbor_index()
+        reachable = np.zeros((self._num_nodes, self._num_nodes), dtype=bool)
+        for start in range(0, self._num_nodes, 64):
+            sources = np.arange(start, min(start + 64, self._num_nodes))
+            visited = self._bit_parallel_bfs(sources, neighbors, offsets)
+            bits = _unpack_bits(visited[:, np.newaxis], len(sources))
+            reachable[start:start + len(sources)] = bits.T
+        return reachable
 
     def __repr__(self) -> str:
         return f"Graph(num_nodes={self.num_nodes}, num_edges={self.num_edges})"
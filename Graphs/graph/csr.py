@@ -0,0 +1,237 @@
+from array import array
+from bisect import bisect_left
+from collections import deque
+import os
+import sys
+
+# The binary graph file is shared with Graphs/digraph, so it lives in a
+# sibling directory that is not a package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "formats"))
+
+from graph_file import (FLAG_DIRECTED, FLAG_WEIGHTED,  # noqa: E402
+                        InvalidGraphFileError, map_file_sections,
+                        open_graph_file, write_graph_file)
+
+
+class InvalidNodeError(ValueError):
+    pass
+
+
+class CSRGraph:
+    """ Frozen undirected graph stored in compressed sparse row format.
+
+        The neighbors of node i are targets[offsets[i]:offsets[i + 1]],
+        sorted in ascending order. Offsets are stored as 64-bit integers
+        and targets as 32-bit integers, so each edge endpoint costs four
+        bytes instead of a Python int inside a Python list.
+    """
+    def __init__(self, offsets: array, targets: array, num_edges: int,
+                 weights: array | None = None):
+        self._offsets = offsets
+        self._targets = targets
+        self._weights = weights
+        self._num_nodes = len(offsets) - 1
+        self._num_edges = num_edges
+        # Memory map the arrays point into, if the graph was opened from a file
+        self._mapping = None
+
+    @classmethod
+    def from_adjacency_list(cls, adjacency_list: list[list[int]],
+                            weights: list[array] | None = None) -> "CSRGraph":
+        """ Compile an adjacency list into a CSR graph. If given, the weights
+            must be parallel to the adjacency list.
+        """
+        offsets = array("q", [0])
+        targets = array("i")
+        csr_weights = array("d") if weights is not None else None
+        num_endpoints = 0
+        num_self_loops = 0
+        for node, neighbors in enumerate(adjacency_list):
+            if weights is None:
+                row = sorted(neighbors)
+            else:
+                row_weights = sorted(zip(neighbors, weights[node]))
+                row = [neighbor for neighbor, _ in row_weights]
+                csr_weights.extend(weight for _, weight in row_weights)
+            targets.extend(row)
+            num_endpoints += len(row)
+            offsets.append(num_endpoints)
+            # A self loop appears twice in the adjacency list of its node
+            num_self_loops += row.count(node)
+
+        num_edges = (num_endpoints - num_self_loops) // 2 + num_self_loops // 2
+        return cls(offsets, targets, num_edges, csr_weights)
+
+    def save(self, path: str) -> None:
+        """ Writes the graph to a binary file that can be opened with
+            CSRGraph.open.
+        """
+        sections = [self._offsets, self._targets]
+        flags = 0
+        if self._weights is not None:
+            sections.append(self._weights)
+            flags |= FLAG_WEIGHTED
+        write_graph_file(path, flags, self._num_nodes, self._num_edges, sections)
+
+    @classmethod
+    def open(cls, path: str) -> "CSRGraph":
+        """ Opens a graph saved with save. The file is memory mapped and the
+            graph reads its arrays straight from the mapping, so nothing is
+            parsed and processes opening the same file share its pages.
+        """
+        mapping, flags, num_nodes, num_edges = open_graph_file(path)
+        if flags & FLAG_DIRECTED:
+            mapping.close()
+            raise InvalidGraphFileError(f"{path} holds a directed graph")
+        sections = map_file_sections(mapping, flags, num_nodes)
+        graph = cls(sections["offsets"], sections["targets"], num_edges,
+                    sections.get("weights"))
+        graph._mapping = mapping
+        return graph
+
+    @property
+    def num_nodes(self) -> int:
+        """ Returns the number of nodes in the graph. """
+        return self._num_nodes
+
+    @property
+    def num_edges(self) -> int:
+        """ Returns the number of edges in the graph. """
+        return self._num_edges
+
+    @property
+    def offsets(self) -> array:
+        """ Returns the offsets array. Has num_nodes + 1 entries. """
+        return self._offsets
+
+    @property
+    def targets(self) -> array:
+        """ Returns the concatenated neighbor lists. """
+        return self._targets
+
+    @property
+    def weights(self) -> array | None:
+        """ Returns the weights of the edges, parallel to the targets,
+            or None if the graph is not weighted.
+        """
+        return self._weights
+
+    def _validate_node(self, node: int) -> None:
+        if node < 0 or node >= self._num_nodes:
+            raise InvalidNodeError(f"{node} is not a node of this graph")
+
+    def degree(self, node: int) -> int:
+        """ Returns the number of neighbors of the given node. """
+        self._validate_node(node)
+        return self._offsets[node + 1] - self._offsets[node]
+
+    def neighbors(self, node: int) -> array:
+        """ Returns the neighbors of the given node. """
+        self._validate_node(node)
+        return self._targets[self._offsets[node]:self._offsets[node + 1]]
+
+    def is_neighbor(self, node_1: int, node_2: int) -> bool:
+        """ Returns true if the given nodes are neighbors. Uses a binary
+            search over the sorted neighbors of node_1.
+        """
+        self._validate_node(node_1)
+        self._validate_node(node_2)
+
+        end = self._offsets[node_1 + 1]
+        index = bisect_left(self._targets, node_2, self._offsets[node_1], end)
+        return index < end and self._targets[index] == node_2
+
+    def distances_from_node(self, node: int) -> list[float]:
+        """ Return the distances from the given node to all other
+            nodes in the graph.
+        """
+        self._validate_node(node)
+
+        offsets = self._offsets
+        targets = self._targets
+        distances = [float("inf")] * self._num_nodes
+        distances[node] = 0
+        queue = deque()
+        queue.appendleft(node)
+
+        while len(queue) > 0:
+            current_node = queue.pop()
+            next_distance = distances[current_node] + 1
+            for neighbor in targets[offsets[current_node]:offsets[current_node + 1]]:
+                if distances[neighbor] == float("inf"):
+                    distances[neighbor] = next_distance
+                    queue.appendleft(neighbor)
+
+        return distances
+
+    def shortest_path(self, start_node: int, end_node: int) -> float:
+        """ Returns the shortest path from start node to end node. """
+        distance = self.distances_from_node(start_node)[end_node]
+        if distance == float("inf"):
+            return -1
+        return distance
+
+    def connected_components(self) -> array:
+        """ Returns an array with the connected component id of each node.
+            Components are numbered from zero in order of their smallest node.
+        """
+        offsets = self._offsets
+        targets = self._targets
+        components = array("i", [-1]) * self._num_nodes
+        queue = deque()
+        component = 0
+
+        for node in range(self._num_nodes):
+            if components[node] != -1:
+                continue
+            components[node] = component
+            queue.appendleft(node)
+            while len(queue) > 0:
+                current_node = queue.pop()
+                for neighbor in targets[offsets[current_node]:offsets[current_node + 1]]:
+                    if components[neighbor] == -1:
+                        components[neighbor] = component
+                        queue.appendleft(neighbor)
+            component += 1
+
+        return components
+
+    def num_connected_components(self) -> int:
+        """ Returns the number of connected components. """
+        components = self.connected_components()
+        if len(components) == 0:
+            return 0
+        return max(components) + 1
+
+    def is_bipartite(self) -> bool:
+        """ Returns true if the graph is bipartite. """
+        offsets = self._offsets
+        targets = self._targets
+        # 0 means not visited, 1 and 2 are the two colors
+        colors = bytearray(self._num_nodes)
+        queue = deque()
+
+        for node in range(self._num_nodes):
+            if colors[node] != 0:
+                continue
+            colors[node] = 1
+            queue.appendleft(node)
+            while len(queue) > 0:
+                current_node = queue.pop()
+                color = colors[current_node]
+                for neighbor in targets[offsets[current_node]:offsets[current_node + 1]]:
+                    if colors[neighbor] == color:
+                        return False
+                    if colors[neighbor] == 0:
+                        colors[neighbor] = 3 - color
+                        queue.appendleft(neighbor)
+
+        return True
+
+    def __len__(self):
+        return self._num_nodes
+
+    def __repr__(self):
+        return f"CSRGraph(num_nodes={self._num_nodes}, num_edges={self._num_edges})"
+
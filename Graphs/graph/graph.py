@@ -1,25 +1,125 @@
+from array import array
 from collections import deque
-from enum import Enum
+from collections.abc import Callable, Iterable, Iterator
+from multiprocessing import Pool
+import os
+import sys
 
+import numpy as np
 
-class InvalidNodeError(ValueError):
-    pass
+from csr import CSRGraph, InvalidNodeError
 
+# The disjoint sets live with the other data structures, in a directory
+# that is not a package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))), "DataStructures", "DisjointSet"))
 
-class Colors(Enum):
-    # Colors for the is bipartite function
-    white = -1  # Represents a node that has not been visited
-    red = 0
-    green = 1
+from disjoint_set import DisjointSets  # noqa: E402
+
+
+# Node colors for the bipartite check. Uncolored nodes are zero so a fresh
+# bytearray starts with every node uncolored
+_UNCOLORED = 0
+_RED = 1
+_GREEN = 2
+# Translation table from node colors to sides of a two coloring
+_COLOR_SIDES = bytes([0, 0, 1]) + bytes(253)
+
+
+def _breadth_first_search(adjacency_list: list[list[int]], distances: array,
+                          queue: array, num_sources: int) -> int:
+    """ Runs a breadth first search from the first num_sources nodes of the
+        queue, which must already be at distance zero. Unvisited nodes must
+        be at distance -1.
+
+        The queue is a preallocated array with room for every node. Returns
+        the number of visited nodes, which are left at the start of the queue.
+    """
+    head = 0
+    tail = num_sources
+    while head < tail:
+        current_node = queue[head]
+        head += 1
+        next_distance = distances[current_node] + 1
+        for neighbor in adjacency_list[current_node]:
+            if distances[neighbor] == -1:
+                distances[neighbor] = next_distance
+                queue[tail] = neighbor
+                tail += 1
+    return tail
+
+
+def _unique_edges(edges: np.ndarray, num_nodes: int,
+                  return_index: bool = False):
+    """ Returns the distinct rows of an (E, 2) array of edges with nodes
+        below num_nodes, sorted by source and then by target, and with
+        return_index the index of the first occurrence of each.
+
+        Each edge is packed into one int64 key and the keys are sorted,
+        which is much faster than np.unique over rows.
+    """
+    num_nodes = max(num_nodes, 1)
+    keys = edges[:, 0] * num_nodes + edges[:, 1]
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    first = np.ones(len(keys), dtype=bool)
+    np.not_equal(keys[1:], keys[:-1], out=first[1:])
+    unique = np.column_stack(np.divmod(keys[first], num_nodes))
+    return (unique, order[first]) if return_index else unique
+
+
+# Adjacency list of the graph, set once in each process of a pool
+_worker_adjacency_list = []
+
+
+def _new_components(num_nodes: int) -> DisjointSets:
+    """ Returns disjoint sets with every node in a set of its own. """
+    components = DisjointSets(num_nodes, path_compression=True)
+    for node in range(num_nodes):
+        components.make_set(node)
+    return components
+
+
+def _init_distances_worker(adjacency_list: list[list[int]]) -> None:
+    global _worker_adjacency_list
+    _worker_adjacency_list = adjacency_list
+
+
+def _distances_worker(sources: list[int]) -> list[array]:
+    """ Computes the distances from each of the given sources in a pool process. """
+    num_nodes = len(_worker_adjacency_list)
+    distances = array("i", [-1]) * num_nodes
+    queue = array("i", [0]) * num_nodes
+    results = []
+    for source in sources:
+        distances[source] = 0
+        queue[0] = source
+        num_visited = _breadth_first_search(_worker_adjacency_list,
+                                            distances, queue, 1)
+        results.append(array("i", distances))
+        for node in queue[:num_visited]:
+            distances[node] = -1
+    return results
 
 
 class Graph:
     """ Graph class using an adjacency list representation.
+
+        With track_components the graph keeps its connected components in
+        a disjoint sets structure updated on every added edge and node, so
+        num_connected_components and path_between don't search the graph.
     """
-    def __init__(self, num_nodes: int = 0):
+    def __init__(self, num_nodes: int = 0, track_components: bool = False):
+        self._reset(num_nodes, track_components)
+
+    def _reset(self, num_nodes: int, track_components: bool) -> None:
+        """ Sets up an empty graph with the given number of nodes. """
         self._num_nodes = num_nodes
         self._num_edges = 0
         self._adjacency_list = [[] for _ in range(num_nodes)]
+        # Hashed copy of the adjacency list for constant time edge lookups
+        self._neighbor_sets = [set() for _ in range(num_nodes)]
+        self._components = _new_components(num_nodes) if track_components else None
 
     def _validate_node(self, node: int) -> None:
         if node < 0 or node >= self._num_nodes:
@@ -45,7 +145,11 @@ class Graph:
         if not self.is_neighbor(node_1, node_2):
             self._adjacency_list[node_1].append(node_2)
             self._adjacency_list[node_2].append(node_1)
+            self._neighbor_sets[node_1].add(node_2)
+            self._neighbor_sets[node_2].add(node_1)
             self._num_edges += 1
+            if self._components is not None:
+                self._components.union(node_1, node_2)
 
     def add_edges(self, edge_list: list[tuple[int, int]]) -> None:
         """ Add multiple edges to the graph"""
@@ -59,66 +163,137 @@ class Graph:
         for node_2 in node_list:
             self.add_edge(node, node_2)
 
+    def from_edge_array(self, num_nodes: int, edges: np.ndarray) -> None:
+        """ Replaces the graph with one built from an (E, 2) array of edges.
+
+            Validation, deduplication and sorting are done in vectorized
+            passes, so the neighbors of each node end up in ascending order.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if len(edges) > 0 and (edges.min() < 0 or edges.max() >= num_nodes):
+            bad_node = edges.min() if edges.min() < 0 else edges.max()
+            raise InvalidNodeError(f"{bad_node} is not a node of this graph")
+
+        # An undirected edge is identified by its smallest node first
+        edges = _unique_edges(np.sort(edges, axis=1), num_nodes)
+        sources = np.concatenate((edges[:, 0], edges[:, 1]))
+        targets = np.concatenate((edges[:, 1], edges[:, 0]))
+        # Sorting packed keys is faster than a lexsort of the two columns
+        order = np.argsort(sources * max(num_nodes, 1) + targets)
+        bounds = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=bounds[1:])
+
+        targets = targets[order].tolist()
+        bounds = bounds.tolist()
+        self._adjacency_list = [targets[bounds[node]:bounds[node + 1]]
+                                for node in range(num_nodes)]
+        self._neighbor_sets = [set(neighbors) for neighbors in self._adjacency_list]
+        self._num_nodes = num_nodes
+        self._num_edges = len(edges)
+        if self._components is not None:
+            self._components = _new_components(num_nodes)
+            for node_1, node_2 in edges.tolist():
+                self._components.union(node_1, node_2)
+
+    def from_edge_file(self, num_nodes: int, path: str,
+                       dtype: np.dtype = np.int32) -> None:
+        """ Replaces the graph with one built from a binary file of
+            node pairs. The file is memory mapped rather than read.
+        """
+        if os.path.getsize(path) == 0:
+            edges = np.empty((0, 2), dtype=dtype)
+        else:
+            edges = np.memmap(path, dtype=dtype, mode="r").reshape(-1, 2)
+        self.from_edge_array(num_nodes, edges)
+
     def add_node(self) -> None:
         """ Adds a node to the graph. """
-        self.adjacency_list.append([])
+        self._adjacency_list.append([])
+        self._neighbor_sets.append(set())
         self._num_nodes += 1
+        if self._components is not None:
+            self._components.make_set()
 
     def is_neighbor(self, node_1: int, node_2: int) -> bool:
         """ Returns true uf the given nodes are neighbors. """
         self._validate_node(node_1)
         self._validate_node(node_2)
 
-        if node_2 in self._adjacency_list[node_1]:
-            return True
-        return False
+        return node_2 in self._neighbor_sets[node_1]
 
     def neighbors(self, node: int) -> list[int]:
         """ Returns the neighbors of the given node"""
         self._validate_node(node)
         return self._adjacency_list[node]
 
-    def _path_between_util(self, current_node: int, end_node: int,
-                           visited: list[bool]) -> bool:
-        """ Util method to find if there is a path between two nodes
-            using a recursive algorithm.
+    def _depth_first_search(self, start_node: int, visited: list[bool],
+                            pre_visit: Callable[[int], bool] | None = None,
+                            post_visit: Callable[[int], None] | None = None
+                            ) -> bool:
+        """ Explore the nodes reachable from the given node in depth first
+            order, using an explicit stack instead of recursion.
+
+            pre_visit is called when a node is discovered and can return
+            True to stop the search, in which case this method returns True.
+            post_visit is called once all the neighbors of a node have been
+            explored.
         """
-        if current_node == end_node:
+        adjacency_list = self._adjacency_list
+        visited[start_node] = True
+        if pre_visit is not None and pre_visit(start_node):
             return True
 
-        is_reachable = False
-        visited[current_node] = True
-
-        for neighbor in self.adjacency_list[current_node]:
-            if not visited[neighbor]:
-                is_reachable = self._path_between_util(neighbor, end_node, visited)
-                if is_reachable:
+        # Each stack frame holds a node and an iterator over its remaining
+        # neighbors, so a node is resumed where it was left
+        stack = [(start_node, iter(adjacency_list[start_node]))]
+        while len(stack) > 0:
+            current_node, neighbors = stack[-1]
+            for neighbor in neighbors:
+                if not visited[neighbor]:
+                    visited[neighbor] = True
+                    if pre_visit is not None and pre_visit(neighbor):
+                        return True
+                    stack.append((neighbor, iter(adjacency_list[neighbor])))
                     break
+            else:
+                stack.pop()
+                if post_visit is not None:
+                    post_visit(current_node)
 
-        return is_reachable
+        return False
+
+    def _path_between_util(self, current_node: int, end_node: int,
+                           visited: list[bool]) -> bool:
+        """ Util method to find if there is a path between two nodes
+            using a depth first search that stops at the end node.
+        """
+        return self._depth_first_search(current_node, visited,
+                                        pre_visit=lambda node: node == end_node)
 
     def path_between(self, start_node: int, end_node: int) -> bool:
         """ Returns true if there is a path between the given nodes. """
         self._validate_node(start_node)
         self._validate_node(end_node)
 
+        if self._components is not None:
+            return self._components.find(start_node) == self._components.find(end_node)
         visited = [False] * self.num_nodes
         return self._path_between_util(start_node, end_node, visited)
 
     def _explore(self, current_node: int, visited: list[bool]) -> None:
         """ Explore the nodes reachable from the given node.
         """
-        visited[current_node] = True
-        for neighbor in self.adjacency_list[current_node]:
-            if not visited[neighbor]:
-                self._explore(neighbor, visited)
+        self._depth_first_search(current_node, visited)
 
     def num_connected_components(self) -> int:
         """ Returns the number of connected components.
 
             Performs a depth first search while counting the number
-            of connected components.
+            of connected components, unless the components are tracked.
         """
+        if self._components is not None:
+            return self._components.num_sets
+
         visited = [False] * self._num_nodes
         connected_components = 0
 
@@ -152,42 +327,228 @@ class Graph:
 
         return distances
 
-    def shortest_path(self, start_node: int, end_node: int) -> float:
-        """ Returns the shortest path from start node to end node. """
-        distance = self.distances_from_node(start_node)[end_node]
-        if distance == float("inf"):
-            return -1
-        return distance
+    def iter_distances(self, sources: Iterable[int]) -> Iterator[tuple[int, array]]:
+        """ Yields the source and the distances from it to all nodes for
+            each of the given sources. Unreachable nodes are at distance -1.
 
-    def _is_bipartite_util(self, current_node: int,
-                           colors: list[Colors]) -> bool:
-        """ Check if a graph is bipartite by coloring the
-            graph by two different colors such that any two
-            adjacent nodes have different colors.
+            A single int32 distance buffer is reused for every source, so
+            it must be copied if it is needed after the next iteration.
+            Only the nodes reached by the previous search are reset.
+        """
+        distances = array("i", [-1]) * self._num_nodes
+        queue = array("i", [0]) * self._num_nodes
+        num_visited = 0
+        for source in sources:
+            self._validate_node(source)
+            for node in queue[:num_visited]:
+                distances[node] = -1
+            distances[source] = 0
+            queue[0] = source
+            num_visited = _breadth_first_search(self._adjacency_list,
+                                                distances, queue, 1)
+            yield source, distances
+
+    def distances_from_nodes(self, sources: Iterable[int],
+                             processes: int | None = None,
+                             chunk_size: int = 64) -> list[array]:
+        """ Returns an int32 array of distances for each of the given sources.
+            Unreachable nodes are at distance -1.
+
+            If processes is given the sources are split in chunks and solved
+            in a pool of that many processes. The adjacency list is sent once
+            to each process instead of once per task.
         """
-        colors[current_node] = Colors.green
+        sources = list(sources)
+        if processes is None:
+            return [array("i", distances)
+                    for _, distances in self.iter_distances(sources)]
+
+        for source in sources:
+            self._validate_node(source)
+        chunks = [sources[ii:ii + chunk_size]
+                  for ii in range(0, len(sources), chunk_size)]
+        with Pool(processes, initializer=_init_distances_worker,
+                  initargs=(self._adjacency_list,)) as pool:
+            results = []
+            for chunk_result in pool.imap(_distances_worker, chunks):
+                results.extend(chunk_result)
+        return results
+
+    def nearest_source(self, sources: Iterable[int]) -> tuple[array, array]:
+        """ Runs a single breadth first search from all the given sources at
+            once. Returns an array with the distance from each node to its
+            nearest source and an array with that source. Nodes that cannot
+            reach any source are at distance -1 with source -1. Ties between
+            sources at the same distance are broken arbitrarily.
+        """
+        distances = array("i", [-1]) * self._num_nodes
+        nearest = array("i", [-1]) * self._num_nodes
+        queue = array("i", [0]) * self._num_nodes
+        num_sources = 0
+        for source in sources:
+            self._validate_node(source)
+            if distances[source] == -1:
+                distances[source] = 0
+                nearest[source] = source
+                queue[num_sources] = source
+                num_sources += 1
+
+        # The nearest source of a node is inherited from the node that
+        # discovers it
+        head = 0
+        tail = num_sources
+        while head < tail:
+            current_node = queue[head]
+            head += 1
+            next_distance = distances[current_node] + 1
+            for neighbor in self._adjacency_list[current_node]:
+                if distances[neighbor] == -1:
+                    distances[neighbor] = next_distance
+                    nearest[neighbor] = nearest[current_node]
+                    queue[tail] = neighbor
+                    tail += 1
+
+        return distances, nearest
+
+    def shortest_path(self, start_node: int, end_node: int,
+                      bidirectional: bool = False) -> int:
+        """ Returns the shortest path from start node to end node,
+            or -1 if there is no path between them.
+
+            The search stops as soon as the end node is reached. With
+            bidirectional=True a search is grown from each end instead,
+            always expanding the smaller frontier, until they meet.
+        """
+        self._validate_node(start_node)
+        self._validate_node(end_node)
+
+        if start_node == end_node:
+            return 0
+        if bidirectional:
+            return self._bidirectional_shortest_path(start_node, end_node)
+
+        # Only the visited nodes are stored so a query close to the start
+        # node does not pay for the size of the graph
+        distances = {start_node: 0}
         queue = deque()
-        queue.appendleft(current_node)
+        queue.appendleft(start_node)
 
         while len(queue) > 0:
             current_node = queue.pop()
-            for neighbor in self.adjacency_list[current_node]:
-                if colors[current_node] == colors[neighbor]:
-                    return False
-                if colors[neighbor] == Colors.white:
-                    colors[neighbor] = Colors(1 - colors[current_node].value)
+            next_distance = distances[current_node] + 1
+            for neighbor in self._adjacency_list[current_node]:
+                if neighbor not in distances:
+                    if neighbor == end_node:
+                        return next_distance
+                    distances[neighbor] = next_distance
                     queue.appendleft(neighbor)
 
-        return True
+        return -1
+
+    def _bidirectional_shortest_path(self, start_node: int, end_node: int) -> int:
+        """ Breadth first search from both nodes, one layer at a time.
+            Returns -1 if the searches do not meet.
+        """
+        distances = [{start_node: 0}, {end_node: 0}]
+        frontiers = [[start_node], [end_node]]
+        depths = [0, 0]
+
+        while len(frontiers[0]) > 0 and len(frontiers[1]) > 0:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            visited = distances[side]
+            other_visited = distances[1 - side]
+            depths[side] += 1
+            next_frontier = []
+            path_length = -1
+
+            # The whole layer is expanded because the first meeting point
+            # found is not necessarily the closest one
+            for current_node in frontiers[side]:
+                for neighbor in self._adjacency_list[current_node]:
+                    if neighbor in other_visited:
+                        length = depths[side] + other_visited[neighbor]
+                        if path_length == -1 or length < path_length:
+                            path_length = length
+                    if neighbor not in visited:
+                        visited[neighbor] = depths[side]
+                        next_frontier.append(neighbor)
+
+            if path_length != -1:
+                return path_length
+            frontiers[side] = next_frontier
+
+        return -1
+
+    def _is_bipartite_util(self, current_node: int, colors: bytearray,
+                           queue: array, tail: int) -> tuple[bool, int]:
+        """ Check if a graph is bipartite by coloring the
+            graph by two different colors such that any two
+            adjacent nodes have different colors.
+
+            Colored nodes are appended to the queue after its first tail
+            entries. Returns whether the coloring succeeded and the new tail.
+        """
+        adjacency_list = self._adjacency_list
+        colors[current_node] = _RED
+        queue[tail] = current_node
+        head = tail
+        tail += 1
+
+        while head < tail:
+            current_node = queue[head]
+            head += 1
+            # _RED + _GREEN == 3, so this is the other color
+            other_color = 3 - colors[current_node]
+            for neighbor in adjacency_list[current_node]:
+                if colors[neighbor] == _UNCOLORED:
+                    colors[neighbor] = other_color
+                    queue[tail] = neighbor
+                    tail += 1
+                elif colors[neighbor] != other_color:
+                    return False, tail
+
+        return True, tail
+
+    def _two_color(self) -> bytearray | None:
+        """ Colors the whole graph and returns the color of every node, or
+            None if the graph is not bipartite. The buffers are allocated on
+            every call so concurrent readers don't share them.
+        """
+        colors = bytearray(self._num_nodes)
+        queue = array("i", [0]) * self._num_nodes
+        tail = 0
+        for node in range(self._num_nodes):
+            if colors[node] == _UNCOLORED:
+                is_bipartite, tail = self._is_bipartite_util(node, colors,
+                                                             queue, tail)
+                if not is_bipartite:
+                    return None
+        return colors
 
     def is_bipartite(self) -> bool:
         """ Returns true if the graph is bipartite. """
-        colors = [Colors.white] * self._num_nodes
-        for node in range(self._num_nodes):
-            if colors[node] == Colors.white \
-                    and not self._is_bipartite_util(node, colors):
-                return False
-        return True
+        return self._two_color() is not None
+
+    def two_coloring(self) -> bytearray | None:
+        """ Returns the side, 0 or 1, of every node in a two coloring of the
+            graph, or None if the graph is not bipartite.
+        """
+        colors = self._two_color()
+        if colors is None:
+            return None
+        return colors.translate(_COLOR_SIDES)
+
+    def to_csr(self) -> CSRGraph:
+        """ Compiles the graph into a frozen compressed sparse row graph.
+            Later changes to this graph are not reflected in it.
+        """
+        return CSRGraph.from_adjacency_list(self._adjacency_list)
+
+    def save(self, path: str) -> None:
+        """ Writes the graph to a binary file. CSRGraph.open maps the file
+            back into memory as a ready to use CSR graph.
+        """
+        self.to_csr().save(path)
 
     def __len__(self):
         return self._num_nodes
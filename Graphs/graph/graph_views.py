@@ -0,0 +1,89 @@
+from collections.abc import Callable, Sequence
+import os
+import sys
+
+import numpy as np
+
+from graph import Graph
+
+# Code shared with Graphs/digraph lives in a sibling directory that is not
+# a package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "common"))
+
+from read_only import FilteredRows, ReadOnlyGraphError  # noqa: E402
+
+
+class SubGraph(Graph):
+    """ Read only view of the part of a graph given by a node mask and an
+        edge filter. The rows of the adjacency list are filtered as they are
+        iterated, so the graph is never copied and the view follows later
+        edges and rebuilds of the graph. Nodes past the end of the mask are
+        outside the view. The edge filter must give the same answer for
+        (a, b) and (b, a).
+
+        Nodes keep their numbers, so results per node line up with the
+        graph. Nodes outside the mask stay in the view without edges, which
+        means they are counted as isolated nodes by algorithms that visit
+        every node. Counting the edges takes O(E).
+    """
+    def __init__(self, graph: Graph, node_mask: Sequence[bool] | None = None,
+                 edge_filter: Callable[[int, int], bool] | None = None):
+        if node_mask is not None and len(node_mask) != graph.num_nodes:
+            raise ValueError(f"The node mask has {len(node_mask)} entries "
+                             f"for {graph.num_nodes} nodes")
+        super().__init__()
+        self._graph = graph
+        self._node_mask = node_mask
+        self._edge_filter = edge_filter
+
+    def _reset(self, num_nodes: int, track_components: bool) -> None:
+        # Only called by Graph.__init__, the view reads the storage of its graph
+        self._neighbor_sets = None
+        self._components = None
+
+    @property
+    def _num_nodes(self) -> int:
+        return self._graph.num_nodes
+
+    @property
+    def _num_edges(self) -> int:
+        num_endpoints = 0
+        num_self_loops = 0
+        for node, neighbors in enumerate(self._adjacency_list):
+            num_endpoints += len(neighbors)
+            num_self_loops += neighbors.count(node)
+        # A self loop appears twice in the adjacency list of its node
+        return (num_endpoints - num_self_loops) // 2 + num_self_loops // 2
+
+    @property
+    def _adjacency_list(self) -> FilteredRows:
+        return FilteredRows(self._graph.adjacency_list, self._node_mask,
+                            self._edge_filter)
+
+    def neighbors(self, node: int) -> list[int]:
+        """ Returns a new list with the neighbors of the node in the view. """
+        return list(super().neighbors(node))
+
+    def is_neighbor(self, node_1: int, node_2: int) -> bool:
+        """ Returns true if the given nodes are neighbors in the view. """
+        if not self._graph.is_neighbor(node_1, node_2):
+            return False
+        node_mask = self._node_mask
+        if node_mask is not None and \
+                not (node_1 < len(node_mask) and node_2 < len(node_mask) and
+                     node_mask[node_1] and node_mask[node_2]):
+            return False
+        return self._edge_filter is None or self._edge_filter(node_1, node_2)
+
+    def add_edge(self, node_1: int, node_2: int) -> None:
+        raise ReadOnlyGraphError("A graph view cannot be modified")
+
+    def add_node(self) -> None:
+        raise ReadOnlyGraphError("A graph view cannot be modified")
+
+    def from_edge_array(self, num_nodes: int, edges: np.ndarray) -> None:
+        raise ReadOnlyGraphError("A graph view cannot be modified")
+
+    def __repr__(self):
+        return f"SubGraph(num_nodes={self._num_nodes}, num_edges={self._num_edges})"
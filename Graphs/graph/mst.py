@@ -0,0 +1,108 @@
+from array import array
+from collections.abc import Iterator
+
+import numpy as np
+
+from csr import InvalidNodeError
+from graph import DisjointSets, _new_components
+
+
+def _validate_edges(num_nodes: int, edges: np.ndarray,
+                    weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """ Returns the edges as an (E, 2) int64 array and the weights as a
+        float64 array, checking that they match the number of nodes.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    weights = np.asarray(weights, dtype=np.float64).reshape(-1)
+    if len(weights) != len(edges):
+        raise ValueError(f"Got {len(weights)} weights for {len(edges)} edges")
+    if len(edges) > 0 and (edges.min() < 0 or edges.max() >= num_nodes):
+        bad_node = edges.min() if edges.min() < 0 else edges.max()
+        raise InvalidNodeError(f"{bad_node} is not a node of this graph")
+    return edges, weights
+
+
+def _sorted_edges(edges: np.ndarray, order: np.ndarray,
+                  chunk_edges: int = 4096) -> Iterator[tuple[int, int, int]]:
+    """ Yields the index and the nodes of every edge in the given order.
+        Edges are converted to Python ints one chunk at a time, so a search
+        that stops early doesn't convert the rest.
+    """
+    for start in range(0, len(order), chunk_edges):
+        chunk = order[start:start + chunk_edges]
+        yield from zip(chunk.tolist(), edges[chunk, 0].tolist(),
+                       edges[chunk, 1].tolist())
+
+
+def _kruskal(num_nodes: int, edges: np.ndarray, weights: np.ndarray,
+             num_trees: int, find_spacing: bool = False
+             ) -> tuple[DisjointSets, array, float]:
+    """ Runs Kruskal's algorithm until the forest has num_trees trees.
+
+        The edges are visited in order of weight through a single argsort.
+        Returns the disjoint sets of the forest, the indices of its edges
+        and, if find_spacing, the weight of the lightest edge left between
+        two different trees, or infinity if there is none or it was not
+        searched for.
+    """
+    if num_trees < 1:
+        raise ValueError(f"{num_trees} is not a valid number of trees")
+    edges, weights = _validate_edges(num_nodes, edges, weights)
+
+    order = np.argsort(weights, kind="stable")
+    sorted_edges = _sorted_edges(edges, order)
+    sets = _new_components(num_nodes)
+    selected = array("q")
+    if sets.num_sets > num_trees:
+        for index, node_1, node_2 in sorted_edges:
+            if sets.union(node_1, node_2):
+                selected.append(index)
+                if sets.num_sets <= num_trees:
+                    break
+
+    spacing = float("inf")
+    if find_spacing:
+        # Continue with the edges after the last one of the forest
+        for index, node_1, node_2 in sorted_edges:
+            if sets.find(node_1) != sets.find(node_2):
+                spacing = float(weights[index])
+                break
+
+    return sets, selected, spacing
+
+
+def kruskal(num_nodes: int, edges: np.ndarray, weights: np.ndarray,
+            num_trees: int = 1) -> np.ndarray:
+    """ Returns the indices of the edges of a minimum spanning forest of
+        the graph given by an (E, 2) array of edges and their weights,
+        sorted by weight.
+
+        The search stops once the forest has num_trees trees, or when the
+        edges run out if the graph has more connected components.
+    """
+    _, selected, _ = _kruskal(num_nodes, edges, weights, num_trees)
+    return np.frombuffer(selected, dtype=np.int64)
+
+
+def k_clustering(num_nodes: int, edges: np.ndarray, weights: np.ndarray,
+                 k: int) -> tuple[np.ndarray, float]:
+    """ Splits the nodes in k clusters by building a minimum spanning forest
+        with k trees, which maximizes the spacing between the clusters.
+
+        Returns the cluster of every node, numbered from zero in order of
+        their smallest node, and the spacing: the weight of the lightest
+        edge between two clusters. If the graph has more than k connected
+        components the clusters are its components.
+    """
+    if k > num_nodes:
+        raise ValueError(f"Cannot split {num_nodes} nodes in {k} clusters")
+    sets, _, spacing = _kruskal(num_nodes, edges, weights, k, find_spacing=True)
+
+    labels = np.empty(num_nodes, dtype=np.int32)
+    cluster_of_root = {}
+    for node in range(num_nodes):
+        root = sets.find(node)
+        if root not in cluster_of_root:
+            cluster_of_root[root] = len(cluster_of_root)
+        labels[node] = cluster_of_root[root]
+    return labels, spacing
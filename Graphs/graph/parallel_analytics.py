@@ -0,0 +1,254 @@
+from array import array
+from contextlib import ExitStack
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+import os
+
+from csr import CSRGraph, InvalidNodeError
+from graph import Graph
+
+
+class SharedCSRGraph:
+    """ Copy of the offsets and targets of a CSR graph in shared memory.
+
+        Other processes attach to the blocks by name, so the graph is
+        copied once instead of being pickled for every task. The process
+        that creates the object must call close() to free the memory.
+    """
+    def __init__(self, csr: CSRGraph):
+        self._num_nodes = csr.num_nodes
+        self._num_edges = csr.num_edges
+        self._num_targets = len(csr.targets)
+        with ExitStack() as cleanup:
+            self._offsets_memory = _shared_copy(csr.offsets)
+            cleanup.callback(_release, self._offsets_memory)
+            self._targets_memory = _shared_copy(csr.targets)
+            # Both blocks exist, close() releases them from now on
+            cleanup.pop_all()
+
+    @property
+    def num_nodes(self) -> int:
+        """ Returns the number of nodes in the graph. """
+        return self._num_nodes
+
+    @property
+    def num_edges(self) -> int:
+        """ Returns the number of edges in the graph. """
+        return self._num_edges
+
+    @property
+    def names(self) -> tuple[str, str, int, int]:
+        """ Returns what other processes need to attach to the graph: the
+            names of the offsets and targets blocks and their lengths.
+        """
+        return (self._offsets_memory.name, self._targets_memory.name,
+                self._num_nodes + 1, self._num_targets)
+
+    def close(self) -> None:
+        """ Releases the shared memory blocks. """
+        _release(self._offsets_memory)
+        _release(self._targets_memory)
+
+    def __enter__(self) -> "SharedCSRGraph":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __repr__(self):
+        return f"SharedCSRGraph(num_nodes={self._num_nodes}, num_edges={self._num_edges})"
+
+
+def _shared_copy(values: array) -> SharedMemory:
+    """ Returns a shared memory block with a copy of the given array. """
+    # Zero sized blocks are not allowed
+    memory = SharedMemory(create=True, size=max(len(values) * values.itemsize, 1))
+    memory.buf[:len(values) * values.itemsize] = values.tobytes()
+    return memory
+
+
+def _release(memory: SharedMemory) -> None:
+    """ Closes a shared memory block created by this process and frees it. """
+    memory.close()
+    memory.unlink()
+
+
+def _attach(name: str, typecode: str, length: int) -> tuple[SharedMemory, memoryview]:
+    """ Attaches to a shared memory block and returns it with a typed view. """
+    memory = SharedMemory(name=name)
+    itemsize = array(typecode).itemsize
+    return memory, memory.buf[:length * itemsize].cast(typecode)
+
+
+# Views of the shared graph and labels, set once in each pool process
+_worker_memory = []
+_worker_offsets = None
+_worker_targets = None
+_worker_labels = None
+
+
+def _init_worker(offsets_name: str, targets_name: str, num_offsets: int,
+                 num_targets: int, labels_name: str) -> None:
+    global _worker_offsets, _worker_targets, _worker_labels
+    offsets_memory, _worker_offsets = _attach(offsets_name, "q", num_offsets)
+    targets_memory, _worker_targets = _attach(targets_name, "i", num_targets)
+    labels_memory, _worker_labels = _attach(labels_name, "i", num_offsets - 1)
+    # The blocks must stay open while the views are used
+    _worker_memory.extend([offsets_memory, targets_memory, labels_memory])
+
+
+def _propagate_labels(shard: tuple[int, int]) -> bool:
+    """ Sets the label of every node in the shard to the smallest label
+        among itself and its neighbors. Returns true if a label changed.
+    """
+    offsets, targets, labels = _worker_offsets, _worker_targets, _worker_labels
+    changed = False
+    for node in range(shard[0], shard[1]):
+        label = labels[node]
+        for neighbor in targets[offsets[node]:offsets[node + 1]]:
+            if labels[neighbor] < label:
+                label = labels[neighbor]
+        if label < labels[node]:
+            labels[node] = label
+            changed = True
+    return changed
+
+
+def _distances_from_sources(sources: list[int]) -> list[array]:
+    """ Breadth first search over the shared graph from each source. """
+    offsets, targets = _worker_offsets, _worker_targets
+    num_nodes = len(offsets) - 1
+    results = []
+    for source in sources:
+        distances = array("i", [-1]) * num_nodes
+        distances[source] = 0
+        queue = [source]
+        for current_node in queue:
+            next_distance = distances[current_node] + 1
+            for neighbor in targets[offsets[current_node]:offsets[current_node + 1]]:
+                if distances[neighbor] == -1:
+                    distances[neighbor] = next_distance
+                    queue.append(neighbor)
+        results.append(distances)
+    return results
+
+
+def _degree_statistics(shard: tuple[int, int]) -> tuple[int, int, int, int]:
+    """ Returns the minimum, maximum and sum of the degrees in the shard
+        and the number of isolated nodes.
+    """
+    offsets = _worker_offsets
+    degrees = [offsets[node + 1] - offsets[node] for node in range(shard[0], shard[1])]
+    return min(degrees), max(degrees), sum(degrees), degrees.count(0)
+
+
+class ParallelGraphAnalytics:
+    """ Runs whole graph algorithms on a pool of processes that share a
+        single copy of the graph.
+
+        The nodes are split in shards with about the same number of edges,
+        several per process so that uneven shards are balanced. Use it as
+        a context manager, or call close() when done.
+    """
+    def __init__(self, graph: Graph | CSRGraph, processes: int | None = None,
+                 shards_per_process: int = 4):
+        csr = graph.to_csr() if isinstance(graph, Graph) else graph
+        self._num_nodes = csr.num_nodes
+        processes = processes or os.cpu_count() or 1
+        # If a later step fails, the shared memory allocated so far is freed
+        with ExitStack() as cleanup:
+            self._shared_graph = SharedCSRGraph(csr)
+            cleanup.callback(self._shared_graph.close)
+            self._labels_memory = SharedMemory(create=True,
+                                               size=max(4 * csr.num_nodes, 1))
+            cleanup.callback(_release, self._labels_memory)
+            self._labels = self._labels_memory.buf[:4 * csr.num_nodes].cast("i")
+            cleanup.callback(self._labels.release)
+            self._pool = Pool(processes, initializer=_init_worker,
+                              initargs=self._shared_graph.names
+                              + (self._labels_memory.name,))
+            cleanup.pop_all()
+        self._shards = self._make_shards(csr, processes * shards_per_process)
+
+    @staticmethod
+    def _make_shards(csr: CSRGraph, num_shards: int) -> list[tuple[int, int]]:
+        """ Splits the nodes in ranges that hold about the same number of
+            edge endpoints, counting every node as one more endpoint.
+        """
+        offsets = csr.offsets
+        total = len(csr.targets) + csr.num_nodes
+        shards = []
+        start = 0
+        for shard in range(1, num_shards + 1):
+            target = total * shard // num_shards
+            stop = start
+            while stop < csr.num_nodes and offsets[stop] + stop < target:
+                stop += 1
+            if stop > start:
+                shards.append((start, stop))
+                start = stop
+        if start < csr.num_nodes:
+            shards.append((start, csr.num_nodes))
+        return shards
+
+    def connected_components(self) -> array:
+        """ Returns the connected component of each node, labeled by the
+            smallest node in the component.
+
+            Every node starts with its own label and repeatedly takes the
+            smallest label among its neighbors. The shards are updated in
+            parallel until no label changes.
+        """
+        for node in range(self._num_nodes):
+            self._labels[node] = node
+        while any(self._pool.map(_propagate_labels, self._shards)):
+            pass
+        return array("i", self._labels)
+
+    def num_connected_components(self) -> int:
+        """ Returns the number of connected components. """
+        labels = self.connected_components()
+        return sum(1 for node, label in enumerate(labels) if node == label)
+
+    def distances_from_nodes(self, sources: list[int],
+                             chunk_size: int = 16) -> list[array]:
+        """ Returns an int32 array of distances for each of the given
+            sources, computed in parallel. Unreachable nodes are at -1.
+        """
+        for source in sources:
+            if source < 0 or source >= self._num_nodes:
+                raise InvalidNodeError(f"{source} is not a node of this graph")
+        chunks = [sources[ii:ii + chunk_size]
+                  for ii in range(0, len(sources), chunk_size)]
+        results = []
+        for chunk_result in self._pool.imap(_distances_from_sources, chunks):
+            results.extend(chunk_result)
+        return results
+
+    def degree_statistics(self) -> dict[str, float]:
+        """ Returns the minimum, maximum and mean degree and the number of
+            isolated nodes.
+        """
+        if self._num_nodes == 0:
+            return {"min": 0, "max": 0, "mean": 0.0, "isolated": 0}
+        shard_statistics = self._pool.map(_degree_statistics, self._shards)
+        return {
+            "min": min(statistics[0] for statistics in shard_statistics),
+            "max": max(statistics[1] for statistics in shard_statistics),
+            "mean": sum(statistics[2] for statistics in shard_statistics) / self._num_nodes,
+            "isolated": sum(statistics[3] for statistics in shard_statistics),
+        }
+
+    def close(self) -> None:
+        """ Stops the pool and releases the shared memory. """
+        self._pool.terminate()
+        self._pool.join()
+        self._labels.release()
+        _release(self._labels_memory)
+        self._shared_graph.close()
+
+    def __enter__(self) -> "ParallelGraphAnalytics":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from adjacency_matrix import Graph, InvalidNodeError
 
@@ -95,3 +96,150 @@ def test_invalid_node_raises_error():
     graph = Graph(3)
     with pytest.raises(InvalidNodeError):
         graph.add_edge(2, 4)
+
+
+def random_graph(num_nodes: int, num_edges: int, seed: int) -> Graph:
+    """ Returns a graph with random edges. """
+    rng = np.random.default_rng(seed)
+    graph = Graph(num_nodes)
+    for node_1, node_2 in rng.integers(0, num_nodes, size=(num_edges, 2)):
+        graph.add_edge(node_1, node_2)
+    return graph
+
+
+def test_all_pairs_distances():
+    graph = Graph(5)
+    graph.add_edge(0, 1)
+    graph.add_edge(1, 2)
+    graph.add_edge(3, 4)
+    assert graph.all_pairs_distances().tolist() == [
+        [0, 1, 2, -1, -1],
+        [1, 0, 1, -1, -1],
+        [2, 1, 0, -1, -1],
+        [-1, -1, -1, 0, 1],
+        [-1, -1, -1, 1, 0],
+    ]
+    assert Graph().all_pairs_distances().shape == (0, 0)
+    assert Graph(2).all_pairs_distances().tolist() == [[0, -1], [-1, 0]]
+
+    # More than 64 nodes so several batches of sources are needed
+    graph = random_graph(150, 160, seed=5)
+    distances = graph.all_pairs_distances()
+    neighbors = [graph.get_neighbors(node) for node in range(150)]
+    for source in (0, 63, 64, 100, 149):
+        expected = np.full(150, -1)
+        expected[source] = 0
+        frontier = [source]
+        while frontier:
+            next_frontier = []
+            for node in frontier:
+                for neighbor in neighbors[node]:
+                    if expected[neighbor] == -1:
+                        expected[neighbor] = expected[node] + 1
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        assert distances[source].tolist() == expected.tolist()
+
+
+def test_reachability_matrix():
+    graph = random_graph(130, 90, seed=2)
+    reachable = graph.reachability_matrix()
+    assert reachable.shape == (130, 130)
+    assert (reachable == (graph.all_pairs_distances() >= 0)).all()
+    assert (reachable == reachable.T).all()
+    assert reachable.diagonal().all()
+
+
+def test_repeated_edges_are_counted_once():
+    graph = Graph(3)
+    graph.add_edge(0, 1)
+    graph.add_edge(1, 0)
+    assert graph.num_edges == 1
+
+
+def test_add_edges_from_array():
+    graph = Graph(5)
+    graph.add_edge(0, 1)
+    graph.add_edges(np.array([(1, 0), (1, 2), (2, 1), (3, 4), (4, 4)]))
+    assert graph.num_edges == 4
+    assert graph.is_neighbor(2, 1)
+    assert graph.is_neighbor(4, 3)
+    assert graph.is_neighbor(4, 4)
+    assert not graph.is_neighbor(0, 2)
+
+    with pytest.raises(InvalidNodeError):
+        graph.add_edges(np.array([(0, 5)]))
+
+
+def test_degrees_and_common_neighbors():
+    graph = Graph(5)
+    graph.add_edges(np.array([(0, 1), (0, 2), (0, 3), (1, 2), (2, 3)]))
+    assert graph.degrees().tolist() == [3, 2, 3, 2, 0]
+    assert graph.common_neighbors(1, 3) == 2
+    assert graph.common_neighbors(0, 2) == 2
+    assert graph.common_neighbors(0, 4) == 0
+
+    common = graph.common_neighbors_matrix()
+    assert common[1, 3] == 2
+    assert common[0, 0] == 3
+    assert (common == common.T).all()
+
+
+def test_num_triangles():
+    assert Graph(3).num_triangles() == 0
+
+    k4 = Graph(4)
+    k4.add_edges(np.array([(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)]))
+    assert k4.num_triangles() == 4
+
+    graph = random_graph(40, 200, seed=9)
+    graph.add_edge(3, 3)
+    neighbors = [set(graph.get_neighbors(node)) - {node} for node in range(40)]
+    expected = sum(1 for a in range(40) for b in neighbors[a] if b > a
+                   for c in neighbors[a] & neighbors[b] if c > b)
+    assert graph.num_triangles() == expected
+
+
+def test_packed_graph_uses_uint64_words():
+    graph = Graph(130, packed=True)
+    assert graph.packed
+    assert not Graph(3).packed
+    assert graph.adjacency_matrix.shape == (130, 130)
+
+    graph.add_edge(0, 129)
+    graph.add_edge(129, 0)
+    graph.add_edge(64, 63)
+    assert graph.num_edges == 2
+    assert graph.is_neighbor(129, 0)
+    assert graph.is_neighbor(63, 64)
+    assert not graph.is_neighbor(0, 128)
+    assert graph.get_neighbors(0) == [129]
+    assert graph.num_neighbors(64) == 1
+    assert str(graph) == "Graph(num_nodes=130, num_edges=2)"
+
+    with pytest.raises(InvalidNodeError):
+        graph.add_edge(0, 130)
+
+
+def test_packed_graph_matches_boolean_matrix():
+    rng = np.random.default_rng(4)
+    edges = rng.integers(0, 150, size=(600, 2))
+    graph = Graph(150)
+    packed = Graph(150, packed=True)
+    graph.add_edges(edges[:300])
+    packed.add_edges(edges[:300])
+    for node_1, node_2 in edges[300:]:
+        graph.add_edge(node_1, node_2)
+        packed.add_edge(node_1, node_2)
+
+    assert packed.num_edges == graph.num_edges
+    assert (packed.adjacency_matrix == graph.adjacency_matrix).all()
+    assert (packed.degrees() == graph.degrees()).all()
+    for node in (0, 63, 64, 149):
+        assert packed.get_neighbors(node) == graph.get_neighbors(node)
+        assert packed.num_neighbors(node) == graph.num_neighbors(node)
+        assert packed.common_neighbors(node, 7) == graph.common_neighbors(node, 7)
+    assert (packed.common_neighbors_matrix() == graph.common_neighbors_matrix()).all()
+    assert packed.num_triangles() == graph.num_triangles()
+    assert (packed.all_pairs_distances() == graph.all_pairs_distances()).all()
+    assert (packed.reachability_matrix() == graph.reachability_matrix()).all()
@@ -0,0 +1,170 @@
+from array import array
+import mmap
+
+from graph import Graph
+from csr import CSRGraph, InvalidNodeError, InvalidGraphFileError
+from graph_file import FLAG_DIRECTED, write_graph_file
+from weighted_graph import WeightedGraph
+import pytest
+
+
+@pytest.fixture
+def graph_with_three_connected_components() -> Graph:
+    """ Returns a graph with 8 nodes and three connected components
+    """
+    graph = Graph(8)
+    graph.add_edges([
+        (0, 1), (0, 2), (1, 2), (3, 4), (5, 6), (6, 7)
+    ])
+    return graph
+
+
+def test_compile_graph_to_csr(graph_with_three_connected_components):
+    csr = graph_with_three_connected_components.to_csr()
+    assert isinstance(csr, CSRGraph)
+    assert csr.num_nodes == 8
+    assert csr.num_edges == 6
+    assert len(csr) == 8
+    assert list(csr.offsets) == [0, 2, 4, 6, 7, 8, 9, 11, 12]
+    assert list(csr.neighbors(6)) == [5, 7]
+    assert csr.degree(0) == 2
+    assert str(csr) == "CSRGraph(num_nodes=8, num_edges=6)"
+
+
+def test_csr_empty_graph():
+    csr = Graph().to_csr()
+    assert csr.num_nodes == 0
+    assert csr.num_edges == 0
+    assert csr.num_connected_components() == 0
+    assert csr.is_bipartite()
+
+
+def test_csr_self_loop_counts_as_one_edge():
+    graph = Graph(2)
+    graph.add_edge(0, 0)
+    graph.add_edge(0, 1)
+    assert graph.to_csr().num_edges == graph.num_edges == 2
+
+
+def test_csr_is_neighbor(graph_with_three_connected_components):
+    csr = graph_with_three_connected_components.to_csr()
+    assert csr.is_neighbor(0, 2)
+    assert csr.is_neighbor(2, 0)
+    assert csr.is_neighbor(7, 6)
+    assert not csr.is_neighbor(0, 3)
+    assert not csr.is_neighbor(7, 5)
+
+    with pytest.raises(InvalidNodeError):
+        csr.is_neighbor(0, 8)
+
+
+def test_csr_is_detached_from_graph():
+    graph = Graph(3)
+    graph.add_edge(0, 1)
+    csr = graph.to_csr()
+    graph.add_edge(1, 2)
+    assert csr.num_edges == 1
+    assert not csr.is_neighbor(1, 2)
+
+
+def test_csr_connected_components(graph_with_three_connected_components):
+    csr = graph_with_three_connected_components.to_csr()
+    assert list(csr.connected_components()) == [0, 0, 0, 1, 1, 2, 2, 2]
+    assert csr.num_connected_components() == 3
+    assert Graph(20).to_csr().num_connected_components() == 20
+
+
+def test_csr_distances_from_node():
+    graph = Graph(5)
+    graph.add_edges([
+        (0, 2), (0, 3), (1, 4), (2, 3)
+    ])
+    csr = graph.to_csr()
+    assert csr.distances_from_node(0) == graph.distances_from_node(0)
+    assert csr.shortest_path(0, 3) == 1
+    assert csr.shortest_path(0, 4) == -1
+    assert csr.shortest_path(4, 1) == 1
+
+
+def test_csr_is_bipartite():
+    graph_1 = Graph(4)
+    graph_1.add_edges([
+        (0, 1), (0, 2), (0, 3), (1, 2),
+    ])
+    assert not graph_1.to_csr().is_bipartite()
+
+    graph_2 = Graph(8)
+    graph_2.add_edges([
+        (0, 1), (1, 2), (2, 3),
+        (4, 5), (5, 6), (6, 7),
+        (7, 4),
+    ])
+    assert graph_2.to_csr().is_bipartite()
+
+
+def test_save_and_open_csr_graph(tmp_path, graph_with_three_connected_components):
+    graph = graph_with_three_connected_components
+    path = tmp_path / "graph.bin"
+    graph.save(path)
+
+    mapped = CSRGraph.open(path)
+    assert mapped.num_nodes == 8
+    assert mapped.num_edges == 6
+    assert mapped.weights is None
+    assert list(mapped.offsets) == list(graph.to_csr().offsets)
+    assert list(mapped.neighbors(6)) == [5, 7]
+    assert mapped.is_neighbor(4, 3)
+    assert mapped.num_connected_components() == 3
+    assert mapped.distances_from_node(5) == graph.distances_from_node(5)
+    assert mapped.is_bipartite() == graph.is_bipartite()
+
+
+def test_save_and_open_weighted_graph(tmp_path):
+    graph = WeightedGraph(3)
+    graph.add_edges([(0, 2, 1.5), (0, 1, 4.0), (1, 2, 0.5)])
+    csr = graph.to_csr()
+    assert list(csr.neighbors(0)) == [1, 2]
+    assert list(csr.weights) == [4.0, 1.5, 4.0, 0.5, 1.5, 0.5]
+
+    path = tmp_path / "weighted.bin"
+    graph.save(path)
+    mapped = CSRGraph.open(path)
+    assert list(mapped.weights) == list(csr.weights)
+    assert list(mapped.targets) == list(csr.targets)
+
+
+def test_open_invalid_graph_file(tmp_path):
+    path = tmp_path / "graph.bin"
+    path.write_bytes(b"")
+    with pytest.raises(InvalidGraphFileError):
+        CSRGraph.open(path)
+
+    path.write_bytes(b"CSRG")
+    with pytest.raises(InvalidGraphFileError):
+        CSRGraph.open(path)
+
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(InvalidGraphFileError):
+        CSRGraph.open(path)
+
+
+def test_invalid_graph_file_is_unmapped(tmp_path, monkeypatch):
+    mappings = []
+    open_mapping = mmap.mmap
+
+    def recording_mmap(*args, **kwargs):
+        mappings.append(open_mapping(*args, **kwargs))
+        return mappings[-1]
+
+    monkeypatch.setattr(mmap, "mmap", recording_mmap)
+    path = tmp_path / "graph.bin"
+    Graph(3).save(path)
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(InvalidGraphFileError):
+        CSRGraph.open(path)
+
+    write_graph_file(path, FLAG_DIRECTED, 0, 0, [array("q", [0]), array("i")])
+    with pytest.raises(InvalidGraphFileError):
+        CSRGraph.open(path)
+    assert len(mappings) == 2
+    assert all(mapping.closed for mapping in mappings)
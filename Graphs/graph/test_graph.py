@@ -1,5 +1,7 @@
 from graph import Graph, InvalidNodeError
+import numpy as np
 import pytest
+import random
 
 
 def test_graph_empty_constructor():
@@ -59,6 +61,18 @@ def test_is_neighbor():
     assert not g.is_neighbor(2, 0)
 
 
+def test_hub_node_keeps_neighbors_in_insertion_order():
+    g = Graph(1000)
+    g.add_edges_to_node(0, list(range(999, 0, -1)))
+    g.add_edges_to_node(0, list(range(1, 1000)))
+
+    assert g.num_edges == 999
+    assert g.neighbors(0) == list(range(999, 0, -1))
+    assert g.is_neighbor(0, 500)
+    assert g.is_neighbor(500, 0)
+    assert not g.is_neighbor(1, 2)
+
+
 def test_invalid_node_raises_error():
     g = Graph(3)
 
@@ -110,6 +124,43 @@ def test_add_edges_to_node():
     assert graph.is_neighbor(0, 4)
 
 
+def test_graph_from_edge_array():
+    graph = Graph()
+    graph.from_edge_array(5, np.array([
+        (3, 0), (0, 1), (1, 0), (2, 4), (0, 3), (4, 2), (0, 1)
+    ]))
+    assert graph.num_nodes == 5
+    assert graph.num_edges == 3
+    assert graph.adjacency_list == [[1, 3], [0], [4], [0], [2]]
+    assert graph.is_neighbor(4, 2)
+    assert not graph.is_neighbor(1, 3)
+
+    # The bulk loader matches adding the edges one by one
+    edges = [(0, 0), (0, 1), (1, 2)]
+    graph.from_edge_array(3, np.array(edges))
+    expected = Graph(3)
+    expected.add_edges(edges)
+    assert graph.num_edges == expected.num_edges
+    assert graph.adjacency_list == expected.adjacency_list
+
+    graph.from_edge_array(4, np.empty((0, 2), dtype=np.int32))
+    assert graph.num_nodes == 4
+    assert graph.num_edges == 0
+
+    with pytest.raises(InvalidNodeError):
+        graph.from_edge_array(3, np.array([(0, 1), (1, 3)]))
+
+
+def test_graph_from_edge_file(tmp_path):
+    path = tmp_path / "edges.bin"
+    np.array([(0, 1), (1, 2), (2, 1)], dtype=np.int32).tofile(path)
+
+    graph = Graph()
+    graph.from_edge_file(3, path)
+    assert graph.num_edges == 2
+    assert graph.adjacency_list == [[1], [0, 2], [1]]
+
+
 def test_get_neighbors():
     g = Graph(5)
     g.add_edge(0, 1)
@@ -197,6 +248,15 @@ def test_number_of_connected_components(c4_graph,
     assert graph_with_three_connected_components.num_connected_components() == 3
 
 
+def test_long_path_graph_does_not_overflow_the_stack():
+    num_nodes = 100_000
+    graph = Graph(num_nodes)
+    graph.add_edges([(node, node + 1) for node in range(num_nodes - 1)])
+
+    assert graph.path_between(0, num_nodes - 1)
+    assert graph.num_connected_components() == 1
+
+
 def test_graph_repr(c4_graph):
     assert str(c4_graph) == "Graph(num_nodes=4, num_edges=4)"
 
@@ -241,6 +301,68 @@ def test_distances_from_node_and_shortest_path():
     assert graph_3.shortest_path(0, 6) == 2
 
 
+def test_shortest_path_modes_agree_with_distances():
+    rng = random.Random(11)
+    graph = Graph(60)
+    graph.add_edges([(rng.randrange(60), rng.randrange(60)) for _ in range(70)])
+
+    for start_node in range(0, 60, 7):
+        distances = graph.distances_from_node(start_node)
+        for end_node in range(60):
+            expected = distances[end_node]
+            if expected == float("inf"):
+                expected = -1
+            assert graph.shortest_path(start_node, end_node) == expected
+            assert graph.shortest_path(start_node, end_node,
+                                       bidirectional=True) == expected
+
+
+def test_bidirectional_shortest_path():
+    graph = Graph(6)
+    graph.add_edges([(0, 1), (1, 2), (2, 3), (3, 4), (0, 4)])
+    assert graph.shortest_path(0, 3, bidirectional=True) == 2
+    assert graph.shortest_path(1, 3, bidirectional=True) == 2
+    assert graph.shortest_path(2, 2, bidirectional=True) == 0
+    assert graph.shortest_path(5, 0, bidirectional=True) == -1
+
+    with pytest.raises(InvalidNodeError):
+        graph.shortest_path(0, 6, bidirectional=True)
+
+
+def test_distances_from_many_sources(graph_with_three_connected_components):
+    graph = graph_with_three_connected_components
+    sources = [0, 4, 7, 0]
+    expected = [
+        [-1 if distance == float("inf") else distance
+         for distance in graph.distances_from_node(source)]
+        for source in sources
+    ]
+    assert [list(distances) for distances in
+            graph.distances_from_nodes(sources)] == expected
+    assert [list(distances) for distances in
+            graph.distances_from_nodes(sources, processes=2, chunk_size=1)] == expected
+
+    # The distance buffer is shared between iterations
+    buffers = [distances for _, distances in graph.iter_distances(sources)]
+    assert all(buffer is buffers[0] for buffer in buffers)
+
+    with pytest.raises(InvalidNodeError):
+        graph.distances_from_nodes([0, 8])
+
+
+def test_nearest_source():
+    graph = Graph(8)
+    graph.add_edges([(0, 1), (1, 2), (2, 3), (3, 4), (5, 6)])
+    distances, nearest = graph.nearest_source([0, 4, 0])
+    assert list(distances) == [0, 1, 2, 1, 0, -1, -1, -1]
+    assert list(nearest)[:2] == [0, 0]
+    assert list(nearest)[3:] == [4, 4, -1, -1, -1]
+    assert nearest[2] in (0, 4)
+
+    distances, nearest = graph.nearest_source([])
+    assert list(distances) == [-1] * 8
+
+
 def test_is_graph_bipartite():
 
     empty_graph = Graph()
@@ -281,3 +403,54 @@ def test_is_graph_bipartite():
         (7, 4),
     ])
     assert multi_component_graph_2.is_bipartite()
+
+
+def test_tracked_components_match_search():
+    rng = random.Random(11)
+    tracked = Graph(40, track_components=True)
+    graph = Graph(40)
+    for _ in range(30):
+        node_1, node_2 = rng.randrange(40), rng.randrange(40)
+        tracked.add_edge(node_1, node_2)
+        graph.add_edge(node_1, node_2)
+        assert tracked.num_connected_components() == graph.num_connected_components()
+        node_1, node_2 = rng.randrange(40), rng.randrange(40)
+        assert tracked.path_between(node_1, node_2) == graph.path_between(node_1, node_2)
+
+    tracked.add_node()
+    assert tracked.num_connected_components() == graph.num_connected_components() + 1
+    assert not tracked.path_between(0, 40)
+    tracked.add_edge(0, 40)
+    assert tracked.path_between(40, 0)
+
+
+def test_tracked_components_from_edge_array():
+    graph = Graph(track_components=True)
+    graph.from_edge_array(6, np.array([(0, 1), (2, 1), (3, 4)]))
+    assert graph.num_connected_components() == 3
+    assert graph.path_between(0, 2)
+    assert not graph.path_between(0, 5)
+
+
+def test_two_coloring():
+    graph = Graph(6)
+    graph.add_edges([(0, 1), (1, 2), (2, 3), (4, 5)])
+    sides = graph.two_coloring()
+    assert list(sides) == [0, 1, 0, 1, 0, 1]
+    assert all(sides[node_1] != sides[node_2]
+               for node_1 in range(6) for node_2 in graph.neighbors(node_1))
+
+    # Later calls see the nodes and edges added since the last one
+    graph.add_node()
+    graph.add_edges([(6, 0), (6, 1)])
+    assert graph.two_coloring() is None
+    assert not graph.is_bipartite()
+    assert Graph(3).two_coloring() == bytearray(3)
+    assert Graph().two_coloring() == bytearray()
+
+    rng = random.Random(5)
+    for _ in range(20):
+        graph = Graph(12)
+        graph.add_edges([(rng.randrange(12), rng.randrange(12)) for _ in range(8)])
+        sides = graph.two_coloring()
+        assert (sides is not None) == graph.is_bipartite() == graph.to_csr().is_bipartite()
@@ -0,0 +1,77 @@
+from graph import Graph
+from graph_views import SubGraph, ReadOnlyGraphError
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def grid() -> Graph:
+    """ Returns a 3 x 3 grid graph. """
+    graph = Graph(9)
+    graph.add_edges([
+        (0, 1), (1, 2), (3, 4), (4, 5), (6, 7), (7, 8),
+        (0, 3), (3, 6), (1, 4), (4, 7), (2, 5), (5, 8),
+    ])
+    return graph
+
+
+def test_induced_subgraph(grid):
+    # Removing the middle column splits the grid in two
+    view = SubGraph(grid, node_mask=[True, False, True] * 3)
+    assert view.num_nodes == 9
+    assert view.num_edges == 4
+    assert view.neighbors(3) == [0, 6]
+    assert not view.is_neighbor(3, 4)
+    assert view.is_neighbor(5, 2)
+    assert view.num_connected_components() == 5
+    assert not view.path_between(0, 2)
+    assert view.distances_from_node(0)[:4] == [0, float("inf"), float("inf"), 1]
+    assert view.to_csr().num_edges == 4
+    assert str(view) == "SubGraph(num_nodes=9, num_edges=4)"
+
+    with pytest.raises(ValueError):
+        SubGraph(grid, node_mask=[True])
+
+
+def test_edge_filtered_subgraph(grid):
+    # Keep the vertical edges and the horizontal edges of the top row
+    view = SubGraph(grid, edge_filter=lambda node_1, node_2:
+                    abs(node_1 - node_2) == 3 or max(node_1, node_2) < 3)
+    assert view.num_edges == 8
+    assert view.num_connected_components() == 1
+    assert view.shortest_path(6, 8) == 6
+    assert view.is_bipartite()
+    assert list(view.two_coloring()) == [0, 1, 0, 1, 0, 1, 0, 1, 0]
+
+    # The view follows the graph
+    grid.add_edge(6, 8)
+    assert view.shortest_path(6, 8) == 6
+    grid.add_edge(0, 2)
+    assert view.is_neighbor(2, 0)
+    assert not view.is_bipartite()
+
+
+def test_subgraph_is_read_only(grid):
+    view = SubGraph(grid)
+    assert view.num_edges == grid.num_edges
+    with pytest.raises(ReadOnlyGraphError):
+        view.add_edge(0, 8)
+    with pytest.raises(ReadOnlyGraphError):
+        view.add_edges([(0, 8)])
+    with pytest.raises(ReadOnlyGraphError):
+        view.add_node()
+
+
+def test_subgraph_follows_a_rebuilt_graph(grid):
+    view = SubGraph(grid, edge_filter=lambda node_1, node_2: node_1 + node_2 != 5)
+    grid.from_edge_array(4, np.array([(0, 1), (1, 2), (2, 3)]))
+    assert view.num_nodes == 4
+    # The filter drops the edge (2, 3)
+    assert view.num_edges == 2
+    assert view.neighbors(1) == [0, 2]
+    assert view.num_connected_components() == 2
+
+    masked = SubGraph(grid, node_mask=[True, True, False, True])
+    grid.from_edge_array(5, np.array([(0, 1), (3, 4)]))
+    assert masked.num_edges == 1
+    assert masked.num_connected_components() == 4
@@ -0,0 +1,68 @@
+from mst import kruskal, k_clustering
+from csr import InvalidNodeError
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def edges_and_weights() -> tuple[np.ndarray, np.ndarray]:
+    """ Returns the edges of a graph with 7 nodes and their weights. """
+    edges = np.array([
+        (0, 1), (0, 3), (1, 2), (1, 3), (1, 4), (2, 4),
+        (3, 4), (3, 5), (4, 5), (4, 6), (5, 6),
+    ])
+    weights = np.array([7, 5, 8, 9, 7, 5, 15, 6, 8, 9, 11])
+    return edges, weights
+
+
+def test_kruskal(edges_and_weights):
+    edges, weights = edges_and_weights
+    selected = kruskal(7, edges, weights)
+    assert selected.tolist() == [1, 5, 7, 0, 4, 9]
+    assert weights[selected].sum() == 39
+
+    # Stopping early leaves a forest
+    assert kruskal(7, edges, weights, num_trees=3).tolist() == [1, 5, 7, 0]
+    # A disconnected graph gives a spanning forest
+    assert kruskal(9, edges, weights).tolist() == [1, 5, 7, 0, 4, 9]
+    assert len(kruskal(3, np.empty((0, 2)), np.empty(0))) == 0
+
+
+def test_kruskal_invalid_input(edges_and_weights):
+    edges, weights = edges_and_weights
+    with pytest.raises(InvalidNodeError):
+        kruskal(6, edges, weights)
+    with pytest.raises(ValueError):
+        kruskal(7, edges, weights[:-1])
+    with pytest.raises(ValueError):
+        kruskal(7, edges, weights, num_trees=0)
+
+
+def test_k_clustering(edges_and_weights):
+    edges, weights = edges_and_weights
+    labels, spacing = k_clustering(7, edges, weights, 2)
+    assert labels.tolist() == [0, 0, 0, 0, 0, 0, 1]
+    assert spacing == 9
+
+    labels, spacing = k_clustering(7, edges, weights, 7)
+    assert labels.tolist() == list(range(7))
+    assert spacing == 5
+
+    labels, spacing = k_clustering(4, np.array([(0, 1)]), np.array([1.0]), 2)
+    assert labels.tolist() == [0, 0, 1, 2]
+    assert spacing == float("inf")
+
+    with pytest.raises(ValueError):
+        k_clustering(3, edges[:1], weights[:1], 4)
+
+
+def test_k_clustering_separates_point_clouds():
+    rng = np.random.default_rng(0)
+    centers = np.array([(0, 0), (10, 0), (0, 10)])
+    points = np.concatenate([center + rng.normal(size=(30, 2)) for center in centers])
+    edges = np.array([(ii, jj) for ii in range(90) for jj in range(ii + 1, 90)])
+    weights = np.linalg.norm(points[edges[:, 0]] - points[edges[:, 1]], axis=1)
+
+    labels, spacing = k_clustering(90, edges, weights, 3)
+    assert labels.tolist() == [0] * 30 + [1] * 30 + [2] * 30
+    assert spacing > 5
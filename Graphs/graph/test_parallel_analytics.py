@@ -0,0 +1,88 @@
+from multiprocessing.shared_memory import SharedMemory
+from parallel_analytics import ParallelGraphAnalytics, SharedCSRGraph
+import parallel_analytics
+from csr import InvalidNodeError
+from graph import Graph
+import random
+import pytest
+
+
+@pytest.fixture
+def random_graph() -> Graph:
+    """ Returns a sparse random graph with several connected components. """
+    rng = random.Random(21)
+    graph = Graph(300)
+    graph.add_edges([(rng.randrange(300), rng.randrange(300)) for _ in range(220)])
+    return graph
+
+
+def test_shared_csr_graph(random_graph):
+    with SharedCSRGraph(random_graph.to_csr()) as shared_graph:
+        assert shared_graph.num_nodes == 300
+        assert shared_graph.num_edges == random_graph.num_edges
+        offsets_name, targets_name, num_offsets, num_targets = shared_graph.names
+        assert offsets_name != targets_name
+        assert num_offsets == 301
+        assert num_targets == len(random_graph.to_csr().targets)
+
+
+def test_parallel_connected_components(random_graph):
+    expected = random_graph.to_csr().connected_components()
+    with ParallelGraphAnalytics(random_graph, processes=2) as analytics:
+        labels = analytics.connected_components()
+        assert analytics.num_connected_components() == random_graph.num_connected_components()
+
+    # Nodes share a label exactly when they are in the same component
+    for node in range(300):
+        assert labels[node] == min(other for other in range(300)
+                                   if expected[other] == expected[node])
+
+
+def test_parallel_distances_and_degrees(random_graph):
+    sources = [0, 17, 150, 299, 17]
+    expected = [
+        [-1 if distance == float("inf") else distance
+         for distance in random_graph.distances_from_node(source)]
+        for source in sources
+    ]
+    degrees = [len(neighbors) for neighbors in random_graph.adjacency_list]
+    with ParallelGraphAnalytics(random_graph.to_csr(), processes=2) as analytics:
+        distances = analytics.distances_from_nodes(sources, chunk_size=2)
+        assert [list(row) for row in distances] == expected
+        assert analytics.degree_statistics() == {
+            "min": min(degrees),
+            "max": max(degrees),
+            "mean": sum(degrees) / 300,
+            "isolated": degrees.count(0),
+        }
+        with pytest.raises(InvalidNodeError):
+            analytics.distances_from_nodes([300])
+
+
+def test_parallel_analytics_empty_graph():
+    with ParallelGraphAnalytics(Graph(), processes=1) as analytics:
+        assert list(analytics.connected_components()) == []
+        assert analytics.num_connected_components() == 0
+        assert analytics.degree_statistics()["isolated"] == 0
+
+
+def test_failed_setup_frees_shared_memory(random_graph, monkeypatch):
+    created = []
+
+    class RecordedSharedMemory(SharedMemory):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created.append(self.name)
+
+    def failing_pool(*args, **kwargs):
+        raise OSError("Cannot start processes")
+
+    monkeypatch.setattr(parallel_analytics, "SharedMemory", RecordedSharedMemory)
+    monkeypatch.setattr(parallel_analytics, "Pool", failing_pool)
+    with pytest.raises(OSError):
+        ParallelGraphAnalytics(random_graph, processes=2)
+
+    assert len(created) == 3
+    for name in created:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
@@ -0,0 +1,145 @@
+from weighted_graph import WeightedGraph, NegativeWeightError, MissingEdgeError
+from graph import InvalidNodeError
+import numpy as np
+import pytest
+import random
+
+
+@pytest.fixture
+def weighted_graph() -> WeightedGraph:
+    """ Returns a weighted graph with 6 nodes. Node 5 is isolated. """
+    graph = WeightedGraph(6)
+    graph.add_edges([
+        (0, 1, 7), (0, 2, 9), (0, 3, 14), (1, 2, 10),
+        (2, 3, 2), (3, 4, 9), (2, 4, 11),
+    ])
+    return graph
+
+
+def grid_graph(size: int, seed: int) -> WeightedGraph:
+    """ Returns a size x size grid with random weights between 1 and 2. """
+    rng = random.Random(seed)
+    graph = WeightedGraph(size * size)
+    for row in range(size):
+        for col in range(size):
+            node = row * size + col
+            if col + 1 < size:
+                graph.add_edge(node, node + 1, 1 + rng.random())
+            if row + 1 < size:
+                graph.add_edge(node, node + size, 1 + rng.random())
+    return graph
+
+
+def test_add_weighted_edges(weighted_graph):
+    assert weighted_graph.num_edges == 7
+    assert weighted_graph.weight(0, 3) == 14
+    assert weighted_graph.weight(3, 0) == 14
+    assert list(weighted_graph.weights[2]) == [9, 10, 2, 11]
+    assert str(weighted_graph) == "WeightedGraph(num_nodes=6, num_edges=7)"
+
+    # Repeated edges keep their first weight
+    weighted_graph.add_edge(0, 3, 1)
+    assert weighted_graph.num_edges == 7
+    assert weighted_graph.weight(0, 3) == 14
+
+    weighted_graph.add_node()
+    weighted_graph.add_edge(6, 5)
+    assert weighted_graph.weight(5, 6) == 1
+
+    with pytest.raises(NegativeWeightError):
+        weighted_graph.add_edge(4, 5, -1)
+    with pytest.raises(MissingEdgeError):
+        weighted_graph.weight(0, 4)
+    with pytest.raises(InvalidNodeError):
+        weighted_graph.weight(0, 7)
+
+
+def test_weighted_graph_from_edge_array():
+    graph = WeightedGraph()
+    graph.from_edge_array(4, np.array([(2, 0), (1, 0), (0, 2), (3, 1)]),
+                          np.array([5.0, 1.0, 8.0, 2.5]))
+    assert graph.num_edges == 3
+    assert graph.adjacency_list == [[1, 2], [0, 3], [0], [1]]
+    assert [list(weights) for weights in graph.weights] == [
+        [1.0, 5.0], [1.0, 2.5], [5.0], [2.5]
+    ]
+    assert graph.dijkstra(3) == [3.5, 2.5, 8.5, 0]
+    assert graph.weight(2, 0) == 5.0
+
+    with pytest.raises(ValueError):
+        graph.from_edge_array(4, np.array([(0, 1), (1, 2)]), np.array([1.0]))
+
+
+def test_dijkstra(weighted_graph):
+    inf = float("inf")
+    assert weighted_graph.dijkstra(0) == [0, 7, 9, 11, 20, inf]
+    assert weighted_graph.dijkstra(4) == [20, 21, 11, 9, 0, inf]
+    assert weighted_graph.dijkstra(5) == [inf, inf, inf, inf, inf, 0]
+
+
+def test_astar(weighted_graph):
+    no_heuristic = lambda node: 0
+    assert weighted_graph.astar(0, 4, no_heuristic) == (20, [0, 2, 4])
+    assert weighted_graph.astar(1, 3, no_heuristic) == (12, [1, 2, 3])
+    assert weighted_graph.astar(2, 2, no_heuristic) == (0, [2])
+    assert weighted_graph.astar(0, 5, no_heuristic) == (float("inf"), [])
+
+    size = 15
+    grid = grid_graph(size, seed=3)
+    target = size * size - 1
+
+    def manhattan(node: int) -> float:
+        return abs(node // size - target // size) + abs(node % size - target % size)
+
+    distance, path = grid.astar(0, target, manhattan)
+    assert distance == pytest.approx(grid.dijkstra(0)[target])
+    assert path[0] == 0 and path[-1] == target
+    assert sum(grid.weight(node_1, node_2)
+               for node_1, node_2 in zip(path, path[1:])) == pytest.approx(distance)
+
+
+def test_bidirectional_dijkstra(weighted_graph):
+    assert weighted_graph.bidirectional_dijkstra(0, 4) == (20, [0, 2, 4])
+    assert weighted_graph.bidirectional_dijkstra(4, 1) == (21, [4, 2, 1])
+    assert weighted_graph.bidirectional_dijkstra(3, 3) == (0, [3])
+    assert weighted_graph.bidirectional_dijkstra(5, 0) == (float("inf"), [])
+
+    grid = grid_graph(12, seed=7)
+    for source, target in [(0, 143), (5, 130), (77, 12), (64, 65)]:
+        distance, path = grid.bidirectional_dijkstra(source, target)
+        assert distance == pytest.approx(grid.dijkstra(source)[target])
+        assert path[0] == source and path[-1] == target
+        assert sum(grid.weight(node_1, node_2)
+                   for node_1, node_2 in zip(path, path[1:])) == pytest.approx(distance)
+
+
+def test_to_edge_array(weighted_graph):
+    weighted_graph.add_edge(5, 5, 3)
+    edges, weights = weighted_graph.to_edge_array()
+    assert edges.tolist() == [
+        [0, 1], [0, 2], [0, 3], [1, 2], [2, 3], [2, 4], [3, 4], [5, 5]
+    ]
+    assert weights.tolist() == [7, 9, 14, 10, 2, 11, 9, 3]
+
+
+def test_minimum_spanning_tree(weighted_graph):
+    edges, weights = weighted_graph.minimum_spanning_tree()
+    assert edges.tolist() == [[2, 3], [0, 1], [0, 2], [3, 4]]
+    assert weights.sum() == 27
+
+    edges, weights = weighted_graph.prim()
+    assert edges.tolist() == [[0, 1], [0, 2], [2, 3], [3, 4]]
+    assert weights.tolist() == [7, 9, 2, 9]
+
+    for seed in range(5):
+        grid = grid_graph(8, seed)
+        kruskal_edges, kruskal_weights = grid.minimum_spanning_tree()
+        prim_edges, prim_weights = grid.prim()
+        assert len(kruskal_edges) == len(prim_edges) == 63
+        assert kruskal_weights.sum() == pytest.approx(prim_weights.sum())
+
+
+def test_k_clustering(weighted_graph):
+    labels, spacing = weighted_graph.k_clustering(3)
+    assert labels.tolist() == [0, 0, 0, 0, 1, 2]
+    assert spacing == 9
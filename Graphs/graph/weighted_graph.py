@@ -0,0 +1,290 @@
+from array import array
+from collections.abc import Callable
+import heapq
+
+import numpy as np
+
+from csr import CSRGraph
+from graph import Graph, _unique_edges
+import mst
+
+
+class NegativeWeightError(ValueError):
+    pass
+
+
+class MissingEdgeError(ValueError):
+    pass
+
+
+class WeightedGraph(Graph):
+    """ Undirected graph with a weight on each edge.
+
+        The weights of the edges of each node are stored in an array of
+        doubles parallel to its adjacency list, so the weight of the edge
+        to adjacency_list[node][ii] is weights[node][ii]. The neighbor sets
+        of the graph are dicts from each neighbor to the weight of its
+        edge, so looking up a weight takes constant time.
+    """
+    def __init__(self, num_nodes: int = 0, track_components: bool = False):
+        super().__init__(num_nodes, track_components)
+        self._neighbor_sets = [{} for _ in range(num_nodes)]
+        self._weights = [array("d") for _ in range(num_nodes)]
+
+    @property
+    def weights(self) -> list[array]:
+        """ Returns the weights of the edges, parallel to the adjacency list. """
+        return self._weights
+
+    def add_edge(self, node_1: int, node_2: int, weight: float = 1.0) -> None:
+        """ Add an edge with the given weight between the given nodes. """
+        if weight < 0:
+            raise NegativeWeightError(f"{weight} is not a valid edge weight")
+        if not self.is_neighbor(node_1, node_2):
+            self._adjacency_list[node_1].append(node_2)
+            self._adjacency_list[node_2].append(node_1)
+            self._neighbor_sets[node_1][node_2] = weight
+            self._neighbor_sets[node_2][node_1] = weight
+            self._weights[node_1].append(weight)
+            self._weights[node_2].append(weight)
+            self._num_edges += 1
+            if self._components is not None:
+                self._components.union(node_1, node_2)
+
+    def add_edges(self, edge_list: list[tuple]) -> None:
+        """ Add multiple edges to the graph. Each edge is a tuple
+            (node_1, node_2) or (node_1, node_2, weight).
+        """
+        for edge in edge_list:
+            self.add_edge(*edge)
+
+    def add_node(self) -> None:
+        """ Adds a node to the graph. """
+        super().add_node()
+        self._neighbor_sets[-1] = {}
+        self._weights.append(array("d"))
+
+    def from_edge_array(self, num_nodes: int, edges: np.ndarray,
+                        weights: np.ndarray | None = None) -> None:
+        """ Replaces the graph with one built from an (E, 2) array of edges
+            and an array with their E weights. Every weight defaults to one.
+            If an edge is repeated the weight of its first occurrence is kept.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if weights is None:
+            weights = np.ones(len(edges))
+        weights = np.asarray(weights, dtype=np.float64).ravel()
+        if len(weights) != len(edges):
+            raise ValueError(f"Got {len(weights)} weights for {len(edges)} edges")
+        if len(weights) > 0 and weights.min() < 0:
+            raise NegativeWeightError(f"{weights.min()} is not a valid edge weight")
+
+        edges, first = _unique_edges(np.sort(edges, axis=1), num_nodes,
+                                     return_index=True)
+        super().from_edge_array(num_nodes, edges)
+
+        # Repeat the grouping done by the base class to line up the weights
+        sources = np.concatenate((edges[:, 0], edges[:, 1]))
+        targets = np.concatenate((edges[:, 1], edges[:, 0]))
+        order = np.argsort(sources * max(num_nodes, 1) + targets)
+        sorted_weights = np.concatenate((weights[first], weights[first]))[order]
+        # Slicing one array is much faster than converting every row
+        all_weights = array("d", sorted_weights.tobytes())
+        bounds = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=bounds[1:])
+        bounds = bounds.tolist()
+        self._weights = [all_weights[bounds[node]:bounds[node + 1]]
+                         for node in range(num_nodes)]
+        self._neighbor_sets = [dict(zip(neighbors, weights)) for neighbors, weights
+                               in zip(self._adjacency_list, self._weights)]
+
+    def to_csr(self) -> CSRGraph:
+        """ Compiles the graph into a frozen compressed sparse row graph
+            that keeps the weights of the edges.
+        """
+        return CSRGraph.from_adjacency_list(self._adjacency_list, self._weights)
+
+    def to_edge_array(self) -> tuple[np.ndarray, np.ndarray]:
+        """ Returns an (E, 2) array with every edge once, smallest node
+            first, and an array with the weights of the edges.
+        """
+        sources = np.repeat(np.arange(self._num_nodes, dtype=np.int64),
+                            [len(neighbors) for neighbors in self._adjacency_list])
+        targets = np.fromiter((neighbor for neighbors in self._adjacency_list
+                               for neighbor in neighbors),
+                              dtype=np.int64, count=len(sources))
+        weights = np.concatenate([np.frombuffer(weights, dtype=np.float64)
+                                  for weights in self._weights] or [np.empty(0)])
+        # A self loop shows up twice in its adjacency list, keep one copy
+        keep = sources < targets
+        self_loops = np.flatnonzero(sources == targets)[::2]
+        keep[self_loops] = True
+        return np.column_stack((sources[keep], targets[keep])), weights[keep]
+
+    def minimum_spanning_tree(self) -> tuple[np.ndarray, np.ndarray]:
+        """ Returns the edges of a minimum spanning forest of the graph,
+            found with Kruskal's algorithm, and their weights.
+        """
+        edges, weights = self.to_edge_array()
+        selected = mst.kruskal(self._num_nodes, edges, weights)
+        return edges[selected], weights[selected]
+
+    def prim(self) -> tuple[np.ndarray, np.ndarray]:
+        """ Returns the edges of a minimum spanning forest of the graph,
+            found with Prim's algorithm, and their weights. Each tree is
+            grown from its smallest node, in the order its nodes are added.
+        """
+        in_tree = bytearray(self._num_nodes)
+        tree_edges = array("q")
+        tree_weights = array("d")
+        for root in range(self._num_nodes):
+            if in_tree[root]:
+                continue
+            # Entries are (weight, node, parent); stale entries are skipped
+            heap = [(0.0, root, root)]
+            while len(heap) > 0:
+                weight, current_node, parent = heapq.heappop(heap)
+                if in_tree[current_node]:
+                    continue
+                in_tree[current_node] = 1
+                if current_node != parent:
+                    tree_edges.extend((parent, current_node))
+                    tree_weights.append(weight)
+                for neighbor, weight in zip(self._adjacency_list[current_node],
+                                            self._weights[current_node]):
+                    if not in_tree[neighbor]:
+                        heapq.heappush(heap, (weight, neighbor, current_node))
+
+        edges = np.frombuffer(tree_edges, dtype=np.int64).reshape(-1, 2)
+        return edges, np.frombuffer(tree_weights, dtype=np.float64)
+
+    def k_clustering(self, k: int) -> tuple[np.ndarray, float]:
+        """ Splits the nodes in k clusters with maximum spacing. Returns the
+            cluster of every node and the spacing. See mst.k_clustering.
+        """
+        edges, weights = self.to_edge_array()
+        return mst.k_clustering(self._num_nodes, edges, weights, k)
+
+    def weight(self, node_1: int, node_2: int) -> float:
+        """ Returns the weight of the edge between the given nodes. """
+        self._validate_node(node_1)
+        self._validate_node(node_2)
+        weight = self._neighbor_sets[node_1].get(node_2)
+        if weight is None:
+            raise MissingEdgeError(f"There is no edge between {node_1} and {node_2}")
+        return weight
+
+    def dijkstra(self, source: int) -> list[float]:
+        """ Returns the weighted distances from the source node to all other
+            nodes in the graph. Unreachable nodes are at infinite distance.
+        """
+        self._validate_node(source)
+
+        distances = [float("inf")] * self._num_nodes
+        distances[source] = 0
+        heap = [(0, source)]
+        while len(heap) > 0:
+            distance, current_node = heapq.heappop(heap)
+            # Stale entry for a node whose distance was improved later
+            if distance > distances[current_node]:
+                continue
+            for neighbor, weight in zip(self._adjacency_list[current_node],
+                                        self._weights[current_node]):
+                new_distance = distance + weight
+                if new_distance < distances[neighbor]:
+                    distances[neighbor] = new_distance
+                    heapq.heappush(heap, (new_distance, neighbor))
+
+        return distances
+
+    def astar(self, source: int, target: int,
+              heuristic: Callable[[int], float]) -> tuple[float, list[int]]:
+        """ Returns the weighted distance from source to target and the path
+            between them using A* search. The heuristic estimates the
+            distance from a node to the target and must never overestimate it.
+            If the target is not reachable returns infinity and an empty path.
+        """
+        self._validate_node(source)
+        self._validate_node(target)
+
+        distances = {source: 0}
+        parents = {source: source}
+        heap = [(heuristic(source), 0, source)]
+        while len(heap) > 0:
+            _, distance, current_node = heapq.heappop(heap)
+            if current_node == target:
+                return distance, self._build_path(parents, target)
+            if distance > distances[current_node]:
+                continue
+            for neighbor, weight in zip(self._adjacency_list[current_node],
+                                        self._weights[current_node]):
+                new_distance = distance + weight
+                if new_distance < distances.get(neighbor, float("inf")):
+                    distances[neighbor] = new_distance
+                    parents[neighbor] = current_node
+                    heapq.heappush(heap, (new_distance + heuristic(neighbor),
+                                          new_distance, neighbor))
+
+        return float("inf"), []
+
+    def bidirectional_dijkstra(self, source: int,
+                               target: int) -> tuple[float, list[int]]:
+        """ Returns the weighted distance from source to target and the path
+            between them. Runs one Dijkstra search from each end, always
+            advancing the one with the smaller queue, and stops once the
+            two searches cannot find a shorter path through their meeting
+            point. If the target is not reachable returns infinity and an
+            empty path.
+        """
+        self._validate_node(source)
+        self._validate_node(target)
+
+        # Index 0 holds the search from the source and 1 from the target
+        distances = ({source: 0}, {target: 0})
+        parents = ({source: source}, {target: target})
+        heaps = ([(0, source)], [(0, target)])
+        best_distance = float("inf") if source != target else 0
+        meeting_node = source
+
+        while len(heaps[0]) > 0 and len(heaps[1]) > 0:
+            if heaps[0][0][0] + heaps[1][0][0] >= best_distance:
+                break
+            side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+            distance, current_node = heapq.heappop(heaps[side])
+            if distance > distances[side][current_node]:
+                continue
+
+            other_distances = distances[1 - side]
+            for neighbor, weight in zip(self._adjacency_list[current_node],
+                                        self._weights[current_node]):
+                new_distance = distance + weight
+                if new_distance < distances[side].get(neighbor, float("inf")):
+                    distances[side][neighbor] = new_distance
+                    parents[side][neighbor] = current_node
+                    heapq.heappush(heaps[side], (new_distance, neighbor))
+                if neighbor in other_distances:
+                    path_distance = distances[side][neighbor] + other_distances[neighbor]
+                    if path_distance < best_distance:
+                        best_distance = path_distance
+                        meeting_node = neighbor
+
+        if best_distance == float("inf"):
+            return best_distance, []
+        path = self._build_path(parents[0], meeting_node)
+        path.extend(reversed(self._build_path(parents[1], meeting_node)[:-1]))
+        return best_distance, path
+
+    @staticmethod
+    def _build_path(parents: dict[int, int], node: int) -> list[int]:
+        """ Follows the parents from the given node back to the root of
+            the search and returns the path from the root to the node.
+        """
+        path = [node]
+        while parents[node] != node:
+            node = parents[node]
+            path.append(node)
+        path.reverse()
+        return path
+
+    def __repr__(self):
+        return f"WeightedGraph(num_nodes={self._num_nodes}, num_edges={self._num_edges})"
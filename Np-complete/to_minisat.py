@@ -7,16 +7,16 @@ def write_minisat_file(formula: list[list[int]],
         read by the minisat program to check its satisfiability.
     """
     n_clauses = len(formula)
-    with open(name, "w") as fp:
+    line_end = " 0\n" if add_zeros else "\n"
+    # Clauses are joined in batches so the file gets a few large writes
+    # instead of one per clause
+    batch_size = 4096
+    with open(name, "w", buffering=1 << 20) as fp:
         # Write the header
         fp.write(f"p cnf {n_variables} {n_clauses}\n")
-        # Write each clause
-        for clause in formula:
-            line = " ".join([str(num) for num in clause])
-            if add_zeros:
-                line += " 0"
-            line += "\n"
-            fp.write(line)
+        for start in range(0, n_clauses, batch_size):
+            fp.write("".join(" ".join(map(str, clause)) + line_end
+                             for clause in formula[start:start + batch_size]))
 
 
 def to_minisat(formula: list[list[int]],